@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: requests prepared per second by a generated client, with
+and without the fast request preparation path.
+
+Usage::
+
+    $ python benchmarks/bench_prepare.py [--number N]
+"""
+import argparse
+import timeit
+
+import requests
+
+from poast.openapi3.client import ClientConfig, gen_client_cls
+from poast.openapi3.spec import OpenApiObject
+
+SPEC = {
+    'openapi': '3.0.3',
+    'info': {'title': 'Benchmark', 'version': '1.0.0'},
+    'paths': {
+        '/pets': {
+            'get': {
+                'operationId': 'listPets',
+                'parameters': [
+                    {'name': 'limit', 'in': 'query',
+                     'schema': {'type': 'integer'}},
+                ],
+                'responses': {'200': {'description': 'ok'}},
+            },
+        },
+        '/pets/{petId}': {
+            'get': {
+                'operationId': 'showPetById',
+                'parameters': [
+                    {'name': 'petId', 'in': 'path', 'required': True,
+                     'schema': {'type': 'string'}},
+                ],
+                'responses': {'200': {'description': 'ok'}},
+            },
+        },
+    },
+}
+
+
+class SessionPrepared(requests.Session):
+    """
+    A session which (trivially) overrides prepare_request, and so disables
+    the client's fast path: i.e. requests are prepared as they were before.
+    """
+
+    def prepare_request(self, request):
+        return super().prepare_request(request)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    client_cls = gen_client_cls('Bench', OpenApiObject(SPEC))
+    config = ClientConfig(headers={'X-Api-Key': 'secret'})
+    calls = {
+        'showPetById(petId=...)': lambda op: op.showPetById(petId='a b'),
+        'listPets(limit=...)': lambda op: op.listPets(limit=10),
+    }
+
+    print(f'{"operation":<26} {"session":>12} {"fast path":>12} '
+          f'{"speedup":>8}')
+    for name, call in calls.items():
+        rates = []
+        for session in (SessionPrepared(), requests.Session()):
+            # NOTE: client.op only holds a weak reference to the client:
+            client = client_cls('http://localhost/v1', config, session)
+            seconds = min(timeit.repeat(
+                lambda: call(client.op), number=args.number, repeat=3))
+            rates.append(args.number / seconds)
+        print(f'{name:<26} {rates[0]:>10.0f}/s {rates[1]:>10.0f}/s '
+              f'{rates[1] / rates[0]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
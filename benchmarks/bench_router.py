@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: requests matched to operations per second by the document
+router, compared to a linear scan of (compiled) path regexes.
+
+Usage::
+
+    $ python benchmarks/bench_router.py [--paths N] [--number N]
+"""
+import argparse
+import random
+import re
+import time
+import timeit
+
+from poast.openapi3.spec import OpenApiObject
+
+
+def gen_spec(n_paths):
+    """
+    Return a spec with ``n_paths`` paths, over 100 resources, each with
+    (static and templated) sub-resources.
+    """
+    paths = {}
+    for i in range(n_paths):
+        resource, sub = divmod(i, 100)
+        if sub % 2:
+            uri_path = f'/r{resource}/{{id}}/s{sub}/{{subId}}'
+        else:
+            uri_path = f'/r{resource}/s{sub}'
+        paths[uri_path] = {
+            'get': {
+                'operationId': f'op{i}',
+                'responses': {'200': {'description': 'ok'}},
+            },
+        }
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Benchmark', 'version': '1.0.0'},
+        'servers': [{'url': 'https://api.example.com/v1'}],
+        'paths': paths,
+    }
+
+
+def linear_matcher(doc):
+    """
+    Return a matcher which tries each path's regex in turn.
+    """
+    routes = []
+    for uri_path in doc['paths']:
+        regex = re.sub(r'\\{[^/]+?\\}', '([^/]+)', re.escape(str(uri_path)))
+        routes.append((re.compile(regex), doc['paths'][uri_path]))
+
+    def match(method, url):
+        for regex, path_item in routes:
+            if regex.fullmatch(url):
+                return path_item[method.lower()]
+        return None
+    return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    doc = OpenApiObject(gen_spec(args.paths))
+    started = time.perf_counter()
+    router = doc.router()
+    print(f'{args.paths} paths: router compiled in '
+          f'{time.perf_counter() - started:.3f}s')
+
+    rnd = random.Random(0)
+    urls = []
+    for _ in range(100):
+        resource, sub = divmod(rnd.randrange(args.paths), 100)
+        if sub % 2:
+            urls.append(f'/r{resource}/42/s{sub}/7')
+        else:
+            urls.append(f'/r{resource}/s{sub}')
+
+    linear = linear_matcher(doc)
+    number = max(args.number // len(urls), 1)
+    print(f'{"matcher":<14} {"matches":>12}')
+    for name, match, prefix in (
+            ('linear scan', linear, ''),
+            ('router', router.match, '/v1')):
+        seconds = min(timeit.repeat(
+            lambda: [match('GET', prefix + url) for url in urls],
+            number=number, repeat=3))
+        print(f'{name:<14} {number * len(urls) / seconds:>10.0f}/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 """Console script for poast."""
+import json
 import sys
 import click
 import yaml
@@ -14,6 +15,14 @@ from .spec import (
               default=None, help='Path to app OpenAPI Spec')
 @click.option('--validate/--no-validate', default=True,
               help="Validate the loaded document")
+@click.option(
+    '--collect-errors/--no-collect-errors', default=False,
+    help="Collect all validation errors and print them as JSON")
+@click.option('--max-errors', type=int, default=None,
+              help="Maximum number of validation errors to collect")
+@click.option(
+    '--profile/--no-profile', default=False,
+    help="Profile validation rules and print a report")
 @click.option(
     '--resolve-refs/--no-resolve-refs', default=False,
     help="Resolve document references")
@@ -25,13 +34,25 @@ from .spec import (
     '--show-attrs/--no-show-attrs', default=False,
     help="Show document attributes")
 def main(
-    openapi_spec, validate, resolve_refs, show_unset, show_paths,
-        show_attrs):
+    openapi_spec, validate, collect_errors, max_errors, profile,
+        resolve_refs, show_unset, show_paths, show_attrs):
     """Test OpenAPI Parser"""
 
     if openapi_spec is not None:
         try:
             doc = OpenApiObject(openapi_spec, resolve_refs=resolve_refs)
+            if profile:
+                validation_profile = doc.validate(profile=True)
+                print(validation_profile.report())
+                sys.exit(1 if validation_profile.violations else 0)
+
+            if collect_errors:
+                violations = doc.validate(
+                    collect=True, max_errors=max_errors)
+                print(json.dumps(
+                    [v.to_dict() for v in violations], indent=2))
+                sys.exit(1 if violations else 0)
+
             if validate:
                 doc.validate()
 
@@ -78,5 +99,36 @@ def main(
     return 0
 
 
+@click.command()
+@click.version_option()
+@click.option('--openapi-spec', type=click.Path(), envvar='OPENAPI_SPEC',
+              required=True, help='Path to app OpenAPI Spec')
+@click.option('--class-name', required=True,
+              help='Name of the generated client class')
+@click.option('--output', type=click.Path(), default=None,
+              help='Path of the generated module (default: stdout)')
+@click.option('--group-by-tags', is_flag=True, default=False,
+              help='Add per-tag operation tables (e.g. client.pets)')
+def gen_main(openapi_spec, class_name, output, group_by_tags):
+    """Generate a python client module for an OpenAPI spec"""
+    # NOTE: imported here, so that poast-validate doesn't load the client:
+    from .client.codegen import gen_client_module
+
+    try:
+        doc = OpenApiObject(openapi_spec, resolve_refs=True)
+        doc.validate()
+    except MalformedDocumentException as e:
+        print(str(e))
+        sys.exit(1)
+
+    source = gen_client_module(class_name, doc, group_by_tags)
+    if output is None:
+        sys.stdout.write(source)
+    else:
+        with open(output, 'w') as f:
+            f.write(source)
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())  # pragma: no cover
@@ -4,3 +4,5 @@
 from .basecli import OpenApiClient  # noqa: F401
 from .config import ClientConfig  # noqa: F401
 from .gencli import gen_client_cls  # noqa: F401
+from .genmodels import gen_models  # noqa: F401
+from .cache import ClientCache, client_cache  # noqa: F401
@@ -6,6 +6,7 @@ import logging
 import copy
 
 from .config import ClientConfig
+from .runtime import fast_path
 
 
 class OpenApiClient:
@@ -29,9 +30,22 @@ class OpenApiClient:
         '_request_cls',
         '_headers',
         '_cookies',
+        '_validate_requests',
+        '_validate_responses',
+        '_raise_response_errors',
+        '_fast_path',
         # 'auth',
     )
 
+    #: Reference used to pickle instances of generated client classes (see
+    #: :mod:`poast.openapi3.client.registry`):
+    _client_ref = None
+
+    #: Whether the client class was generated from the spec, and so can
+    #: validate requests and responses (classes written by ``poast-gen``, or
+    #: built from a client index, cannot):
+    _can_validate = False
+
     def __init__(self, root_url: str = "", config: ClientConfig = None, session=None):
         """
         Create an instance of the API client.
@@ -70,4 +84,36 @@ class OpenApiClient:
         # clients is modified by any one of them:
         self._headers = copy.copy(config.headers)
         self._cookies = copy.copy(config.cookies)
+        self._validate_requests = config.validate_requests
+        self._validate_responses = config.validate_responses
+        self._raise_response_errors = config.raise_response_errors
+        if (config.validate_requests or config.validate_responses) and \
+                not self._can_validate:
+            self._logger.warning(
+                f'{qualname}: request and response validation is not '
+                'available to clients generated without the spec')
+
+        # Precompute what we can to prepare requests (see runtime.py):
+        self._fast_path = fast_path(self)
         return
+
+    def __reduce__(self):
+        """
+        Pickle the client as its class (or class reference), root URL,
+        session and configuration.
+        """
+        config = ClientConfig(
+            logger=self._logger,
+            session_cls=type(self._session),
+            request_cls=self._request_cls,
+            headers=self._headers,
+            cookies=self._cookies,
+            validate_requests=self._validate_requests,
+            validate_responses=self._validate_responses,
+            raise_response_errors=self._raise_response_errors)
+        cls = type(self)._client_ref or type(self)
+        return (_restore_client, (cls, self._root_url, config, self._session))
+
+
+def _restore_client(cls, root_url, config, session):
+    return cls(root_url, config, session)
@@ -0,0 +1,51 @@
+"""
+Base class for poast generated OpenAPI 3.0 model classes.
+"""
+
+
+class OpenApiModel:
+    """
+    Base class for all dynamically generated model classes.
+
+    Each generated class has one slot per schema property, and generated
+    ``from_json`` / ``to_json`` methods.
+
+    Models compare equal if they have the same class and attribute values.
+    Since they are mutable, they are not hashable.
+
+    Attributes:
+        _fields (tuple): ``(json_name, attr_name)`` pairs, for every property
+        _schema (SchemaObject): the schema the class was generated from
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+    _schema = None
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Decode an instance from (decoded) JSON data.
+        """
+        raise NotImplementedError()
+
+    def to_json(self):
+        """
+        Return the instance as (JSON serializable) python data.
+        """
+        raise NotImplementedError()
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr)
+                   for _, attr in self._fields)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(
+            f'{attr}={getattr(self, attr)!r}' for _, attr in self._fields
+            if getattr(self, attr) is not None)
+        return f'{self.__class__.__qualname__}({fields})'
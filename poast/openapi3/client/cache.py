@@ -0,0 +1,79 @@
+"""
+Cache of generated client classes, keyed by spec content.
+
+Generating a client class for a large spec is not free, and the same spec is
+often used to generate the same client in many places (e.g. per module, or
+per test). A :class:`ClientCache` returns the class generated previously for
+the same spec content, class name and generation options.
+
+NOTE: generated classes only index the spec's operations (methods are
+generated on first use), so there is no on-disk tier: loading a stored
+index takes longer than building the lazy one. To skip loading the spec in
+new processes, generate a client module ahead of time (``poast-gen``), or
+pickle clients (see :mod:`~poast.openapi3.client.registry`).
+
+Example::
+
+    >>> from poast.openapi3.client import gen_client_cls, client_cache
+    >>> PetStore = gen_client_cls('PetStore', doc, cache=client_cache)
+    >>> PetStore is gen_client_cls('PetStore', doc, cache=client_cache)
+    True
+"""
+
+from collections import OrderedDict
+
+from ..spec import OpenApiObject
+from .gencli import gen_client_cls
+
+
+class ClientCache:
+    """
+    LRU cache of generated client classes.
+
+    Attributes:
+        maxsize (int): optional maximum number of cached classes; least
+            recently used classes are evicted first.
+        hits (int): number of classes returned from the cache
+        misses (int): number of classes generated
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__classes = OrderedDict()
+
+    def __len__(self):
+        return len(self.__classes)
+
+    def clear(self):
+        self.__classes.clear()
+        self.hits = self.misses = 0
+
+    def get_client_cls(self, cls_name: str, spec: OpenApiObject, **options):
+        """
+        Return the client class for a spec, generating it if necessary.
+
+        Args:
+            cls_name (str): the name of the client class
+            spec (OpenApiObject): the document
+            **options: generation options (passed to
+                :func:`~poast.openapi3.client.gencli.gen_client_cls`)
+        """
+        key = (spec.content_hash(), cls_name, tuple(sorted(options.items())))
+        cls = self.__classes.get(key)
+        if cls is not None:
+            self.hits += 1
+            self.__classes.move_to_end(key)
+            return cls
+
+        self.misses += 1
+        cls = gen_client_cls(cls_name, spec, **options)
+        self.__classes[key] = cls
+        if self.maxsize is not None and len(self.__classes) > self.maxsize:
+            self.__classes.popitem(last=False)
+        return cls
+
+
+#: Process-wide cache of generated client classes:
+client_cache = ClientCache()
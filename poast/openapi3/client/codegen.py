@@ -0,0 +1,225 @@
+"""
+Ahead-of-time generation of OpenAPI 3.0 client modules (see ``poast-gen``).
+
+The generated module defines the same client class as
+:func:`~poast.openapi3.client.gencli.gen_client_cls`, as plain python source:
+one method per operation (with its parameters as explicit keyword
+arguments), inlined parameter serialization, and docstrings. Importing it
+requires neither the spec nor an :class:`OpenApiObject`.
+
+NOTE: generated modules have no access to the spec, so request and response
+validation (``ClientConfig.validate_requests``/``validate_responses``) is not
+available to them; clients configured to validate log a warning.
+
+Example::
+
+    $ poast-gen --openapi-spec petstore.yaml --class-name PetStore \\
+        --output petstore_client.py
+
+    >>> from petstore_client import PetStore
+    >>> client = PetStore('https://petstore.example.com/v1')
+    >>> response = client.op.showPetById(petId=1).execute()
+"""
+
+import textwrap
+
+from ..spec import OpenApiObject
+from .gencli import CLIENT_RESERVED_ATTRS
+from .genops import tag_groups
+from .opindex import build_client_index
+from .params import operation_params, request_source
+
+_CLIENT_KWARGS = ('headers', 'params', 'cookies', 'data', 'json', 'files',
+                  'hooks')
+
+
+def _docstring(text, indent):
+    """
+    Return a triple-quoted string literal for a docstring.
+    """
+    text = text.replace('\\', '\\\\').replace('"""', '\\"""')
+    lines = [f'{indent}{line}' if line else '' for line in text.split('\n')]
+    return '\n'.join([f'{indent}"""'] + lines + [f'{indent}"""'])
+
+
+def _gen_operation(op, encoder):
+    """
+    Return the source lines for the method implementing an operation.
+
+    ``encoder`` returns the (module level) name of the encoder for a
+    parameter (see :func:`~poast.openapi3.client.params.request_source`).
+    """
+    args = [
+        p['attr'] if p['in'] == 'path' or p['required']
+        else f'{p["attr"]}=None'
+        for p in operation_params(op['path'], op['params'])]
+    signature = textwrap.wrap(', '.join(
+        ['self'] + [f'{kwarg}=None' for kwarg in _CLIENT_KWARGS] +
+        (['*'] + args if args else [])) + '):', width=79 - 12)
+    body, names = request_source(
+        op['path'], op['params'], lambda p: p['attr'], encoder)
+
+    lines = [
+        f'    def {op["method_name"]}(',
+        *(f'            {line}' for line in signature),
+        _docstring(op['doc'], ' ' * 8),
+    ]
+    lines.extend(f'        {line}' for line in body)
+    lines.extend([
+        '        return _prepare_request(',
+        f'            self._client, {op["executor"]}, {op["verb"]!r},',
+        f'            {names["request_path"]}, {", ".join(_CLIENT_KWARGS)})',
+    ])
+    return lines
+
+
+def gen_client_source(index, group_by_tags=False):
+    """
+    Generate the source of a client module from a client index.
+
+    Args:
+        index (dict): the client index (see
+            :func:`~poast.openapi3.client.opindex.build_client_index`)
+        group_by_tags (bool): whether to add per-tag operation tables (see
+            :func:`~poast.openapi3.client.gencli.gen_client_cls`)
+
+    Returns:
+        str: the python source of the module
+    """
+    cls_name = index['class_name']
+    ops_cls_name = cls_name + 'Operations'
+    operations = index['operations']
+    groups = tag_groups(
+        ((op['operation_id'], op['tags']) for op in operations),
+        CLIENT_RESERVED_ATTRS) if group_by_tags else {}
+    slots = ['__weakref__', 'op'] + (['_op_groups'] if groups else [])
+
+    lines = [
+        _docstring(
+            f'{index["doc"]}\n\n'
+            'Generated by poast-gen from an OpenAPI 3.0 spec: do not edit!',
+            ''),
+        '',
+        'from poast.openapi3.client.basecli import OpenApiClient',
+        'from poast.openapi3.client.executor import RequestExecutor',
+        'from poast.openapi3.client.optable import '
+        f'{"OpGroup, " if groups else ""}OpTable',
+        'from poast.openapi3.client.params import ENCODERS as _ENCODERS',
+        'from poast.openapi3.client.runtime import (',
+        '    prepare_request as _prepare_request,',
+        ')',
+        '',
+        f'__all__ = [{cls_name!r}]',
+    ]
+
+    # Prepared request wrappers, one per operation:
+    for op in operations:
+        lines.extend([
+            '',
+            '',
+            f'class {op["executor"]}(RequestExecutor):',
+            f'    """Wrapper for {op["operation_id"]} prepared requests"""',
+            '',
+            '    __slots__ = ()',
+        ])
+
+    # Parameter encoders (module level, shared by all operations), with
+    # names which no parameter shadows:
+    encoders = {}
+    prefix = '_enc'
+    while any(p['attr'].startswith(prefix)
+              for op in operations for p in op['params']):
+        prefix = f'_{prefix}'
+
+    def encoder(param_in, args):
+        key = (param_in, args)
+        if key not in encoders:
+            encoders[key] = f'{prefix}{len(encoders)}'
+        return encoders[key]
+
+    op_lines = []
+    for op in operations:
+        op_lines.append('')
+        op_lines.extend(_gen_operation(op, encoder))
+
+    if encoders:
+        lines.extend(['', ''])
+        lines.extend(
+            f'{name} = _ENCODERS[{param_in!r}]{args!r}'
+            for (param_in, args), name in encoders.items())
+
+    # Operations table:
+    lines.extend([
+        '',
+        '',
+        f'class {ops_cls_name}(OpTable):',
+        f'    """API Operations for {cls_name}"""',
+        '',
+        '    __slots__ = ()',
+    ])
+    lines.extend(op_lines)
+
+    # Per-tag operations tables (sharing the operations' functions):
+    for attr, (tag, op_ids) in groups.items():
+        lines.extend([
+            '',
+            '',
+            f'class {cls_name}_{attr}_Operations(OpTable):',
+            _docstring(
+                f'API Operations for {cls_name} tagged "{tag}"', ' ' * 4),
+            '',
+            '    __slots__ = ()',
+            '',
+        ])
+        lines.extend(
+            f'    {method} = {ops_cls_name}.{method}'
+            for method in (op['method_name'] for op in operations
+                           if op['operation_id'] in op_ids))
+
+    # Client class:
+    lines.extend([
+        '',
+        '',
+        f'class {cls_name}(OpenApiClient):',
+        _docstring(index['doc'], ' ' * 4),
+        '',
+        '    __slots__ = (',
+        *(f'        {slot!r},' for slot in slots),
+        '    )',
+        '',
+    ])
+    lines.extend(
+        f'    {attr} = OpGroup({attr!r}, '
+        f'lambda: {cls_name}_{attr}_Operations)'
+        for attr in groups)
+    if groups:
+        lines.append('')
+    lines.extend([
+        "    def __init__(self, root_url='', config=None, session=None):",
+        '        """',
+        '        Initialize the client with the given root_url and optional '
+        'config.',
+        '        """',
+        '        OpenApiClient.__init__(self, root_url, config, session)',
+        f'        self.op = {ops_cls_name}(self)',
+    ])
+    if groups:
+        lines.append('        self._op_groups = {}')
+    return '\n'.join(lines) + '\n'
+
+
+def gen_client_module(cls_name: str, spec: OpenApiObject,
+                      group_by_tags=False):
+    """
+    Generate the source of a client module from an OpenAPI 3.0 spec.
+
+    Args:
+        cls_name (str): the name of the client class
+        spec (OpenApiObject): the document
+        group_by_tags (bool): whether to add per-tag operation tables
+
+    Returns:
+        str: the python source of the module
+    """
+    return gen_client_source(
+        build_client_index(cls_name, spec), group_by_tags)
@@ -0,0 +1,167 @@
+"""
+Columnar decoding of array responses into NumPy arrays.
+
+For operations which return an array of flat objects, the response schema
+determines a NumPy dtype per property, and the decoded JSON array is
+converted straight into one array per property (or a single structured
+array), without building any document model objects.
+
+=========== ============== ============================================
+type        format         dtype
+=========== ============== ============================================
+integer     int32          ``int32``
+integer     int64 / none   ``int64``
+number      float          ``float32``
+number      double / none  ``float64``
+boolean                    ``bool``
+string      date-time      ``datetime64[us]`` (converted to UTC)
+string      date           ``datetime64[D]``
+(other)                    ``object``
+=========== ============== ============================================
+
+Missing and ``null`` values become ``NaN`` (numbers) or ``NaT`` (dates);
+integer and boolean columns which contain them are widened to ``float64`` and
+``object``, respectively.
+
+NumPy is an optional dependency: this module requires it.
+
+Example::
+
+    >>> response = client.op.listPets().execute()
+    >>> cols = response_to_columns(client.op.listPets, response)
+    >>> cols['id'].dtype
+    dtype('int64')
+"""
+
+import warnings
+
+import numpy as np
+
+from .respval import select_json_schema
+from ..spec.payload import _deref, _field_value
+
+_DTYPES = {
+    ('integer', 'int32'): np.dtype(np.int32),
+    ('integer', 'int64'): np.dtype(np.int64),
+    ('integer', None): np.dtype(np.int64),
+    ('number', 'float'): np.dtype(np.float32),
+    ('number', 'double'): np.dtype(np.float64),
+    ('number', None): np.dtype(np.float64),
+    ('boolean', None): np.dtype(bool),
+    ('string', 'date-time'): np.dtype('datetime64[us]'),
+    ('string', 'date'): np.dtype('datetime64[D]'),
+}
+
+_OBJECT = np.dtype(object)
+
+
+def property_dtype(schema):
+    """
+    Return the NumPy dtype for values of a (property) SchemaObject.
+    """
+    schema = _deref(schema)
+    schema_type = _field_value(schema, 'type')
+    schema_format = _field_value(schema, 'format')
+    dtype = _DTYPES.get((schema_type, schema_format))
+    if dtype is None and schema_type in ('integer', 'number'):
+        dtype = _DTYPES[(schema_type, None)]
+    return dtype if dtype is not None else _OBJECT
+
+
+def columns_dtype(schema):
+    """
+    Return the structured dtype for an array schema (or its items schema),
+    as a list of ``(name, dtype)`` tuples.
+
+    Raises:
+        ValueError: if the schema does not describe an array of objects
+    """
+    schema = _deref(schema)
+    if _field_value(schema, 'type') == 'array':
+        schema = _deref(schema['items'])
+    if schema is None or schema['properties'] is None:
+        raise ValueError(
+            f'schema at "{schema.doc_path if schema else None}" does not '
+            'describe an array of objects')
+    return [(name, property_dtype(prop))
+            for name, prop in schema['properties'].items()]
+
+
+def _to_column(values, dtype):
+    """
+    Convert a list of values (``None`` for missing) into an array.
+    """
+    if dtype.kind == 'M':
+        with warnings.catch_warnings():
+            # NOTE: numpy converts UTC offsets, but warns about them:
+            warnings.simplefilter('ignore', UserWarning)
+            return np.array(values, dtype=dtype)
+
+    if dtype.kind in 'iub' and None in values:
+        dtype = np.dtype(np.float64) if dtype.kind != 'b' else _OBJECT
+    if dtype.kind == 'f':
+        return np.array(
+            [np.nan if v is None else v for v in values], dtype=dtype)
+    if dtype.kind == 'O':
+        column = np.empty(len(values), dtype=_OBJECT)
+        column[:] = values
+        return column
+    return np.array(values, dtype=dtype)
+
+
+def records_to_columns(schema, records, structured=False):
+    """
+    Convert decoded records into column arrays.
+
+    Args:
+        schema (SchemaObject): the array (or items) schema
+        records (list): the decoded JSON array
+        structured (bool): if ``True``, return a single structured array
+
+    Returns:
+        dict: property name to ``numpy.ndarray``, or (if ``structured``) a
+        structured ``numpy.ndarray``
+    """
+    fields = columns_dtype(schema)
+    columns = {}
+    for name, dtype in fields:
+        columns[name] = _to_column([r.get(name) for r in records], dtype)
+
+    if not structured:
+        return columns
+
+    array = np.empty(len(records), dtype=[
+        (name, column.dtype) for name, column in columns.items()])
+    for name, column in columns.items():
+        array[name] = column
+    return array
+
+
+def _operation(op):
+    """
+    Return the OperationObject for a generated operation method (or an
+    OperationObject).
+    """
+    return getattr(op, 'operation', op)
+
+
+def response_to_columns(op, response, structured=False):
+    """
+    Decode an array response into column arrays, using the operation's
+    response schema.
+
+    Args:
+        op: a generated operation method (e.g. ``client.op.listPets``), or
+            its OperationObject
+        response (requests.Response): the response
+        structured (bool): if ``True``, return a single structured array
+
+    Returns:
+        dict: property name to ``numpy.ndarray``, or (if ``structured``) a
+        structured ``numpy.ndarray``
+
+    Raises:
+        ValueError: if the response has no JSON array schema
+    """
+    schema = select_json_schema(_operation(op), response)
+    return records_to_columns(schema, response.json(), structured)
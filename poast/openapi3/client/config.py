@@ -16,6 +16,13 @@ class ClientConfig:
         request_cls (type): a requests.Request-like class used to create HTTP requests
         headers (dict): a list of headers common to all requests for client created from this config
         cookies (dict): a list of cookies common to all requests for client created from this config
+        validate_requests (bool): if True, validate ``json=`` request bodies
+            against the operation's request body schema before sending
+        validate_responses (float): fraction (0.0 - 1.0) of responses to
+            validate against the operation's responses (see
+            :mod:`poast.openapi3.client.respval`)
+        raise_response_errors (bool): if True, raise response validation
+            errors, rather than logging them as warnings
 
     Notes:
      - headers and cookies are copied via the `copy` module!
@@ -26,10 +33,16 @@ class ClientConfig:
         'request_cls',
         'headers',
         'cookies',
+        'validate_requests',
+        'validate_responses',
+        'raise_response_errors',
     )
 
     def __init__(self, logger=None, session_cls=None, request_cls=None,
-                 headers: dict = None, cookies: dict = None):
+                 headers: dict = None, cookies: dict = None,
+                 validate_requests: bool = False,
+                 validate_responses: float = 0.0,
+                 raise_response_errors: bool = False):
         """
         Utility class to package up client configuration for re-use
         across multiple clients.
@@ -40,7 +53,7 @@ class ClientConfig:
 
         if session_cls is None:
             session_cls = requests.Session
-        self.session_cls = requests.Session
+        self.session_cls = session_cls
 
         if request_cls is None:
             request_cls = requests.Request
@@ -55,6 +68,10 @@ class ClientConfig:
             self.cookies = {}
         else:
             self.cookies = copy.copy(cookies)
+
+        self.validate_requests = validate_requests
+        self.validate_responses = validate_responses
+        self.raise_response_errors = raise_response_errors
         return
 
     def __setattr__(self, name: str, value):
@@ -16,7 +16,7 @@ class RequestExecutor:
     __slots__ = (
         '__weakref__',
         '_session',
-        'request',
+        '_request',
     )
 
     def __init__(self, session, request):
@@ -32,6 +32,10 @@ class RequestExecutor:
         self._session = proxy(session)
         self._request = request
 
+    @property
+    def request(self):
+        return self._request
+
     def __call__(self, **kwargs):
         """
         Send the prepared request using the client's session.
@@ -40,3 +44,38 @@ class RequestExecutor:
             **kwargs: Keyword arguments passed to :func:`requests.Session.send`
         """
         return self._session.send(self._request, **kwargs)
+
+    def __reduce__(self):
+        # NOTE: operation request wrapper classes only have a name and a
+        #       docstring, so they are pickled by value (they are generated
+        #       dynamically, and cannot be pickled by name):
+        cls = type(self)
+        return (_restore_executor, (
+            cls.__name__, cls.__qualname__, cls.__doc__, self._session,
+            self._request))
+
+
+#: Request wrapper classes re-created by unpickling:
+_executor_classes = {}
+
+
+def _restore_executor(cls_name, qualname, doc, session, request):
+    key = (cls_name, qualname, doc)
+    cls = _executor_classes.get(key)
+    if cls is None:
+        if qualname == RequestExecutor.__qualname__:
+            cls = RequestExecutor
+        else:
+            cls = type(cls_name, (RequestExecutor,), {
+                '__qualname__': qualname,
+                '__doc__': doc,
+                '__slots__': (),
+            })
+        _executor_classes[key] = cls
+
+    # NOTE: the unpickled request is the only owner of its (unpickled)
+    #       session, so it holds a strong reference to it:
+    executor = cls.__new__(cls)
+    executor._session = session
+    executor._request = request
+    return executor
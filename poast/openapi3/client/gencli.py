@@ -4,16 +4,44 @@
 from ..spec import OpenApiObject
 from .basecli import OpenApiClient
 from .config import ClientConfig
-from .genops import get_op_cls
+from .genops import get_op_cls, get_op_groups
+from .registry import ClientClassRef
+from .util import LazyDocstring
 
+#: Client attribute names, which per-tag operation tables must not shadow:
+CLIENT_RESERVED_ATTRS = frozenset(dir(OpenApiClient)) | {
+    '__weakref__',
+    'op',
+    '_op_groups',
+}
 
-def gen_client_cls(cls_name: str, spec: OpenApiObject):
+
+def gen_client_cls(cls_name: str, spec: OpenApiObject, cache=None,
+                   op_index=None, group_by_tags=False):
     """
     Generate a client class definition from an OpenAPI 3.0 spec.
+
+    All operations are available from the client's ``op`` table. If
+    ``group_by_tags`` is set, the operations with each tag are also available
+    from a table named for the tag, e.g. ``client.pets.showPetById``. Each
+    tag table is generated when it is first accessed.
+
+    Args:
+        cls_name (str): the name of the client class
+        spec (OpenApiObject): the document
+        cache (ClientCache): optional cache of generated client classes
+            (e.g. the process-wide
+            :data:`~poast.openapi3.client.cache.client_cache`)
+        op_index (list): optional, previously built operation index for the
+            spec (see :func:`~poast.openapi3.client.opindex.build_op_index`)
+        group_by_tags (bool): whether to add per-tag operation tables
     """
+    options = {'group_by_tags': True} if group_by_tags else {}
+    if cache is not None:
+        return cache.get_client_cls(cls_name, spec, **options)
 
     # Generate a class which encapsulates all of our API operations:
-    op_cls = get_op_cls(cls_name, spec)
+    op_cls = get_op_cls(cls_name, spec, op_index)
 
     # Consructor for our new client class:
     def __init__(self, root_url: str = "", config: ClientConfig = None, session=None):
@@ -24,23 +52,36 @@ def gen_client_cls(cls_name: str, spec: OpenApiObject):
 
         # Install our dynamically generated API operations:
         self.op = op_cls(self)
+        if group_by_tags:
+            self._op_groups = {}
         return
 
     # Update qualname to make help() more helpful!
     __init__.__qualname__ = f'{cls_name}.__init__'
 
+    # Reference used to pickle clients (see registry.py):
+    client_ref = ClientClassRef(cls_name, spec, options, op_index)
+
     # Configure the class namespace:
     cls_ns = {
-        '__doc__': _get_cls_docs(spec),
+        '__doc__': LazyDocstring(_get_cls_docs, spec),
         '__init__': __init__,
         '__slots__': (
             '__weakref__',
             'op',
         ),
+        '_client_ref': client_ref,
+        '_can_validate': True,
     }
 
+    if group_by_tags:
+        cls_ns['__slots__'] += ('_op_groups',)
+        cls_ns.update(
+            get_op_groups(cls_name, op_cls, CLIENT_RESERVED_ATTRS))
+
     # Create and return our new API class!
-    return type(cls_name, (OpenApiClient,), cls_ns)
+    client_ref.cls = type(cls_name, (OpenApiClient,), cls_ns)
+    return client_ref.cls
 
 
 def _get_cls_docs(spec: OpenApiObject):
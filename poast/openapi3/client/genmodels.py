@@ -0,0 +1,403 @@
+"""
+Generate slotted model classes from the schemas in ``components/schemas``.
+
+Each object schema becomes a class with one slot per property, type
+annotations, and generated ``from_json`` / ``to_json`` methods (compiled,
+once, per class). Properties which refer to other models are decoded into
+model instances; a schema which extends another via ``allOf`` becomes a
+subclass of it. Schemas with a ``discriminator`` decode into the subclass
+(or ``oneOf``/``anyOf`` member) selected by the discriminator property.
+
+Example::
+
+    >>> models = gen_models(doc)
+    >>> pet = models.Pet.from_json({'id': 1, 'name': 'rex'})
+    >>> pet.name
+    'rex'
+    >>> pet.to_json()
+    {'id': 1, 'name': 'rex'}
+"""
+
+import re
+import typing
+
+from ..spec import OpenApiObject
+from ..spec.payload import _deref, _field_value
+from .basemodel import OpenApiModel
+from .respval import select_json_schema
+from .util import sanitize_identifier
+
+_PY_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': float,
+    'boolean': bool,
+    'array': list,
+    'object': dict,
+}
+
+MODEL_RESERVED_ATTRS = set((
+    'from_json',
+    'to_json',
+    '_fields',
+    '_schema',
+    '_source',
+)) | set(dir(OpenApiModel))
+
+
+def _identifier(name, reserved=()):
+    """
+    Return a python identifier for a schema or property name.
+    """
+    ident = re.sub(r'\W', '_', name)
+    if not ident or ident[0].isdigit():
+        ident = f'_{ident}'
+    return sanitize_identifier(ident, reserved=reserved)
+
+
+def _is_model_schema(schema):
+    """
+    Return ``True`` if a component schema should become a model class.
+    """
+    return schema['properties'] is not None or \
+        schema['allOf'] is not None or \
+        schema['discriminator'] is not None or \
+        _field_value(schema, 'type') == 'object'
+
+
+class ModelSet:
+    """
+    The model classes generated for a document, by component name.
+
+    Models are available as attributes (``models.Pet``) or items
+    (``models['Pet']``).
+    """
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_schema = {}
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_by_name'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self._by_name)
+
+    def model_for(self, schema):
+        """
+        Return the model class generated from ``schema`` (or ``None``).
+        """
+        return self._by_schema.get(id(_deref(schema)))
+
+    def decoder(self, schema):
+        """
+        Return a function which decodes JSON data described by ``schema``:
+        model schemas decode into model instances, arrays of models into
+        lists of them, and anything else is returned as is.
+        """
+        schema = _deref(schema)
+        model = self.model_for(schema)
+        if model is not None:
+            return model.from_json
+
+        if _field_value(schema, 'type') == 'array' and \
+                schema['items'] is not None:
+            item_model = self.model_for(schema['items'])
+            if item_model is not None:
+                from_json = item_model.from_json
+
+                def _decode_list(data):
+                    return [from_json(item) for item in data]
+                return _decode_list
+        return _identity
+
+    def decode_response(self, op, response):
+        """
+        Decode a JSON response to an operation into model instances.
+
+        Args:
+            op: a generated operation method (e.g. ``client.op.listPets``),
+                or its OperationObject
+            response (requests.Response): the response
+
+        Raises:
+            ValueError: if the response has no JSON body schema
+        """
+        schema = select_json_schema(getattr(op, 'operation', op), response)
+        return self.decoder(schema)(response.json())
+
+    def __repr__(self):
+        return f'ModelSet({list(self._by_name)!r})'
+
+
+def _identity(data):
+    return data
+
+
+class _ModelSpec:
+    """
+    Intermediate description of a model class, prior to generation.
+    """
+
+    __slots__ = ('name', 'schema', 'base', 'props', 'cls')
+
+    def __init__(self, name, schema):
+        self.name = name
+        self.schema = schema
+        self.base = None
+        self.props = None
+        self.cls = None
+
+
+def _own_props(spec, specs_by_id):
+    """
+    Return the ``(json_name, schema)`` pairs declared by a model schema
+    (beyond those of its base model), and set its base model.
+    """
+    props = []
+    schema = spec.schema
+    if schema['allOf'] is not None:
+        for member in schema['allOf']:
+            member = _deref(member)
+            member_spec = specs_by_id.get(id(member))
+            if member_spec is not None and spec.base is None and \
+                    member_spec is not spec:
+                spec.base = member_spec
+                continue
+            if member['properties'] is not None:
+                props.extend(member['properties'].items())
+
+    if schema['properties'] is not None:
+        props.extend(schema['properties'].items())
+    return props
+
+
+def _all_props(spec, specs_by_id, visiting=()):
+    """
+    Return every ``(json_name, schema)`` pair of a model (base first).
+    """
+    if spec.props is not None:
+        return spec.props
+    own = _own_props(spec, specs_by_id)
+    if spec.base is not None and spec.base.name in visiting:
+        spec.base = None
+    inherited = [] if spec.base is None else _all_props(
+        spec.base, specs_by_id, visiting + (spec.name,))
+
+    names = set(name for name, _ in inherited)
+    spec.props = inherited + [(n, s) for n, s in own if n not in names]
+    return spec.props
+
+
+def _py_type(prop, specs_by_id):
+    """
+    Return the annotation for a property schema.
+    """
+    prop = _deref(prop)
+    prop_spec = specs_by_id.get(id(prop))
+    if prop_spec is not None:
+        return typing.Optional[prop_spec.cls]
+
+    prop_type = _field_value(prop, 'type')
+    if prop_type == 'array' and prop['items'] is not None:
+        item_spec = specs_by_id.get(id(_deref(prop['items'])))
+        if item_spec is not None:
+            return typing.Optional[typing.List[item_spec.cls]]
+    return typing.Optional[_PY_TYPES.get(prop_type, typing.Any)]
+
+
+def _create_class(spec, specs_by_id, cls_prefix):
+    """
+    Create the (slotted) class for a model, after its base.
+    """
+    if spec.cls is not None:
+        return spec.cls
+
+    base_cls = OpenApiModel
+    inherited = 0
+    if spec.base is not None:
+        base_cls = _create_class(spec.base, specs_by_id, cls_prefix)
+        inherited = len(spec.base.props)
+
+    # Attribute names must be unique within the class hierarchy, even if
+    # property names are not (e.g. "a-b" and "a_b"):
+    fields = list(base_cls._fields)
+    attrs = set(attr for _, attr in fields)
+    for name, _ in spec.props[inherited:]:
+        attr = _identifier(name, MODEL_RESERVED_ATTRS)
+        while attr in attrs:
+            attr += '_'
+        attrs.add(attr)
+        fields.append((name, attr))
+    fields = tuple(fields)
+    description = _field_value(spec.schema, 'description')
+    cls_name = cls_prefix + _identifier(spec.name)
+    spec.cls = type(cls_name, (base_cls,), {
+        '__doc__': description or f'Model for "{spec.schema.doc_path}"',
+        '__slots__': tuple(attr for _, attr in fields[inherited:]),
+        '_fields': fields,
+        '_schema': spec.schema,
+    })
+    return spec.cls
+
+
+def _dispatch_table(spec, specs_by_id):
+    """
+    Return ``(property name, {value: class})`` for a model schema with a
+    discriminator (or ``None``).
+
+    .. seealso:: :meth:`DiscriminatorObject.dispatch_table`
+    """
+    discriminator = spec.schema['discriminator']
+    if discriminator is None:
+        return None
+
+    table = {}
+    for value, target in discriminator.dispatch_table().items():
+        target_spec = specs_by_id.get(id(target))
+        if target_spec is not None:
+            table[value] = target_spec.cls
+    return discriminator.property_name, table
+
+
+def _compile_methods(spec, specs_by_id):
+    """
+    Generate and compile the ``from_json`` / ``to_json`` methods for a model.
+    """
+    cls = spec.cls
+    ns = {'_new': object.__new__}
+    names = {}
+
+    def _const(value):
+        name = names.get(id(value))
+        if name is None:
+            name = names[id(value)] = f'_c{len(ns)}'
+            ns[name] = value
+        return name
+
+    decode = ['def from_json(cls, data):']
+    encode = ['def to_json(self):', '    data = {}']
+
+    dispatch = _dispatch_table(spec, specs_by_id)
+    if dispatch is not None:
+        prop_name, table = dispatch
+        decode.extend([
+            f'    sub = {_const(table)}.get(data.get({prop_name!r}))',
+            '    if sub is not None and sub is not cls:',
+            '        return sub.from_json(data)',
+        ])
+        if not cls._fields:
+            decode.append(
+                f'    raise ValueError("unknown {prop_name}: %r" % '
+                f'(data.get({prop_name!r}),))')
+
+    decode.extend(['    obj = _new(cls)', '    get = data.get'])
+    required = set(_field_value(spec.schema, 'required') or ())
+    for (json_name, attr), (_, prop) in zip(cls._fields, spec.props):
+        prop = _deref(prop)
+        prop_spec = specs_by_id.get(id(prop))
+        item_spec = None
+        if prop_spec is None and _field_value(prop, 'type') == 'array' and \
+                prop['items'] is not None:
+            item_spec = specs_by_id.get(id(_deref(prop['items'])))
+
+        if prop_spec is not None:
+            model = _const(prop_spec.cls)
+            decode.extend([
+                f'    v = get({json_name!r})',
+                f'    obj.{attr} = None if v is None else '
+                f'{model}.from_json(v)',
+            ])
+            encoded = 'v.to_json()'
+        elif item_spec is not None:
+            model = _const(item_spec.cls)
+            decode.extend([
+                f'    v = get({json_name!r})',
+                f'    obj.{attr} = None if v is None else '
+                f'[{model}.from_json(x) for x in v]',
+            ])
+            encoded = '[x.to_json() for x in v]'
+        else:
+            # Fast path: scalars (and anything else) are stored as is:
+            decode.append(f'    obj.{attr} = get({json_name!r})')
+            encoded = 'v'
+
+        encode.append(f'    v = self.{attr}')
+        if json_name in required and _field_value(prop, 'nullable'):
+            encode.append(
+                f'    data[{json_name!r}] = None if v is None else {encoded}')
+        else:
+            encode.extend([
+                '    if v is not None:',
+                f'        data[{json_name!r}] = {encoded}',
+            ])
+
+    decode.append('    return obj')
+    encode.append('    return data')
+
+    source = '\n'.join(decode + [''] + encode) + '\n'
+    exec(compile(source, f'<model: {cls.__qualname__}>', 'exec'), ns)
+
+    from_json = ns['from_json']
+    from_json.__qualname__ = f'{cls.__qualname__}.from_json'
+    to_json = ns['to_json']
+    to_json.__qualname__ = f'{cls.__qualname__}.to_json'
+    cls.from_json = classmethod(from_json)
+    cls.to_json = to_json
+    cls._source = source
+    return
+
+
+def gen_models(spec: OpenApiObject, cls_prefix: str = ''):
+    """
+    Generate model classes for the schemas in ``components/schemas`` of an
+    OpenAPI 3.0 spec (which must have its references resolved).
+
+    Args:
+        spec (OpenApiObject): the document
+        cls_prefix (str): optional prefix for the generated class names
+
+    Returns:
+        ModelSet: the generated classes, by component name
+    """
+    specs_by_name = {}
+    specs_by_id = {}
+    for name, schema in spec.schemas.items():
+        if hasattr(schema, '_children') and _is_model_schema(schema):
+            model_spec = _ModelSpec(name, schema)
+            specs_by_name[name] = model_spec
+            specs_by_id.setdefault(id(schema), model_spec)
+
+    for model_spec in specs_by_name.values():
+        _all_props(model_spec, specs_by_id)
+    for model_spec in specs_by_name.values():
+        _create_class(model_spec, specs_by_id, cls_prefix)
+
+    models = ModelSet()
+    for name, model_spec in specs_by_name.items():
+        cls = model_spec.cls
+        inherited = len(model_spec.base.props) if model_spec.base else 0
+        cls.__annotations__ = {
+            attr: _py_type(prop, specs_by_id)
+            for (_, attr), (_, prop) in zip(
+                cls._fields[inherited:], model_spec.props[inherited:])
+        }
+        _compile_methods(model_spec, specs_by_id)
+        models._by_name[name] = cls
+        models._by_schema[id(model_spec.schema)] = cls
+    return models
@@ -1,13 +1,55 @@
 """
 Dynamically generate OpenAPI 3.0 operation methods.
 """
+from types import MethodType
+
 from ..spec.document import OperationObject
+from ..spec.payload import compile_validator
 from .util import (
     CLIENT_RESERVED_KWARGS,
     CLIENT_PARAM_SUFFIX,
-    sanitize_identifier,
+    sanitize_fmt_string,
+    is_json_media_type,
+    LazyDocstring,
 )
 from .genexec import get_op_executor_cls
+from .opindex import _op_params, _param_entries
+from .params import compile_request
+from .respval import ResponseValidator
+from .runtime import prepare_request
+
+
+class OperationMethod:
+    """
+    Generated operation method, whose docstring is generated on first access.
+
+    Attribute access (e.g. ``operation``, ``response_validator``) is
+    forwarded to the wrapped function.
+    """
+
+    __slots__ = ('__wrapped__', '_doc')
+
+    def __init__(self, fn, doc):
+        self.__wrapped__ = fn
+        self._doc = doc
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        return MethodType(self, obj)
+
+    def __call__(self, *args, **kwargs):
+        return self.__wrapped__(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.__wrapped__, name)
+
+    @property
+    def __doc__(self):
+        return self._doc.__get__(self)
+
+    def __repr__(self):
+        return f'<operation {self.__qualname__}>'
 
 
 def get_op_method(cls_name: str, op_id: str, verb: str, uri_path: str, op_obj: OperationObject):
@@ -21,36 +63,87 @@ def get_op_method(cls_name: str, op_id: str, verb: str, uri_path: str, op_obj: O
     # Get the prepared request wrapper class:
     op_req_cls = get_op_executor_cls(cls_name, op_id, verb, uri_path, op_obj)
 
+    # Compile the request builder (serializes the path, query, header and
+    # cookie parameters):
+    build_request = compile_request(uri_path, _param_entries(op_obj))
+
+    # Request body validator (compiled on first use):
+    body_validator = []
+
+    # Sampled response validation (and per-operation counters):
+    response_validator = ResponseValidator(op_id, op_obj)
+
     # <Client Class>.<operationId> method body:
     def _prepare_request(self, headers=None, params=None, cookies=None,
                          data=None, json=None, files=None, hooks=None,
-                         **path_params):
-        # Build full URL and fill in path parameters (HACK):
-        path_template = self._client._root_url + uri_path
-        request_uri = path_template.format(**path_params)
-
-        # Prepare the request:
-        r = self._client._request_cls(
-            verb.upper(),
-            request_uri, headers=headers, params=params, cookies=cookies,
-            data=data, json=json, files=files, hooks=hooks)
-        pr = self._client._session.prepare_request(r)
-
-        if op_obj['security']:
-            for sec_req in op_obj['security']:
-                pass
-
-        # Wrap it in an operation request executor and return:
-        pr.execute = op_req_cls(self._client._session, pr)
-        return pr
-
-    # Update the docs to make the help...helpful:
-    _prepare_request.__doc__ = _get_op_docs(verb, uri_path, op_obj)
+                         **op_params):
+        # Optionally, reject invalid JSON bodies before sending:
+        if json is not None and self._client._validate_requests:
+            if not body_validator:
+                body_validator.append(_get_json_body_validator(
+                    op_obj, self._client._logger))
+            if body_validator[0] is not None:
+                body_validator[0](json)
+
+        # Serialize the operation's parameters:
+        request_path, headers, cookies = build_request(
+            op_params, headers, cookies)
+
+        # Optionally, validate a sample of responses:
+        client = self._client
+        if client._validate_responses and \
+                response_validator.sample(client._validate_responses):
+            hooks = dict(hooks or {})
+            response_hooks = hooks.get('response', [])
+            if callable(response_hooks):
+                response_hooks = [response_hooks]
+            hooks['response'] = [response_validator.hook(
+                client._logger, client._raise_response_errors),
+                *response_hooks]
+
+        # Prepare the request, wrapped in an operation request executor:
+        return prepare_request(
+            client, op_req_cls, verb, request_path, headers, params,
+            cookies, data, json, files, hooks)
+
+    _prepare_request.operation = op_obj
+    _prepare_request.response_validator = response_validator
     _prepare_request.__name__ = op_id
     _prepare_request.__qualname__ = f'{cls_name}.{op_id}'
 
-    # Return our prepared method for addition to the new client class:
-    return _prepare_request
+    # Return our prepared method for addition to the new client class, with
+    # docs to make the help...helpful (generated on demand):
+    doc_path = sanitize_fmt_string(
+        uri_path, reserved=CLIENT_RESERVED_KWARGS, suffix=CLIENT_PARAM_SUFFIX)
+    return OperationMethod(
+        _prepare_request, LazyDocstring(_get_op_docs, verb, doc_path, op_obj))
+
+
+def _get_json_body_validator(op_obj: OperationObject, logger=None):
+    """
+    Given an OperationObject, return a compiled validator for its JSON
+    request body schema (or ``None``, if it has none, or if it cannot be
+    compiled; e.g. for a pattern with no python equivalent).
+    """
+    request_body = op_obj['requestBody']
+    if request_body is None:
+        return None
+
+    content = request_body.target()['content']
+    for media_type in content:
+        if is_json_media_type(media_type):
+            schema = content[media_type]['schema']
+            if schema is None:
+                continue
+            try:
+                return compile_validator(schema)
+            except ValueError as e:
+                if logger is not None:
+                    logger.warning(
+                        f'{op_obj["operationId"]}: cannot validate requests '
+                        f'against {schema.doc_path}: {e}')
+                return None
+    return None
 
 
 def _get_op_docs(verb: str, uri_path: str, op_obj: OperationObject):
@@ -63,23 +156,19 @@ def _get_op_docs(verb: str, uri_path: str, op_obj: OperationObject):
         'path': [],
         'query': [],
         'header': [],
-        'cookies': [],
+        'cookie': [],
     }
 
     # Generate docs for individual parameters, and stash them in a dict by type
-    for param in op_obj["parameters"]:
-        # HACK: get value pointed to by reference, if referenced...
-        param = param.target()
-
-        param_in = str(param['in'])
-        param_name = str(param['name'])
-
-        # NOTE: we need to ensure that any path parameters can be passed as
-        #       keyword arguments to <Client>.<operationId>(...):
-        if param_in == 'path':
-            param_name = sanitize_identifier(
-                param_name, reserved=CLIENT_RESERVED_KWARGS,
-                suffix=CLIENT_PARAM_SUFFIX)
+    params = _op_params(op_obj)
+    for param, entry in zip(params, _param_entries(op_obj)):
+        param_in = entry['in']
+
+        # NOTE: parameters are passed as keyword arguments to
+        #       <Client>.<operationId>(...), by python identifier:
+        param_name = entry['attr']
+        if param_name != entry['name']:
+            param_name = f'{param_name} ({entry["name"]})'
         param_docs[param_in].append(f'  {param_name}:')
 
         for field_name in ('description',):
@@ -100,15 +189,11 @@ def _get_op_docs(verb: str, uri_path: str, op_obj: OperationObject):
             op_docs.append(f'{field_name}: {str(op_obj[field_name])}')
 
     # Document the parameters, by location:
-    for param_in in ('path', 'query', 'header', 'cookies'):
+    for param_in in ('path', 'query', 'header', 'cookie'):
         if not param_docs[param_in]:
             continue
 
-        # Not path parameter usage:
-        if param_in == 'path':
-            op_docs.append(f'\n{param_in} parameters (keyword args):')
-        else:
-            op_docs.append(f'\n{param_in} parameters:')
+        op_docs.append(f'\n{param_in} parameters (keyword args):')
         op_docs.extend(param_docs[param_in])
 
     # Add security requirements:
@@ -1,50 +1,122 @@
 """
 Dynamically generate OpenAPI 3.0 operations tables.
+
+Operation methods (and their request executor classes) are generated lazily,
+on first access: see :class:`~poast.openapi3.client.optable.OpTableType`.
 """
-from .util import (
-    PATH_ITEM_VERBS,
-    CLIENT_RESERVED_KWARGS,
-    CLIENT_PARAM_SUFFIX,
-    sanitize_fmt_string,
-)
-from .genop import get_op_method
-from .optable import OpTable
+from .util import PATH_ITEM_VERBS, py_identifier
+from .optable import OpGroup, OpTable
 
 
-def _get_path_ops(cls_name, uri_path, path_item):
+def _get_path_ops(uri_path, path_item):
     """
-    Given a class cls_name, uri path, and PathItemObject, generate a list
-    of key/value pairs where key is a method name and value is the function
-    body for a method that invokes that endpoint.
+    Given a uri path and PathItemObject, generate a list of key/value pairs
+    where key is a method name and value is the ``(verb, uri_path,
+    OperationObject)`` index entry for the method that invokes that endpoint.
     """
-    uri_path = sanitize_fmt_string(
-        uri_path, reserved=CLIENT_RESERVED_KWARGS, suffix=CLIENT_PARAM_SUFFIX)
     for verb in PATH_ITEM_VERBS:
         op_item = path_item[verb]
         if op_item is None:
             continue
 
         op_id = str(op_item['operationId'])
-        op_fn = get_op_method(cls_name, op_id, verb, uri_path, op_item)
-        yield (op_id, op_fn)
+        yield (op_id, (verb, uri_path, op_item))
     return
 
 
-def get_op_cls(cli_cls_name, spec):
+def _get_index_ops(spec, op_index):
     """
-    Given a new class name and an OpenApiObject spec, generate a class which
-    contains all of the operations for the API described by the spec.
+    Given an OpenApiObject spec and its operation index (see
+    :func:`~poast.openapi3.client.opindex.build_op_index`), generate the
+    same key/value pairs as :func:`_get_path_ops`, without walking the spec.
     """
+    paths = spec['paths']
+    for entry in op_index:
+        verb = entry['verb'].lower()
+        op_item = paths[entry['path']].target()[verb]
+        yield (entry['operation_id'], (verb, entry['path'], op_item))
+    return
 
-    cls_name = cli_cls_name + 'Operations'
+
+def _op_table_cls(cls_name, qualname, doc, operations):
+    """
+    Create an operations table class, for the given operations.
+    """
     cls_ns = {
-        '__doc__': f'API Operations for {cli_cls_name}',
+        '__doc__': doc,
         '__name__': cls_name,
-        '__qualname__': f'{cli_cls_name}.{cls_name}',
+        '__qualname__': qualname,
+        '_operations': operations,
     }
+    return type(cls_name, (OpTable,), cls_ns)
 
-    for p in spec['paths']:
-        for op_id, op_fn in _get_path_ops(cls_name, str(p), spec['paths'][p]):
-            cls_ns[op_id] = op_fn
 
-    return type(cls_name, (OpTable,), cls_ns)
+def tag_groups(op_tags, reserved):
+    """
+    Group operations by tag.
+
+    Args:
+        op_tags: ``(operationId, tags)`` pairs
+        reserved (set): attribute names which tag names must not shadow
+            (clashing tag names are suffixed with an underscore)
+
+    Returns:
+        dict: ``(tag, [operationId, ...])``, by attribute name
+    """
+    groups = {}
+    for op_id, tags in op_tags:
+        for tag in tags or ():
+            attr = py_identifier(str(tag), reserved=reserved)
+            tag, op_ids = groups.setdefault(attr, (str(tag), []))
+            if op_id not in op_ids:
+                op_ids.append(op_id)
+    return groups
+
+
+def get_op_groups(cli_cls_name, op_cls, reserved):
+    """
+    Given a client class name and its operations table class, return a dict
+    of :class:`~poast.openapi3.client.optable.OpGroup` descriptors, by
+    attribute name: one per operation tag, for the operations with that tag
+    (see :func:`tag_groups`).
+    """
+    operations = op_cls._operations
+
+    def make_cls(attr, tag, op_ids):
+        def make():
+            return _op_table_cls(
+                f'{cli_cls_name}_{attr}_Operations', f'{cli_cls_name}.{attr}',
+                f'API Operations for {cli_cls_name} tagged "{tag}"',
+                {op_id: operations[op_id] for op_id in op_ids})
+        return make
+
+    groups = tag_groups(
+        ((op_id, op[2]['tags']) for op_id, op in operations.items()),
+        reserved)
+    return {
+        attr: OpGroup(attr, make_cls(attr, tag, op_ids))
+        for attr, (tag, op_ids) in groups.items()
+    }
+
+
+def get_op_cls(cli_cls_name, spec, op_index=None):
+    """
+    Given a new class name and an OpenApiObject spec, generate a class which
+    contains all of the operations for the API described by the spec.
+
+    If given, the operations are taken from the spec's (previously built)
+    operation index, ``op_index``.
+    """
+
+    cls_name = cli_cls_name + 'Operations'
+    operations = {}
+    if op_index is not None:
+        operations.update(_get_index_ops(spec, op_index))
+    else:
+        for p in spec['paths']:
+            for op_id, op in _get_path_ops(str(p), spec['paths'][p]):
+                operations[op_id] = op
+
+    return _op_table_cls(
+        cls_name, f'{cli_cls_name}.{cls_name}',
+        f'API Operations for {cli_cls_name}', operations)
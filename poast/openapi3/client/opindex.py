@@ -0,0 +1,143 @@
+"""
+Operation index: a plain, JSON-serializable description of the operations
+of an OpenAPI 3.0 spec, with everything needed to generate a client for it.
+
+The index is computed once from an :class:`OpenApiObject`; clients can then
+be generated from the index alone (e.g. ahead of time, by ``poast-gen``),
+without loading or parsing the spec.
+"""
+
+from ..spec import OpenApiObject
+from .util import (
+    PATH_ITEM_VERBS,
+    CLIENT_RESERVED_KWARGS,
+    CLIENT_PARAM_SUFFIX,
+    py_identifier,
+    sanitize_fmt_string,
+)
+
+#: Bump when the layout of index entries changes:
+OP_INDEX_VERSION = 2
+
+_DEFAULT_STYLES = {
+    'path': 'simple',
+    'header': 'simple',
+    'query': 'form',
+    'cookie': 'form',
+}
+
+
+def _param_field(param, field_name):
+    """
+    Return the python value of a ParameterObject field, falling back to the
+    default for its location (see ``ParameterObject._init_defaults``).
+    """
+    value = param[field_name]
+    if value is None:
+        value = param._defaults.get(field_name)
+    return value.value() if value is not None else None
+
+
+def _param_entry(param):
+    """
+    Return the index entry for a ParameterObject.
+    """
+    param_in = str(param['in'])
+    style = _param_field(param, 'style') or _DEFAULT_STYLES.get(param_in)
+    return {
+        'name': str(param['name']),
+        'in': param_in,
+        'attr': py_identifier(str(param['name'])),
+        # NOTE: path parameters are always required:
+        'required': param_in == 'path' or bool(
+            _param_field(param, 'required')),
+        'style': style,
+        'explode': bool(_param_field(param, 'explode')),
+        'allow_reserved': bool(_param_field(param, 'allowReserved')),
+    }
+
+
+def _op_params(op_obj):
+    """
+    Return the (resolved) parameters of an operation, by name and location.
+    """
+    params = {}
+    for param in op_obj['parameters'] or ():
+        # HACK: get value pointed to by reference, if referenced...
+        param = param.target()
+        if hasattr(param, '_children'):
+            params[(str(param['name']), str(param['in']))] = param
+    return params.values()
+
+
+def _param_entries(op_obj):
+    """
+    Return the index entries for the parameters of an operation.
+
+    NOTE: parameters in different locations may have the same name (or the
+          same python identifier): later ones get their location appended,
+          e.g. ``id_header``.
+    """
+    entries = []
+    attrs = set()
+    for param in _op_params(op_obj):
+        entry = _param_entry(param)
+        if entry['attr'] in attrs:
+            entry['attr'] = f'{entry["attr"]}_{entry["in"]}'
+        attrs.add(entry['attr'])
+        entries.append(entry)
+    return entries
+
+
+def _op_entry(verb, uri_path, op_obj):
+    """
+    Return the index entry for an OperationObject.
+    """
+    from .genop import _get_op_docs
+    op_id = str(op_obj['operationId'])
+    tags = op_obj['tags']
+    path_template = sanitize_fmt_string(
+        uri_path, reserved=CLIENT_RESERVED_KWARGS, suffix=CLIENT_PARAM_SUFFIX)
+    return {
+        'operation_id': op_id,
+        'method_name': py_identifier(op_id, reserved=()),
+        'executor': py_identifier(
+            op_id[0].upper() + op_id[1:] + 'Request', reserved=()),
+        'verb': verb.upper(),
+        'path': uri_path,
+        'path_template': path_template,
+        'params': _param_entries(op_obj),
+        'tags': [str(t) for t in tags] if tags is not None else [],
+        'doc': _get_op_docs(verb, path_template, op_obj),
+    }
+
+
+def build_op_index(spec: OpenApiObject):
+    """
+    Return the operation index entries for a spec, in document order.
+
+    Returns:
+        list: one (JSON-serializable) dict per operation
+    """
+    entries = []
+    paths = spec['paths']
+    for uri_path in paths:
+        path_item = paths[uri_path].target()
+        for verb in PATH_ITEM_VERBS:
+            op_obj = path_item[verb]
+            if op_obj is not None:
+                entries.append(_op_entry(verb, str(uri_path), op_obj))
+    return entries
+
+
+def build_client_index(cls_name: str, spec: OpenApiObject):
+    """
+    Return the (JSON-serializable) index used to generate a client class.
+    """
+    from .gencli import _get_cls_docs
+    return {
+        'version': OP_INDEX_VERSION,
+        'class_name': cls_name,
+        'doc': _get_cls_docs(spec),
+        'operations': build_op_index(spec),
+    }
@@ -4,8 +4,36 @@ Poast OpTable.
 
 from weakref import proxy
 
+from .genop import get_op_method
 
-class OpTable:
+
+class OpTableType(type):
+    """
+    Metaclass for API operation tables.
+
+    Operation methods are generated the first time they are accessed, from
+    the ``operationId -> (verb, uri_path, OperationObject)`` index in the
+    ``_operations`` class attribute, and then stored on the class.
+    """
+
+    def __getattr__(cls, name):
+        # NOTE: only called if normal lookup fails, i.e. for operations which
+        #       have not been materialized yet:
+        op = cls._operations.get(name)
+        if op is None:
+            raise AttributeError(
+                f"type object '{cls.__name__}' has no attribute '{name}'")
+
+        verb, uri_path, op_obj = op
+        op_fn = get_op_method(cls.__name__, name, verb, uri_path, op_obj)
+        setattr(cls, name, op_fn)
+        return op_fn
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(cls._operations))
+
+
+class OpTable(metaclass=OpTableType):
     """
     API Operations Table.
     """
@@ -15,6 +43,9 @@ class OpTable:
         '_client',
     )
 
+    #: operationId -> (verb, uri_path, OperationObject), for lazy operations:
+    _operations = {}
+
     def __init__(self, client, operations=None):
         """
         Create an instance of the operation.
@@ -27,3 +58,52 @@ class OpTable:
 
         self._client = proxy(client)
         return
+
+    def __getattr__(self, name):
+        # Materialize the operation on the class, then bind it:
+        if name not in type(self)._operations:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(type(self), name).__get__(self, type(self))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(type(self)._operations))
+
+
+class OpGroup:
+    """
+    Descriptor for one group of a client's operations (e.g. those with the
+    same tag), as a separate operations table.
+
+    The table class is generated the first time the group is accessed (via
+    ``make_cls``), and each client creates its table instance on first
+    access, too.
+
+    Attributes:
+        name (str): the group's attribute name
+    """
+
+    __slots__ = ('name', '_make_cls', '_cls')
+
+    def __init__(self, name, make_cls):
+        self.name = name
+        self._make_cls = make_cls
+        self._cls = None
+
+    def table_cls(self):
+        """
+        Return the group's (OpTable subclass) table class.
+        """
+        if self._cls is None:
+            self._cls = self._make_cls()
+        return self._cls
+
+    def __get__(self, client, cls=None):
+        if client is None:
+            return self.table_cls()
+
+        tables = client._op_groups
+        table = tables.get(self.name)
+        if table is None:
+            table = tables[self.name] = self.table_cls()(client)
+        return table
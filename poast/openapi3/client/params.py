@@ -0,0 +1,418 @@
+"""
+Serialization of OpenAPI 3.0 operation parameters.
+
+Path parameters are expanded according to their ``style`` and ``explode``
+fields (see the `style values
+<https://spec.openapis.org/oas/v3.0.3#style-values>`_ and RFC 6570), and
+percent-encoded:
+
+======= ======= ========== ================ ====================
+style   explode ``5``      ``[3, 4]``       ``{'a': 1, 'b': 2}``
+======= ======= ========== ================ ====================
+simple  false   ``5``      ``3,4``          ``a,1,b,2``
+simple  true    ``5``      ``3,4``          ``a=1,b=2``
+label   false   ``.5``     ``.3,4``         ``.a,1,b,2``
+label   true    ``.5``     ``.3.4``         ``.a=1.b=2``
+matrix  false   ``;id=5``  ``;id=3,4``      ``;id=a,1,b,2``
+matrix  true    ``;id=5``  ``;id=3;id=4``   ``;a=1;b=2``
+======= ======= ========== ================ ====================
+
+Parameters are described by operation index entries (see
+:func:`~poast.openapi3.client.opindex.build_op_index`), so that both
+dynamically generated clients and client modules written by ``poast-gen`` use
+the same serializers.
+"""
+
+import string
+from urllib.parse import quote
+
+from .util import py_identifier
+
+PATH_STYLES = ('simple', 'label', 'matrix')
+QUERY_STYLES = ('form', 'spaceDelimited', 'pipeDelimited', 'deepObject')
+
+# Reserved characters (RFC 3986), left as is for allowReserved parameters:
+_RESERVED = ":/?#[]@!$&'()*+,;="
+
+
+def _str(value):
+    """
+    Return the string form of a (primitive) parameter value.
+    """
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    return str(value)
+
+
+def path_encoder(name, style='simple', explode=False):
+    """
+    Return a function which expands (and percent-encodes) the value of a
+    path parameter.
+
+    Args:
+        name (str): the parameter name
+        style (str): one of ``simple``, ``label`` or ``matrix``
+        explode (bool): the parameter's ``explode`` field
+
+    Raises:
+        ValueError: if ``style`` is not a path parameter style
+    """
+    if style not in PATH_STYLES:
+        raise ValueError(f'unsupported path parameter style {style!r}')
+
+    qname = quote(name, safe='')
+    head = {'simple': '', 'label': '.', 'matrix': f';{qname}='}[style]
+    # Separators for exploded arrays (and objects):
+    sep = {'simple': ',', 'label': '.', 'matrix': f';{qname}='}[style]
+    obj_sep = {'simple': ',', 'label': '.', 'matrix': ';'}[style]
+    obj_head = ';' if style == 'matrix' else head
+
+    def encode(value):
+        if value is None:
+            raise TypeError(f"missing required path parameter {name!r}")
+        if value.__class__ is int:
+            return head + str(value)
+
+        if isinstance(value, (list, tuple)):
+            items = [quote(_str(v), safe='') for v in value]
+            return head + (sep if explode else ',').join(items)
+
+        if isinstance(value, dict):
+            if explode:
+                return obj_head + obj_sep.join(
+                    f'{quote(_str(k), safe="")}={quote(_str(v), safe="")}'
+                    for k, v in value.items())
+            return head + ','.join(
+                quote(_str(v), safe='')
+                for kv in value.items() for v in kv)
+
+        value = quote(_str(value), safe='')
+        if not value and style == 'matrix':
+            # NOTE: RFC 6570 drops the '=' for empty matrix values:
+            return head[:-1]
+        return head + value
+    return encode
+
+
+def encode_path_param(value, name, style='simple', explode=False):
+    """
+    Expand (and percent-encode) the value of a path parameter.
+
+    .. seealso:: :func:`path_encoder`
+    """
+    return path_encoder(name, style, explode)(value)
+
+
+def query_encoder(name, style='form', explode=True, allow_reserved=False):
+    """
+    Return a function which serializes the value of a query parameter into
+    (percent-encoded) ``name=value`` pairs.
+
+    Args:
+        name (str): the parameter name
+        style (str): one of ``form``, ``spaceDelimited``, ``pipeDelimited``
+            or ``deepObject``
+        explode (bool): the parameter's ``explode`` field
+        allow_reserved (bool): if ``True``, reserved characters in values
+            are not percent-encoded (the ``allowReserved`` field)
+
+    Raises:
+        ValueError: if ``style`` is not a query parameter style
+    """
+    if style not in QUERY_STYLES:
+        raise ValueError(f'unsupported query parameter style {style!r}')
+
+    safe = _RESERVED if allow_reserved else ''
+    qname = quote(name, safe='')
+    head = f'{qname}='
+    # Separator for (non-exploded) arrays:
+    sep = {'spaceDelimited': '%20', 'pipeDelimited': '|'}.get(style, ',')
+
+    def q(value):
+        return quote(_str(value), safe=safe)
+
+    def encode(value):
+        if value.__class__ is int:
+            return head + str(value)
+
+        if isinstance(value, (list, tuple)):
+            if explode:
+                return '&'.join(head + q(v) for v in value)
+            return head + sep.join(q(v) for v in value)
+
+        if isinstance(value, dict):
+            if style == 'deepObject':
+                return '&'.join(
+                    f'{qname}[{quote(_str(k), safe="")}]={q(v)}'
+                    for k, v in value.items())
+            if explode:
+                return '&'.join(
+                    f'{quote(_str(k), safe="")}={q(v)}'
+                    for k, v in value.items())
+            return head + sep.join(q(v) for kv in value.items() for v in kv)
+
+        return head + q(value)
+    return encode
+
+
+def header_encoder(name, style='simple', explode=False):
+    """
+    Return a function which serializes the value of a header parameter
+    (``simple`` style; values are not percent-encoded).
+    """
+    def encode(value):
+        if isinstance(value, (list, tuple)):
+            return ','.join(_str(v) for v in value)
+        if isinstance(value, dict):
+            if explode:
+                return ','.join(
+                    f'{_str(k)}={_str(v)}' for k, v in value.items())
+            return ','.join(_str(v) for kv in value.items() for v in kv)
+        return _str(value)
+    return encode
+
+
+def cookie_encoder(name, style='form', explode=True):
+    """
+    Return a function which serializes the value of a cookie parameter
+    (``form`` style; arrays and objects are always serialized as if not
+    exploded, since a cookie has a single value).
+    """
+    def encode(value):
+        if isinstance(value, (list, tuple)):
+            return ','.join(_str(v) for v in value)
+        if isinstance(value, dict):
+            return ','.join(_str(v) for kv in value.items() for v in kv)
+        return _str(value)
+    return encode
+
+
+#: Supported styles (the first is used for unsupported ones), and encoder
+#: factories, by parameter location:
+_STYLES = {
+    'path': PATH_STYLES,
+    'query': QUERY_STYLES,
+    'header': ('simple',),
+    'cookie': ('form',),
+}
+
+ENCODERS = {
+    'path': path_encoder,
+    'query': query_encoder,
+    'header': header_encoder,
+    'cookie': cookie_encoder,
+}
+
+
+def _encoder_args(param):
+    """
+    Return the encoder factory arguments for a parameter index entry.
+    """
+    param_in = param['in']
+    style = param['style']
+    # NOTE: styles which are not valid for the parameter's location (which
+    #       the spec does not otherwise reject) fall back to the default:
+    if style not in _STYLES[param_in]:
+        style = _STYLES[param_in][0]
+
+    args = (param['name'], style, param['explode'])
+    if param_in == 'query':
+        args += (param['allow_reserved'],)
+    return args
+
+
+def _path_params(path, params):
+    """
+    Return the ``(literal, param)`` parts of an operation path, where
+    ``param`` is the index entry for the path parameter which follows the
+    literal text (or ``None``).
+    """
+    by_name = {p['name']: p for p in params if p['in'] == 'path'}
+    parts = []
+    for text, name, _, _ in string.Formatter().parse(path):
+        param = None
+        if name:
+            # NOTE: placeholders with no documented parameter are required,
+            #       simple style parameters:
+            param = by_name.get(name) or {
+                'name': name, 'in': 'path', 'attr': py_identifier(name),
+                'required': True, 'style': 'simple', 'explode': False,
+            }
+        parts.append((text, param))
+    return parts
+
+
+def operation_params(path, params):
+    """
+    Return the parameter index entries used to build requests for an
+    operation: the path parameters (in path order, including undocumented
+    ones), then its query, header and cookie parameters.
+    """
+    entries = [p for _, p in _path_params(path, params) if p is not None]
+    entries.extend(p for p in params if p['in'] != 'path')
+    return entries
+
+
+def _unique(name, taken):
+    """
+    Return ``name`` (with ``_`` appended, as necessary) if it is in
+    ``taken``.
+    """
+    while name in taken:
+        name += '_'
+    return name
+
+
+def request_source(path, params, value, encoder):
+    """
+    Generate the source lines (unindented) of a function body which builds
+    the request path (including any query string), headers and cookies for
+    an operation, as the locals ``request_path``, ``headers`` and
+    ``cookies`` (the latter two initially set to any values passed by the
+    caller).
+
+    Args:
+        path (str): the operation path (e.g. ``/pets/{petId}``)
+        params (list): the operation's parameter index entries
+        value: function returning the source of an expression for the value
+            of a parameter (``None``, if not given)
+        encoder: function returning the name of the encoder for a parameter,
+            given its location and the encoder factory arguments
+
+    Returns:
+        tuple: ``(lines, names)``, where ``names`` maps ``request_path``,
+        ``v``, ``query``, ``op_headers`` and ``op_cookies`` to the names of
+        the locals actually used (which avoid parameter names)
+    """
+    taken = set(p['attr'] for p in operation_params(path, params))
+    names = {}
+    for name in ('request_path', 'v', 'query', 'op_headers', 'op_cookies'):
+        names[name] = _unique(name, taken)
+    v = names['v']
+
+    def assign(param, stmt):
+        lines = [f'{v} = {value(param)}', f'if {v} is not None:',
+                 f'    {stmt}']
+        if param['required']:
+            lines.extend([
+                'else:',
+                f'    raise TypeError("missing required {param["in"]} '
+                f'parameter {param["name"]!r}")',
+            ])
+        return lines
+
+    # Path (and path parameters):
+    lines = []
+    expr = []
+    for text, param in _path_params(path, params):
+        if text:
+            expr.append(repr(text))
+        if param is not None:
+            enc = encoder('path', _encoder_args(param))
+            expr.append(f'{enc}({value(param)})')
+    request_path = names['request_path']
+    lines.append(f'{request_path} = {" + ".join(expr) or repr("")}')
+
+    # Query string:
+    query = names['query']
+    query_params = [p for p in params if p['in'] == 'query']
+    if query_params:
+        lines.append(f'{query} = []')
+        for param in query_params:
+            enc = encoder('query', _encoder_args(param))
+            lines.extend(assign(param, f'{query}.append({enc}({v}))'))
+        lines.extend([
+            f'if {query}:',
+            f"    {request_path} += '?' + '&'.join(filter(None, {query}))",
+        ])
+
+    # Headers and cookies (which take precedence over those passed in):
+    for param_in, arg in (('header', 'headers'), ('cookie', 'cookies')):
+        loc_params = [p for p in params if p['in'] == param_in]
+        if not loc_params:
+            continue
+        op_values = names[f'op_{arg}']
+        lines.append(f'{op_values} = {{}}')
+        for param in loc_params:
+            enc = encoder(param_in, _encoder_args(param))
+            lines.extend(assign(
+                param, f'{op_values}[{param["name"]!r}] = {enc}({v})'))
+        lines.extend([
+            f'if {op_values}:',
+            f'    {arg} = {{**{arg}, **{op_values}}} if {arg} '
+            f'else {op_values}',
+        ])
+    return lines, names
+
+
+def _unexpected(op_params, known):
+    names = ', '.join(repr(k) for k in op_params if k not in known)
+    raise TypeError(f'unexpected keyword argument(s): {names}')
+
+
+def compile_request(path, params):
+    """
+    Compile the parameters of an operation into a function which builds the
+    request path (including the query string), headers and cookies from a
+    dictionary of parameter values (by python argument name; see the
+    ``attr`` of each parameter entry).
+
+    Parameter defaults and encoders are resolved once, here.
+
+    Args:
+        path (str): the operation path (e.g. ``/pets/{petId}``)
+        params (list): the operation's parameter index entries
+
+    Returns:
+        function: ``build_request(op_params, headers, cookies)``, which
+        returns ``(request_path, headers, cookies)``, and raises
+        ``TypeError`` if a required parameter is missing, or an unknown
+        parameter is given.
+    """
+    ns = {
+        '_known': frozenset(p['attr'] for p in operation_params(path, params)),
+        '_unexpected': _unexpected,
+    }
+
+    def encoder(param_in, args):
+        name = f'_e{len(ns)}'
+        ns[name] = ENCODERS[param_in](*args)
+        return name
+
+    body, names = request_source(
+        path, params, lambda p: f'get({p["attr"]!r})', encoder)
+    lines = [
+        'def build_request(op_params, headers, cookies):',
+        '    get = op_params.get',
+        '    if op_params and not _known.issuperset(op_params):',
+        '        _unexpected(op_params, _known)',
+    ]
+    lines.extend(f'    {line}' for line in body)
+    lines.append(f'    return {names["request_path"]}, headers, cookies')
+    source = '\n'.join(lines) + '\n'
+    exec(compile(source, f'<request: {path}>', 'exec'), ns)
+    return ns['build_request']
+
+
+def compile_path(path, params):
+    """
+    Compile the path of an operation into a function which builds the
+    request path from a dictionary of path parameter values (by python
+    argument name; see the ``attr`` of each parameter entry).
+
+    Args:
+        path (str): the operation path (e.g. ``/pets/{petId}``)
+        params (list): the operation's parameter index entries
+
+    Returns:
+        function: ``build_path(path_params)``, which raises ``TypeError``
+        if a path parameter is missing.
+    """
+    build_request = compile_request(
+        path, [p for p in params if p['in'] == 'path'])
+
+    def build_path(path_params):
+        return build_request(path_params, None, None)[0]
+    return build_path
@@ -0,0 +1,156 @@
+"""
+Registry of generated client classes, so that clients (and the requests they
+prepare) can be pickled, e.g. to fan work out to :mod:`multiprocessing` or
+:class:`concurrent.futures.ProcessPoolExecutor` workers.
+
+Client classes generated by
+:func:`~poast.openapi3.client.gencli.gen_client_cls` are created by
+``type()``, and so cannot be pickled by name. Instead, clients are pickled
+with a reference to their class: its key (the spec's content hash, the class
+name and the generation options) and the spec's client index (see
+:mod:`~poast.openapi3.client.opindex`), without docstrings and compressed.
+When a client is unpickled, its class is looked up by key and, if it was not
+generated in this process, it is built from the client index (as by
+``poast-gen``), without the spec, once per process.
+
+Example::
+
+    >>> PetStore = gen_client_cls('PetStore', doc)
+    >>> client = PetStore('https://petstore.example.com/v1')
+    >>> with ProcessPoolExecutor() as pool:
+    ...     urls = list(pool.map(pet_url, [client] * 4, range(4)))
+
+NOTE: classes built from a client index have no access to the spec, so
+request and response validation are not available to them (see
+:mod:`~poast.openapi3.client.codegen`; unpickled clients which were configured
+to validate log a warning), and they have no docstrings.
+"""
+
+import json
+import zlib
+from weakref import WeakValueDictionary
+
+from .opindex import OP_INDEX_VERSION, build_op_index
+
+#: Client classes, by key (generated in this process, and pickled):
+_classes = WeakValueDictionary()
+
+#: Client classes built from a client index, by key:
+_built = {}
+
+
+class ClientClassRef:
+    """
+    Reference to a generated client class, which pickles as the class's key
+    and packed client index (both computed when it is first pickled).
+
+    Attributes:
+        cls (type): the client class
+    """
+
+    __slots__ = ('cls', '_cls_name', '_spec', '_options', '_op_index',
+                 '_key', '_packed')
+
+    def __init__(self, cls_name, spec, options, op_index=None):
+        self.cls = None
+        self._cls_name = cls_name
+        self._spec = spec
+        self._options = tuple(sorted(options.items()))
+        self._op_index = op_index
+        self._key = None
+        self._packed = None
+
+    @classmethod
+    def from_index(cls, client_cls, key, packed):
+        """
+        Return the reference for a class built from a packed client index.
+        """
+        ref = cls(key[1], None, dict(key[2]))
+        ref.cls = client_cls
+        ref._key = key
+        ref._packed = packed
+        return ref
+
+    def key(self):
+        """
+        Return the registry key of the class.
+        """
+        if self._key is None:
+            self._key = (
+                self._spec.content_hash(), self._cls_name, self._options)
+        return self._key
+
+    def packed(self):
+        """
+        Return the packed client index of the class (see :func:`pack_index`).
+        """
+        if self._packed is None:
+            operations = self._op_index
+            if operations is None:
+                operations = build_op_index(self._spec)
+            self._packed = pack_index({
+                'version': OP_INDEX_VERSION,
+                'class_name': self._cls_name,
+                'operations': operations,
+            })
+        return self._packed
+
+    def __reduce__(self):
+        key = self.key()
+        _classes.setdefault(key, self.cls)
+        return (resolve_client_cls, (key, self.packed()))
+
+
+def pack_index(index):
+    """
+    Return a client index as compressed JSON, without its (class and
+    operation) docstrings, which are most of its size.
+    """
+    index = {**index, 'doc': '', 'operations': [
+        {**op, 'doc': ''} for op in index['operations']]}
+    return zlib.compress(
+        json.dumps(index, separators=(',', ':')).encode('utf-8'))
+
+
+def unpack_index(packed):
+    """
+    Return the client index packed by :func:`pack_index`.
+    """
+    return json.loads(zlib.decompress(packed).decode('utf-8'))
+
+
+def build_client_cls(key, packed):
+    """
+    Build a client class from a packed client index, by executing the
+    source generated for it.
+    """
+    from .codegen import gen_client_source
+
+    index = unpack_index(packed)
+    if index.get('version') != OP_INDEX_VERSION:
+        raise ValueError(
+            f'unsupported client index version: {index.get("version")}')
+    source = gen_client_source(index, **dict(key[2]))
+    module_name = f'{__name__}.{index["class_name"]}'
+    ns = {'__name__': module_name}
+    exec(compile(source, f'<{module_name}>', 'exec'), ns)
+
+    # The class pickles by reference, too (e.g. to return it from a worker):
+    cls = ns[index['class_name']]
+    cls._client_ref = ClientClassRef.from_index(cls, key, packed)
+    return cls
+
+
+def resolve_client_cls(key, packed):
+    """
+    Return the client class for a key, building it from its client index if
+    it was not generated in this process.
+
+    Args:
+        key (tuple): ``(spec content hash, class name, options)``
+        packed (bytes): the packed client index (see :func:`pack_index`)
+    """
+    cls = _classes.get(key)
+    if cls is None:
+        cls = _classes[key] = _built[key] = build_client_cls(key, packed)
+    return cls
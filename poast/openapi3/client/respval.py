@@ -0,0 +1,256 @@
+"""
+Sampled validation of API responses, against an operation's ResponsesObject.
+
+Clients opt in via :class:`~poast.openapi3.client.config.ClientConfig`
+(``validate_responses`` is the fraction of requests whose responses are
+validated). Sampling is decided when a request is prepared, so unsampled
+requests carry no response hook at all.
+"""
+
+import random
+
+from ..spec.model.exceptions import PayloadValidationException
+from ..spec.payload import compile_validator
+from .util import is_json_media_type
+
+
+def select_response(responses, status_code):
+    """
+    Select the ResponseObject for a given status code, falling back to the
+    status code range (e.g. ``2XX``) and then ``default``.
+
+    Args:
+        responses (ResponsesObject): the operation's responses
+        status_code (int): the HTTP status code
+
+    Returns:
+        ResponseObject: the matching response (references are followed), or
+        ``None``
+    """
+    if responses is None:
+        return None
+
+    for key in (str(status_code), f'{str(status_code)[0]}XX', 'default'):
+        response = responses.get(key)
+        if response is None and key.endswith('XX'):
+            response = responses.get(key.replace('XX', 'xx'))
+        if response is not None:
+            return response.target()
+    return None
+
+
+def select_media_type(content, content_type):
+    """
+    Select the MediaTypeObject for a given ``Content-Type`` header value,
+    falling back to ``type/*`` and then ``*/*``.
+
+    Args:
+        content (OpenApiMap): media type to MediaTypeObject
+        content_type (str): the ``Content-Type`` header value
+
+    Returns:
+        tuple: ``(media_type, MediaTypeObject)``, or ``(None, None)``
+    """
+    if not content:
+        return None, None
+
+    media_type = (content_type or '').split(';', 1)[0].strip().lower()
+    for key in (media_type, media_type.split('/', 1)[0] + '/*', '*/*'):
+        media = content.get(key)
+        if media is not None:
+            return key, media
+
+    # Media type keys are case-insensitive:
+    for key in content:
+        if key.split(';', 1)[0].strip().lower() == media_type:
+            return key, content[key]
+    return None, None
+
+
+def select_json_schema(op_obj, response):
+    """
+    Select the JSON body schema for a response to an operation.
+
+    Args:
+        op_obj (OperationObject): the operation
+        response (requests.Response): the response
+
+    Returns:
+        SchemaObject: the body schema (possibly a reference)
+
+    Raises:
+        PayloadValidationException: if the response's status code, or its
+            media type, is not documented (i.e. it violates the contract)
+        ValueError: if the response has no documented JSON body schema
+    """
+    responses = op_obj['responses']
+    status_code = response.status_code
+    response_obj = select_response(responses, status_code)
+    if response_obj is None:
+        raise PayloadValidationException(
+            '$', responses.doc_path if responses is not None
+            else op_obj.doc_path, 'status',
+            f'undocumented status code {status_code}')
+
+    content = response_obj['content']
+    content_type = response.headers.get('Content-Type')
+    if content:
+        media_type, media = select_media_type(content, content_type)
+        if media is None:
+            raise PayloadValidationException(
+                '$', content.doc_path, 'media_type',
+                f'undocumented media type {content_type!r}')
+        if media['schema'] is not None and is_json_media_type(
+                content_type or media_type):
+            return media['schema']
+    raise ValueError(f'no JSON schema for {status_code} {content_type!r}')
+
+
+class ResponseValidator:
+    """
+    Validates (a sample of) the responses to a single operation, counting
+    the outcomes.
+
+    Attributes:
+        op_id (str): the operationId
+        requests (int): number of requests prepared
+        sampled (int): number of requests selected for response validation
+        validated (int): number of response bodies validated successfully
+        failures (int): number of responses which violated the contract
+        skipped (int): number of sampled responses with nothing to validate
+            (e.g. no schema, a non-JSON media type, or a schema which cannot
+            be compiled)
+    """
+
+    __slots__ = (
+        'op_id',
+        '_op_obj',
+        '_random',
+        '_validators',
+        'requests',
+        'sampled',
+        'validated',
+        'failures',
+        'skipped',
+    )
+
+    def __init__(self, op_id, op_obj, rand=random.random):
+        self.op_id = op_id
+        self._op_obj = op_obj
+        self._random = rand
+        self._validators = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters to zero.
+        """
+        self.requests = 0
+        self.sampled = 0
+        self.validated = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def sample(self, rate):
+        """
+        Count a request, and return ``True`` if its response should be
+        validated, given the sampling ``rate`` (``0.0`` - ``1.0``).
+        """
+        self.requests += 1
+        if rate >= 1.0 or self._random() < rate:
+            self.sampled += 1
+            return True
+        return False
+
+    def validate(self, response, logger=None):
+        """
+        Validate a :class:`requests.Response`.
+
+        Schemas which cannot be compiled (e.g. with unsupported keywords)
+        are logged, to ``logger``, and skipped.
+
+        Returns:
+            PayloadValidationException: the violation, or ``None``
+        """
+        try:
+            if self._validate(response, logger):
+                self.validated += 1
+            else:
+                self.skipped += 1
+        except PayloadValidationException as e:
+            self.failures += 1
+            return e
+        return None
+
+    def _compile(self, schema, logger):
+        """
+        Return the (cached) validator for a schema, or ``None`` if it cannot
+        be compiled.
+        """
+        key = id(schema)
+        try:
+            return self._validators[key]
+        except KeyError:
+            pass
+
+        try:
+            validator = compile_validator(schema)
+        except ValueError as e:
+            validator = None
+            if logger is not None:
+                logger.warning(f'{self.op_id}: cannot validate responses '
+                               f'against {schema.doc_path}: {e}')
+        self._validators[key] = validator
+        return validator
+
+    def _validate(self, response, logger):
+        try:
+            schema = select_json_schema(self._op_obj, response)
+        except PayloadValidationException:
+            raise
+        except ValueError:
+            # Nothing to validate:
+            return False
+
+        validator = self._compile(schema, logger)
+        if validator is None:
+            return False
+
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise PayloadValidationException(
+                '$', schema.doc_path, 'json', f'invalid JSON body: {e}')
+        validator(body)
+        return True
+
+    def stats(self):
+        """
+        Return the counters as a python dictionary.
+        """
+        return {
+            'requests': self.requests,
+            'sampled': self.sampled,
+            'validated': self.validated,
+            'failures': self.failures,
+            'skipped': self.skipped,
+        }
+
+    def hook(self, logger, raise_errors=False):
+        """
+        Return a ``requests`` response hook which validates the response.
+
+        Violations are logged as warnings, or (if ``raise_errors``) raised.
+        """
+        def _validate_response(response, *args, **kwargs):
+            e = self.validate(response, logger)
+            if e is not None:
+                if raise_errors:
+                    raise e
+                logger.warning(f'{self.op_id}: response does not match '
+                               f'the API spec: {e}')
+            return response
+        return _validate_response
+
+    def __repr__(self):
+        return f'ResponseValidator({self.op_id!r}, {self.stats()!r})'
@@ -0,0 +1,143 @@
+"""
+Runtime helpers shared by dynamically generated clients and by client
+modules written ahead of time (see :mod:`poast.openapi3.client.codegen`).
+
+Requests are prepared without :meth:`requests.Session.prepare_request`,
+whenever the client's session allows it: the client's root URL is prepared
+once, per client, and the session's headers, auth, params and hooks are
+merged into each request as the session would (but without building and
+re-parsing an intermediate :class:`requests.Request`). Clients whose
+session (or request class) customizes request preparation use the session,
+as before.
+"""
+
+from requests import Request, Session
+from requests.cookies import (
+    RequestsCookieJar,
+    cookiejar_from_dict,
+    merge_cookies,
+)
+from requests.exceptions import RequestException
+from requests.models import PreparedRequest
+from requests.sessions import merge_hooks, merge_setting
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_netrc_auth, requote_uri
+
+
+class FastPath:
+    """
+    Per-client state used to prepare requests without the session.
+
+    Attributes:
+        root_url (str): the client's root URL, in its prepared (canonical)
+            form, without a trailing slash
+        netrc_auth (tuple): ``.netrc`` credentials for the root URL (or
+            ``None``), used if the session trusts the environment
+    """
+
+    __slots__ = ('root_url', 'netrc_auth')
+
+    def __init__(self, root_url, netrc_auth):
+        self.root_url = root_url
+        self.netrc_auth = netrc_auth
+
+
+def fast_path(client):
+    """
+    Return the :class:`FastPath` for a client, or ``None`` if its requests
+    must be prepared by its session.
+    """
+    session = client._session
+    if client._request_cls is not Request or \
+            type(session).prepare_request is not Session.prepare_request:
+        return None
+
+    # Request URLs are not re-parsed, so the root URL is prepared once:
+    root = PreparedRequest()
+    try:
+        root.prepare_url(client._root_url, None)
+    except RequestException:
+        return None
+    if '?' in root.url or '#' in root.url:
+        return None
+
+    root_url = root.url.rstrip('/')
+    return FastPath(root_url, get_netrc_auth(root_url))
+
+
+def prepare_request(client, executor_cls, verb, request_path, headers=None,
+                    params=None, cookies=None, data=None, json=None,
+                    files=None, hooks=None):
+    """
+    Prepare a request for an API operation, and attach its executor.
+
+    Headers and cookies passed in take precedence over the client's
+    configured headers and cookies, which take precedence over the
+    session's.
+
+    Args:
+        client (OpenApiClient): the client making the request
+        executor_cls (type): the operation's RequestExecutor subclass
+        verb (str): the (upper case) HTTP method
+        request_path (str): the operation path, with path parameters filled in
+
+    Returns:
+        requests.PreparedRequest: the prepared request, with an ``execute``
+        attribute which sends it using the client's session
+    """
+    session = client._session
+    fast = client._fast_path
+    if fast is None:
+        # Apply the client's configured headers and cookies, and let the
+        # session merge in its own:
+        if client._headers:
+            headers = {**client._headers, **headers} if headers \
+                else client._headers
+        if client._cookies:
+            cookies = {**client._cookies, **cookies} if cookies \
+                else client._cookies
+        r = client._request_cls(
+            verb, client._root_url + request_path, headers=headers,
+            params=params, cookies=cookies, data=data, json=json,
+            files=files, hooks=hooks)
+        pr = session.prepare_request(r)
+    else:
+        pr = PreparedRequest()
+        pr.method = verb
+
+        # NOTE: the session's state is read for every request, since it may
+        #       change (e.g. when an access token is refreshed):
+        url = fast.root_url + request_path
+        params = merge_setting(params, session.params)
+        if params or not request_path.startswith('/'):
+            pr.prepare_url(url, params)
+        else:
+            pr.url = requote_uri(url)
+
+        if client._headers:
+            headers = {**client._headers, **headers} if headers \
+                else client._headers
+        pr.prepare_headers(merge_setting(
+            headers, session.headers, dict_class=CaseInsensitiveDict))
+
+        # NOTE: the request always gets a cookie jar of its own, as with
+        #       the session (e.g. redirects store response cookies in it);
+        #       dicts must be converted to jars, to take precedence:
+        merged = merge_cookies(RequestsCookieJar(), session.cookies)
+        if client._cookies:
+            merge_cookies(merged, cookiejar_from_dict(client._cookies))
+        if cookies:
+            merge_cookies(merged, cookiejar_from_dict(cookies))
+        pr.prepare_cookies(merged)
+
+        pr.prepare_body(data, files, json)
+        auth = session.auth
+        if auth is None and session.trust_env:
+            auth = fast.netrc_auth
+        if auth:
+            pr.prepare_auth(auth, pr.url)
+        pr.prepare_hooks(merge_hooks(hooks, session.hooks))
+
+    # Wrap it in an operation request executor and return:
+    pr.execute = executor_cls(session, pr)
+    return pr
@@ -3,12 +3,14 @@ General utilities used by poast OpenApiClient generation modules.
 """
 
 import keyword
+import re
 import string
 
 PATH_ITEM_VERBS = (
     'get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
 
 CLIENT_RESERVED_KWARGS = set((
+    'self',
     'headers',
     'params',
     'cookies',
@@ -38,6 +40,17 @@ def sanitize_identifier(name, reserved=set(), prefix='', suffix='_'):
         return name
 
 
+def py_identifier(name, reserved=CLIENT_RESERVED_KWARGS,
+                  suffix=CLIENT_PARAM_SUFFIX):
+    """
+    Return a valid python identifier for an operationId or parameter name.
+    """
+    ident = re.sub(r'\W', '_', name)
+    if not ident or ident[0].isdigit():
+        ident = f'_{ident}'
+    return sanitize_identifier(ident, reserved=reserved, suffix=suffix)
+
+
 def sanitize_fmt_string(fmt_string, reserved=None, prefix='', suffix='_'):
     """
     Check the URI path for:
@@ -55,6 +68,36 @@ def sanitize_fmt_string(fmt_string, reserved=None, prefix='', suffix='_'):
     return ''.join(parts)
 
 
+class LazyDocstring:
+    """
+    Descriptor for a ``__doc__`` attribute which is generated (by calling
+    ``fn(*args)``) the first time it is read, e.g. by ``help()``.
+    """
+
+    __slots__ = ('_fn', '_args', '_doc')
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+        self._doc = None
+
+    def __get__(self, obj, cls=None):
+        if self._fn is not None:
+            self._doc = self._fn(*self._args)
+            self._fn = self._args = None
+        return self._doc
+
+
 def client_sanitize(f, x):
     return f(
         x, reserved=CLIENT_RESERVED_KWARGS, suffix=CLIENT_PARAM_SUFFIX)
+
+
+def is_json_media_type(media_type):
+    """
+    Return True if the given media type (e.g. from a request body's content
+    map) is a JSON type, e.g. ``application/json`` or
+    ``application/problem+json``.
+    """
+    media_type = media_type.split(';', 1)[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
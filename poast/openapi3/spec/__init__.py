@@ -8,8 +8,16 @@ Resources
 from .model.exceptions import (  # noqa: F401
     MalformedDocumentException,
     MissingRequiredFieldException,
+    PayloadValidationException,
 )
 
+from .model.violation import (  # noqa: F401
+    Violation,
+    ValidationCache,
+)
+
+from .model.profile import ValidationProfile  # noqa: F401
+
 from .document import OpenApiObject  # noqa: F401
 
 # EOF
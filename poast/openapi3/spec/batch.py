@@ -0,0 +1,384 @@
+"""
+Vectorized validation of large arrays of homogeneous records, using NumPy.
+
+The records are converted into one column per property, and the constraints
+on scalar properties (type, nullability, required-presence, enum, numeric
+bounds, ``multipleOf``, ``int32``/``int64`` range, string lengths and
+patterns) are checked a column at a time. Properties which can't be checked
+by column (nested objects and arrays, ``allOf``/``oneOf``/``anyOf``/``not``)
+fall back to the compiled per-value validator (see
+:mod:`poast.openapi3.spec.payload`), as does an ``items`` schema which is
+not a plain object schema.
+
+NumPy is an optional dependency: this module requires it, but nothing else
+in poast imports it unless batch validation is used.
+
+Example::
+
+    >>> report = doc.schemas['Pet'].validate_batch(records)
+    >>> report.ok
+    False
+    >>> report.invalid_rows
+    array([17, 90210])
+"""
+
+import numpy as np
+
+from .model.exceptions import PayloadValidationException
+from .payload import (
+    compile_validator,
+    _MULTIPLE_OF_TOLERANCE,
+    _TYPE_CHECKS,
+    _child_path,
+    _deref,
+    _field_value,
+    _is_multiple,
+)
+from .util import compile_pattern
+
+_MISSING = object()
+
+#: Exact types of valid scalar values (the fast path; subclasses are
+#: checked as by the per-value validator):
+_SCALAR_TYPES = {
+    'integer': frozenset((int,)),
+    'number': frozenset((int, float)),
+    'boolean': frozenset((bool,)),
+    'string': frozenset((str,)),
+}
+
+_INT_RANGES = {
+    'int32': (-2 ** 31, 2 ** 31 - 1),
+    'int64': (-2 ** 63, 2 ** 63 - 1),
+}
+
+_COMBINATORS = ('allOf', 'oneOf', 'anyOf', 'not')
+
+
+class BatchFailure:
+    """
+    A single constraint, violated by one or more records.
+
+    Attributes:
+        path (str): the payload path of the offending values, with ``[*]``
+            in place of the row index (e.g. ``$[*].name``)
+        rule (str): the name of the violated schema keyword
+        message (str): description of the problem
+        schema_path (str): the document path of the violated schema
+        rows (numpy.ndarray): the indices of the offending records
+    """
+
+    __slots__ = ('path', 'rule', 'message', 'schema_path', 'rows')
+
+    def __init__(self, path, rule, message, schema_path, rows):
+        self.path = path
+        self.rule = rule
+        self.message = message
+        self.schema_path = schema_path
+        self.rows = rows
+
+    def errors(self):
+        """
+        Yield a :class:`PayloadValidationException` per offending record.
+        """
+        for row in self.rows:
+            yield PayloadValidationException(
+                self.path.replace('[*]', f'[{row}]', 1), self.schema_path,
+                self.rule, self.message)
+
+    def __repr__(self):
+        return (f'BatchFailure({self.path!r}, {self.rule!r}, '
+                f'rows={self.rows.tolist()!r})')
+
+
+class BatchReport:
+    """
+    The result of validating an array of records.
+
+    Attributes:
+        count (int): the number of records validated
+        failures (list): :class:`BatchFailure` objects
+    """
+
+    __slots__ = ('count', 'failures')
+
+    def __init__(self, count):
+        self.count = count
+        self.failures = []
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    @property
+    def invalid_rows(self):
+        """
+        The sorted, unique indices of all invalid records.
+        """
+        if not self.failures:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate([f.rows for f in self.failures]))
+
+    def errors(self):
+        """
+        Yield a :class:`PayloadValidationException` per violation, per record.
+        """
+        for failure in self.failures:
+            yield from failure.errors()
+
+    def _fail(self, path, rule, message, schema_path, rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        if rows.size:
+            self.failures.append(
+                BatchFailure(path, rule, message, schema_path, rows))
+        return
+
+    def __repr__(self):
+        return (f'BatchReport(count={self.count}, '
+                f'failures={len(self.failures)})')
+
+
+def _is_columnar(schema):
+    """
+    Return ``True`` if a records schema can be checked by column.
+    """
+    if _field_value(schema, 'type') not in (None, 'object'):
+        return False
+    if schema['properties'] is None:
+        return False
+    if _field_value(schema, 'minProperties') is not None or \
+            _field_value(schema, 'maxProperties') is not None:
+        return False
+    additional = schema['additionalProperties']
+    if additional is not None and isinstance(additional.value(), dict):
+        return False
+    return all(schema[c] is None for c in _COMBINATORS)
+
+
+def _is_vectorizable(prop):
+    """
+    Return ``True`` if a property schema can be checked by column.
+    """
+    return _field_value(prop, 'type') in _SCALAR_TYPES and \
+        all(prop[c] is None for c in _COMBINATORS)
+
+
+def _validate_values(report, validator, values, rows, name=None):
+    """
+    Per-value fallback: validate ``values`` (the records, or the values of
+    property ``name``) one at a time.
+    """
+    for value, row in zip(values, rows):
+        path = f'$[{row}]'
+        if name is not None:
+            path = _child_path(path, name)
+        try:
+            validator(value, path)
+        except PayloadValidationException as e:
+            report._fail(e.path.replace(f'[{row}]', '[*]', 1), e.rule,
+                         e.msg, e.schema_path, [row])
+    return
+
+
+def _to_array(prop_type, values):
+    if prop_type == 'integer':
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return np.array(values, dtype=object)
+    elif prop_type == 'number':
+        return np.array(values, dtype=np.float64)
+    elif prop_type == 'boolean':
+        return np.array(values, dtype=bool)
+
+    # NOTE: strings are not converted, since a (fixed width) unicode array
+    #       is as wide as the longest string:
+    return None
+
+
+def _not_multiple(arr, values, multiple_of):
+    """
+    Return the mask of numbers which are not multiples of ``multiple_of``
+    (as :func:`~poast.openapi3.spec.payload._is_multiple`).
+    """
+    if arr.dtype == object:
+        return np.fromiter(
+            (not _is_multiple(v, multiple_of) for v in values), bool,
+            len(values))
+    if arr.dtype.kind == 'i' and isinstance(multiple_of, int):
+        return arr % multiple_of != 0
+    with np.errstate(invalid='ignore', over='ignore'):
+        quotient = arr / multiple_of
+        return ~np.isfinite(quotient) | (
+            np.abs(quotient - np.round(quotient)) >
+            _MULTIPLE_OF_TOLERANCE * np.maximum(1.0, np.abs(quotient)))
+
+
+def _check_scalars(report, prop, path, values, rows):
+    """
+    Check the (non-null) values of a scalar property column.
+    """
+    schema_path = prop.doc_path
+    prop_type = _field_value(prop, 'type')
+    is_type = _TYPE_CHECKS[prop_type]
+
+    # Type: fast path if every value has an expected (exact) type:
+    if not set(map(type, values)) <= _SCALAR_TYPES[prop_type]:
+        ok = np.fromiter(map(is_type, values), bool, len(values))
+        report._fail(path, 'type', f'value must be of type {prop_type}',
+                     schema_path, rows[~ok])
+        rows = rows[ok]
+        values = [v for v, keep in zip(values, ok) if keep]
+    if not values:
+        return
+
+    arr = _to_array(prop_type, values)
+
+    def _fail(rule, message, bad):
+        report._fail(path, rule, message, schema_path,
+                     rows[np.asarray(bad, dtype=bool)])
+
+    enum = _field_value(prop, 'enum')
+    if enum is not None:
+        valid = [e for e in enum if is_type(e)]
+        if not valid:
+            bad = np.ones(len(values), dtype=bool)
+        elif arr is None:
+            valid = set(valid)
+            bad = np.fromiter(
+                (v not in valid for v in values), bool, len(values))
+        else:
+            bad = ~np.isin(arr, np.array(
+                valid, dtype=object if arr.dtype == object else None))
+        _fail('enum', f'value must be one of {enum}', bad)
+
+    if prop_type in ('integer', 'number'):
+        maximum = _field_value(prop, 'maximum')
+        if maximum is not None:
+            if _field_value(prop, 'exclusiveMaximum'):
+                _fail('exclusiveMaximum', f'value must be < {maximum}',
+                      arr >= maximum)
+            else:
+                _fail('maximum', f'value must be <= {maximum}',
+                      arr > maximum)
+
+        minimum = _field_value(prop, 'minimum')
+        if minimum is not None:
+            if _field_value(prop, 'exclusiveMinimum'):
+                _fail('exclusiveMinimum', f'value must be > {minimum}',
+                      arr <= minimum)
+            else:
+                _fail('minimum', f'value must be >= {minimum}',
+                      arr < minimum)
+
+        multiple_of = _field_value(prop, 'multipleOf')
+        if multiple_of:
+            _fail('multipleOf', f'value must be a multiple of {multiple_of}',
+                  _not_multiple(arr, values, multiple_of))
+
+        int_format = _field_value(prop, 'format')
+        int_range = _INT_RANGES.get(int_format)
+        int_msg = f'value must be a valid {int_format}'
+        if prop_type == 'integer' and int_range is not None:
+            lo, hi = int_range
+            _fail('format', int_msg,
+                  (arr < lo) | (arr > hi))
+
+    elif prop_type == 'string':
+        max_length = _field_value(prop, 'maxLength')
+        min_length = _field_value(prop, 'minLength')
+        if max_length is not None or min_length is not None:
+            lengths = np.fromiter(
+                map(len, values), dtype=np.intp, count=len(values))
+            if max_length is not None:
+                _fail('maxLength', f'length must be <= {max_length}',
+                      lengths > max_length)
+            if min_length is not None:
+                _fail('minLength', f'length must be >= {min_length}',
+                      lengths < min_length)
+
+        pattern = _field_value(prop, 'pattern')
+        if pattern is not None:
+            search = compile_pattern(pattern).search
+            _fail('pattern', f'value must match pattern {pattern!r}',
+                  np.fromiter((search(v) is None for v in values), bool,
+                              len(values)))
+    return
+
+
+def validate_batch(schema, records):
+    """
+    Validate a list of records against an (array ``items``) schema, column
+    by column.
+
+    Args:
+        schema (SchemaObject): the schema each record must conform to (or a
+            resolved reference to one)
+        records (list): the decoded records
+
+    Returns:
+        BatchReport: the offending rows, per violated constraint
+    """
+    schema = _deref(schema)
+    count = len(records)
+    report = BatchReport(count)
+    all_rows = np.arange(count, dtype=np.intp)
+
+    if not _is_columnar(schema):
+        _validate_values(report, compile_validator(schema), records,
+                         all_rows)
+        return report
+
+    # Records which aren't objects (property checks don't apply to them):
+    is_obj = np.fromiter(
+        (isinstance(r, dict) for r in records), bool, count)
+    if not is_obj.all():
+        if _field_value(schema, 'type') == 'object':
+            bad = ~is_obj
+            if _field_value(schema, 'nullable'):
+                bad &= np.fromiter(
+                    (r is not None for r in records), bool, count)
+            report._fail('$[*]', 'type', 'value must be of type object',
+                         schema.doc_path, all_rows[bad])
+        records = [r if isinstance(r, dict) else {} for r in records]
+
+    required = frozenset(_field_value(schema, 'required') or ())
+    properties = schema['properties']
+    for name, prop in properties.items():
+        prop = _deref(prop)
+        path = _child_path('$[*]', name)
+        column = [r.get(name, _MISSING) for r in records]
+
+        present = np.fromiter(
+            (v is not _MISSING for v in column), bool, count)
+        if name in required:
+            report._fail(path, 'required', 'is required', schema.doc_path,
+                         all_rows[~present & is_obj])
+
+        is_null = np.fromiter((v is None for v in column), bool, count)
+        if is_null.any() and not _field_value(prop, 'nullable') and \
+                _field_value(prop, 'type') is not None:
+            report._fail(path, 'nullable', 'value may not be null',
+                         prop.doc_path, all_rows[is_null])
+
+        rows = all_rows[present & ~is_null]
+        values = [column[i] for i in rows]
+        if not values:
+            continue
+
+        if _is_vectorizable(prop):
+            _check_scalars(report, prop, path, values, rows)
+        else:
+            _validate_values(report, compile_validator(prop), values, rows,
+                             name)
+
+    # additionalProperties: false
+    additional = schema['additionalProperties']
+    if additional is not None and additional.value() is False:
+        names = frozenset(properties)
+        extra = np.fromiter(
+            (not r.keys() <= names for r in records), bool, count)
+        report._fail('$[*]', 'additionalProperties',
+                     'additional properties are not allowed',
+                     schema.doc_path, all_rows[extra])
+    return report
@@ -7,6 +7,7 @@ This module defines all of the concrete OpenApi 3.0 document objects.
 
 import re
 import string
+from types import MappingProxyType
 
 from .model.exceptions import (
     MalformedDocumentException,
@@ -14,6 +15,9 @@ from .model.exceptions import (
 )
 
 from .util import load_yaml
+from .query import compile_query
+from .payload import compile_validator
+from .router import Router
 
 from .model.baseobj import OpenApiBaseObject
 from .model.reference import ReferenceObject
@@ -41,6 +45,8 @@ from .validation import (
     in_range,
     is_url,
     is_email,
+    is_format,
+    check,
 )
 
 # --------------------------------------------------------------------------
@@ -63,10 +69,10 @@ class InfoObject(OpenApiBaseObject):
             _field("version", OpenApiString),
         )
 
-    @required('title')
-    @required('version')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('title'),
+        required('version'),
+    )
 
 
 class ContactObject(OpenApiBaseObject):
@@ -81,10 +87,10 @@ class ContactObject(OpenApiBaseObject):
             _field("email", OpenApiString),
         )
 
-    @is_url('url')
-    @is_email('email')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        is_url('url'),
+        is_email('email'),
+    )
 
 
 class LicenseObject(OpenApiBaseObject):
@@ -98,10 +104,10 @@ class LicenseObject(OpenApiBaseObject):
             _field("url", OpenApiString),
         )
 
-    @required('name')
-    @is_url('url')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('name'),
+        is_url('url'),
+    )
 
 
 class ServerObject(OpenApiBaseObject):
@@ -117,10 +123,10 @@ class ServerObject(OpenApiBaseObject):
                 "variables", OpenApiMap.of(ServerVariableObject)),
         )
 
-    @required('url')
-    @is_url('url')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('url'),
+        is_url('url'),
+    )
 
 
 class ServerVariableObject(OpenApiBaseObject):
@@ -136,9 +142,9 @@ class ServerVariableObject(OpenApiBaseObject):
             _field("description", OpenApiString),
         )
 
-    @required('default')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('default'),
+    )
 
 
 class ComponentsObject(OpenApiBaseObject):
@@ -170,7 +176,7 @@ class ComponentsObject(OpenApiBaseObject):
         for field_name in self._field_names():
             field_val = self[field_name]
             if field_val is None:
-                return
+                continue
 
             for key in field_val:
                 self._validate_key(field_name, key)
@@ -180,7 +186,8 @@ class ComponentsObject(OpenApiBaseObject):
         if not self.KEY_CONSTRAINT.match(key):
             raise InvalidFieldValueException(
                 self, field_val,
-                f'keys must match: "{self.KEY_REGEX}"; got: "{key}"')
+                f'keys must match: "{self.KEY_REGEX}"; got: "{key}"',
+                rule='component_key')
 
 
 class PathsObject(OpenApiMap):
@@ -191,24 +198,34 @@ class PathsObject(OpenApiMap):
     def __init__(self, data, doc_path):
         super().__init__(data, doc_path, PathItemObject)
 
-    def _validate(self):
-        # 1. All operationIds defined by the API must be unique.
-        # 2. No two paths can have the same general form, even if the parameter
-        #    names are different, e.g.: "/pets/{id}" and "/pets/{petId}" are
-        #    considered identical and invalid.
+    _validation_rules = (
+        check('path_conflict', '_check_path_conflicts'),
+        check('unique_operation_id', '_check_unique_operation_ids'),
+    )
+
+    def _check_path_conflicts(self):
+        # No two paths can have the same general form, even if the parameter
+        # names are different, e.g.: "/pets/{id}" and "/pets/{petId}" are
+        # considered identical and invalid.
         paths = {}
-        op_ids = {}
         for uri_path in self:
             path_key = self._get_validation_path_key(uri_path)
 
             if path_key in paths:
                 other_path = self[paths[path_key]]
                 raise MalformedDocumentException(
-                    self, uri_path, f'conflicts with "{other_path.doc_path}"')
+                    self, uri_path, f'conflicts with "{other_path.doc_path}"',
+                    rule='path_conflict')
             else:
                 paths[path_key] = uri_path
+        return
 
+    def _check_unique_operation_ids(self):
+        # All operationIds defined by the API must be unique.
+        op_ids = {}
+        for uri_path in self:
             self._validate_unique_ops(op_ids, uri_path)
+        return
 
     def _get_validation_path_key(self, uri_path):
         param_num = 1
@@ -235,7 +252,8 @@ class PathsObject(OpenApiMap):
             if other_op is not None:
                 raise MalformedDocumentException(
                     self[uri_path],
-                    op_id, f'conflicts with {other_op.doc_path}')
+                    op_id, f'conflicts with {other_op.doc_path}',
+                    rule='unique_operation_id')
             else:
                 op_ids[op_id] = op_obj
         return
@@ -287,10 +305,19 @@ class OperationObject(OpenApiBaseObject):
             _field("servers", OpenApiList.of(ServerObject)),
         )
 
-    @required('responses')
-    def _validate(self):
+    _validation_rules = (
+        required('responses'),
+        check('unique_parameters', '_check_unique_parameters'),
+    )
+
+    def _check_unique_parameters(self):
         unique_params = {}
         for param in self['parameters']:
+            # Compare referenced parameters by their targets:
+            param = param.target()
+            if not isinstance(param, ParameterObject):
+                continue
+
             param_name = str(param['name'])
             param_in = str(param['in'])
             param_key = f'{param_name} in {param_in}'
@@ -299,7 +326,8 @@ class OperationObject(OpenApiBaseObject):
             if other_param is not None:
                 raise MalformedDocumentException(
                     param, param_key,
-                    f'is a duplicate of {other_param.doc_path}')
+                    f'is a duplicate of {other_param.doc_path}',
+                    rule='unique_parameters')
             else:
                 unique_params[param_key] = param
         return
@@ -316,10 +344,10 @@ class ExternalDocumentationObject(OpenApiBaseObject):
             _field("url", OpenApiString),
         )
 
-    @required('url')
-    @is_url('url')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('url'),
+        is_url('url'),
+    )
 
 
 class ParameterObject(OpenApiBaseObject):
@@ -345,7 +373,7 @@ class ParameterObject(OpenApiBaseObject):
 
             # Parameter serialization:
             _field("style", OpenApiString),
-            _field("explode", OpenApiBoolean, True),
+            _field("explode", OpenApiBoolean),
             _field(
                 "allowReserved", OpenApiBoolean, False),
             _union(
@@ -378,16 +406,20 @@ class ParameterObject(OpenApiBaseObject):
 
         # Default value for explode is true if style is form; false, otherwise:
         if self['explode'] is None:
+            style = self['style'] or field_defaults.get('style')
             field_defaults['explode'] = OpenApiBoolean(
-                {'form': True}.get(self['style'], False))
-
-    @required('name')
-    @required('in')
-    @in_range('in', ['path', 'query', 'header', 'cookie'])
-    @in_range(
-        'style',
-        ['matrix', 'label', 'form', 'simple', 'spaceDelimited', 'pipeDelimited',
-         'deepObject'])
+                {'form': True}.get(str(style), False))
+
+    _validation_rules = (
+        required('name'),
+        required('in'),
+        in_range('in', ['path', 'query', 'header', 'cookie']),
+        in_range(
+            'style',
+            ['matrix', 'label', 'form', 'simple', 'spaceDelimited',
+             'pipeDelimited', 'deepObject']),
+    )
+
     def _validate(self):
         param_in = self['in']
         if param_in == 'path':
@@ -396,7 +428,7 @@ class ParameterObject(OpenApiBaseObject):
         # If "content" is defined, there can only be a single entry in the map:
         if self['content'] is not None and len(self['content']) != 1:
             raise InvalidFieldValueException(
-                self, 'content', "Length must be 1")
+                self, 'content', "Length must be 1", rule='content_length')
 
 
 class RequestBodyObject(OpenApiBaseObject):
@@ -465,9 +497,9 @@ class ResponseObject(OpenApiBaseObject):
             _field("links", OpenApiMap.of(LinkObject)),
         )
 
-    @required('description')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('description'),
+    )
 
 
 class CallbackObject(OpenApiMap):
@@ -602,6 +634,44 @@ class SchemaObject(OpenApiBaseObject):
             _field("deprecated", OpenApiBoolean, False),
         )
 
+    _validation_rules = (
+        is_format('pattern', 'regex',
+                  'string value must be a valid regular expression'),
+    )
+
+    # Memoized payload validator; see :meth:`compile_validator`:
+    _payload_validator = None
+
+    def compile_validator(self):
+        """
+        Compile this schema into a validator for JSON payloads (i.e. decoded
+        python data), ``validate(value)``, which raises
+        :class:`~poast.openapi3.spec.model.exceptions.PayloadValidationException`
+        if ``value`` does not conform to the schema. Resolved references
+        are followed, and recursive schemas are supported.
+
+        The compiled validator is cached on this node.
+
+        .. seealso:: :mod:`poast.openapi3.spec.payload`
+        """
+        if self._payload_validator is None:
+            compile_validator(self)
+        return self._payload_validator
+
+    def validate_batch(self, records):
+        """
+        Validate a (large) list of records against this schema, column by
+        column, using NumPy (which must be installed).
+
+        Returns:
+            :class:`~poast.openapi3.spec.batch.BatchReport`: the offending
+            row indices, per violated constraint.
+
+        .. seealso:: :mod:`poast.openapi3.spec.batch`
+        """
+        from .batch import validate_batch
+        return validate_batch(self, records)
+
     def _validate(self):
         # Only readOnly or writeOnly can be true:
         if self['readOnly']:
@@ -615,7 +685,8 @@ class SchemaObject(OpenApiBaseObject):
                     and ('allOf' not in self)):
                 raise MalformedDocumentException(
                     self, 'discriminator',
-                    'only valid when using "oneOf", "anyOf", or "allOf"')
+                    'only valid when using "oneOf", "anyOf", or "allOf"',
+                    rule='discriminator')
 
 
 class DiscriminatorObject(OpenApiBaseObject):
@@ -629,9 +700,118 @@ class DiscriminatorObject(OpenApiBaseObject):
             _field("mapping", OpenApiMap.of(OpenApiString)),
         )
 
-    @required('propertyName')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('propertyName'),
+    )
+
+    # Set by the owning OpenApiObject; see :meth:`dispatch_table`:
+    _schema = None
+    _doc = None
+    _table = None
+
+    _SCHEMA_PREFIX = '#/components/schemas/'
+
+    def _bind(self, schema, doc):
+        """
+        Bind this discriminator to the schema it belongs to, and to the
+        document (used to look up ``mapping`` targets and subschemas).
+        """
+        self._schema = schema
+        self._doc = doc
+        self._table = None
+        return
+
+    def _lookup(self, ref):
+        """
+        Look up a mapping value (a reference or a schema name).
+        """
+        if self._doc is None:
+            return None
+        if not ref.startswith('#'):
+            ref = self._SCHEMA_PREFIX + ref
+        return self._doc._obj_by_path.get(ref)
+
+    def _target(self, schema):
+        if schema._is_ref:
+            target = schema.target()
+            if not hasattr(target, '_children'):
+                target = self._lookup(schema.ref)
+            return target
+        return schema
+
+    def _candidates(self):
+        """
+        Yield the schemas the discriminator selects between: the ``oneOf``
+        / ``anyOf`` members of its schema, and component schemas which
+        extend it (via ``allOf``).
+        """
+        owner = self._schema
+        if owner is None:
+            return
+        for field_name in ('oneOf', 'anyOf'):
+            for member in owner[field_name] or ():
+                target = self._target(member)
+                if target is not None:
+                    yield target
+
+        if self._doc is not None:
+            for schema in self._doc.schemas.values():
+                if not hasattr(schema, '_children') or schema is owner:
+                    continue
+                for member in schema['allOf'] or ():
+                    if self._target(member) is owner:
+                        yield schema
+                        break
+        return
+
+    def dispatch_table(self):
+        """
+        Return the (memoized) mapping of discriminator property values to
+        schemas. Schemas are implicitly mapped by their component name;
+        explicit ``mapping`` entries take precedence.
+
+        Returns:
+            dict: value to :class:`SchemaObject`
+        """
+        if self._table is not None:
+            return self._table
+
+        table = {}
+        prefix = self._SCHEMA_PREFIX
+        for candidate in self._candidates():
+            doc_path = candidate.doc_path or ''
+            name = doc_path[len(prefix):]
+            if doc_path.startswith(prefix) and '/' not in name:
+                table.setdefault(name, candidate)
+
+        for value, ref in (self['mapping'] or {}).items():
+            target = self._lookup(str(ref))
+            if target is not None:
+                table[value] = target
+
+        self._table = table
+        return table
+
+    @property
+    def property_name(self):
+        return str(self['propertyName'])
+
+    def resolve(self, payload):
+        """
+        Return the schema selected by the discriminator property of a
+        (decoded JSON) payload, or ``None``.
+
+        Example::
+
+            >>> pet_schema.discriminator.resolve({'petType': 'Cat', ...})
+            SchemaObject(...)
+        """
+        if not isinstance(payload, dict):
+            return None
+        value = payload.get(self.property_name)
+        if value is None:
+            return None
+        return self.dispatch_table().get(value)
 
 
 class XMLObject(OpenApiBaseObject):
@@ -667,9 +847,14 @@ class SecuritySchemeObject(OpenApiBaseObject):
             _field("openIdConnectUrl", OpenApiString),
         )
 
-    @required('type')
-    @is_url('openIdConnectUrl')
-    @in_range('type', ["apiKey", "http", "oauth2", "bearer", "openIdConnect"])
+    _validation_rules = (
+        required('type'),
+        is_url('openIdConnectUrl'),
+        in_range(
+            'type',
+            ["apiKey", "http", "oauth2", "bearer", "openIdConnect"]),
+    )
+
     def _validate(self):
         auth_type = self['type']
 
@@ -719,9 +904,9 @@ class OAuthFlowObject(OpenApiBaseObject):
             _field("scopes", OpenApiMap.of(OpenApiString)),
         )
 
-    @required('scopes')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('scopes'),
+    )
 
 
 class SecurityRequirementObject(OpenApiMap):
@@ -756,6 +941,10 @@ class OpenApiObject(OpenApiBaseObject):
         data = load_yaml(doc_src)
         self.__resolve_refs = resolve_refs
         self.__obj_by_path = {}
+        self.__obj_by_type = {}
+        self.__operations = {}
+        self.__schemas = MappingProxyType({})
+        self.__router = None
         super().__init__(data, doc_path)
         return
 
@@ -766,41 +955,154 @@ class OpenApiObject(OpenApiBaseObject):
         """
         return self.__obj_by_path
 
+    @property
+    def _obj_by_type(self):
+        """
+        List nested document elements by ``openapi_type``.
+        """
+        return self.__obj_by_type
+
+    @property
+    def operations(self):
+        """
+        All of the operations defined in this document, by operationId.
+
+        .. note:: If operationIds are not unique (which is invalid), the
+            first operation in document order is used.
+
+        Returns:
+            Mapping: (read-only) mapping of operationId to
+            :class:`OperationObject`
+        """
+        return MappingProxyType(self.__operations)
+
+    @property
+    def schemas(self):
+        """
+        All of the schemas defined in ``components/schemas``, by name.
+
+        Returns:
+            Mapping: (read-only) mapping of component name to
+            :class:`SchemaObject`
+        """
+        return self.__schemas
+
+    def find(self, obj_type):
+        """
+        Return all of the document elements of a given type, in document
+        order. References are not followed, so each element occurs once.
+
+        Example::
+
+            >>> for schema in doc.find(SchemaObject):
+            ...     print(schema.doc_path)
+
+        Args:
+            obj_type (type|str): an OpenApiEntity subclass, or the name of one
+                (i.e. its ``openapi_type``).
+
+        Returns:
+            tuple: document elements whose ``openapi_type`` is ``obj_type``
+        """
+        if not isinstance(obj_type, str):
+            obj_type = obj_type.__name__
+        return self.__obj_by_type.get(obj_type, ())
+
+    def query(self, expr):
+        """
+        Run a JSONPath-style query against this document.
+
+        Queries are compiled once and cached; results are produced lazily.
+
+        Example::
+
+            >>> headers = doc.query(
+            ...     "$.paths[*][get,post].parameters[?(@.in=='header')]")
+
+        .. seealso:: :mod:`poast.openapi3.spec.query` for the query syntax.
+
+        Args:
+            expr (str): the query expression
+
+        Returns:
+            generator: yields matching document elements.
+        """
+        return compile_query(expr)(self)
+
+    def router(self):
+        """
+        Return the (compiled, and cached) router for this document, which
+        matches requests to operations.
+
+        Example::
+
+            >>> match = doc.router().match('GET', '/v1/pets/7')
+            >>> match.operation['operationId'], match.path_params
+            ('showPetById', {'petId': '7'})
+
+        .. seealso:: :mod:`poast.openapi3.spec.router`
+
+        Returns:
+            Router: the router
+        """
+        if self.__router is None:
+            self.__router = Router(self['paths'], self['servers'])
+        return self.__router
+
     def _post_init(self):
         """
-        Populate objects by path and optionally resolve references.
+        Populate the object indexes and optionally resolve references.
         """
-        self.accept(self.__add_obj_by_path)
+        for child in self.iter_nodes(follow_refs=False):
+            if child is not self:
+                self.__index_obj(child)
+        for obj_type, objs in self.__obj_by_type.items():
+            self.__obj_by_type[obj_type] = tuple(objs)
 
         if self.__resolve_refs:
-            self.accept(self.__resolve_ref)
+            for child in self.find(ReferenceObject):
+                self.__resolve_ref(child)
+
+        components = self['components']
+        if components is not None and components['schemas'] is not None:
+            self.__schemas = MappingProxyType({
+                k: v.target() for k, v in components['schemas'].items()})
+
+        for discriminator in self.find(DiscriminatorObject):
+            schema = self.__obj_by_path.get(
+                discriminator.doc_path.rsplit('/', 1)[0])
+            discriminator._bind(schema, self)
+
         return
 
-    @required('paths')
-    def _validate(self):
-        pass
+    _validation_rules = (
+        required('paths'),
+    )
 
-    def __add_obj_by_path(self, child):
+    def __index_obj(self, child):
         """
-        Visitor method to add child objects to the path index.
+        Add a child object to the path and type indexes.
         """
-        if child is self or child is None:
-            return
-
         self.__obj_by_path[child.doc_path] = child
+
+        obj_type = child.openapi_type
+        by_type = self.__obj_by_type.get(obj_type)
+        if by_type is None:
+            by_type = self.__obj_by_type[obj_type] = []
+        by_type.append(child)
+
+        if obj_type == 'OperationObject':
+            op_id = child['operationId']
+            if op_id is not None:
+                self.__operations.setdefault(str(op_id), child)
         return
 
     def __resolve_ref(self, child):
         """
-        Visitor method used to resolve reference, when indicated.
+        Resolve a reference, using the path index.
         """
-        if child is self or child is None:
-            return
-
-        # TODO: tidy
-        if isinstance(child, ReferenceObject):
-            target = self.__obj_by_path.get(child.ref)
-            child._resolve_ref(target)
+        target = self.__obj_by_path.get(child.ref)
+        child._resolve_ref(target)
         return
 
 
@@ -8,6 +8,9 @@ For more info, see:
 from abc import abstractmethod
 from .entity import OpenApiEntity
 
+# Field specs and names, by class (see _fields/_field_names):
+_cls_fields = {}
+
 
 class OpenApiBaseObject(OpenApiEntity, dict):
     """
@@ -35,10 +38,21 @@ class OpenApiBaseObject(OpenApiEntity, dict):
         """
         pass
 
+    @classmethod
+    def _fields(cls):
+        """
+        Return the (cached) field specs and field names for this class.
+        """
+        fields = _cls_fields.get(cls)
+        if fields is None:
+            obj_spec = tuple(cls._obj_spec())
+            names = tuple(
+                field_name for spec in obj_spec for field_name in spec)
+            fields = _cls_fields[cls] = (obj_spec, names)
+        return fields
+
     def _field_names(self):
-        for spec in self._obj_spec():
-            for field_name in spec:
-                yield field_name
+        return self._fields()[1]
 
     def _init_data(self, data):
         if data is None:
@@ -55,11 +69,13 @@ class OpenApiBaseObject(OpenApiEntity, dict):
         """
         Initialize each of the fields for this object from the input data.
         """
+        obj_spec, field_names = self._fields()
+
         # Initialize all the fields to None first, for consistency:
-        for field_name in self._field_names():
+        for field_name in field_names:
             self[field_name] = None
 
-        for field in self._obj_spec():
+        for field in obj_spec:
             field_name, field_val = field.parse(self, data)
             if not field_name:
                 continue
@@ -82,34 +98,10 @@ class OpenApiBaseObject(OpenApiEntity, dict):
     def _post_init(self):
         pass
 
-    def _validate(self):
-        pass
-
-    def accept(self, visitor):
-        """
-        Depth first traversal, via visitor.
-
-        Args:
-            visitor (func): a function that takes a single OpenApiEntity as an argument.
-        """
-
-        if not callable(visitor):
-            raise ValueError("OpenApiObject visitor must be callable")
-
-        for field_name in self._field_names():
-            field_val = self.get(field_name, None)
-            if field_val is not None:
-                field_val.accept(visitor)
-        visitor(self)
-        return
-
-    def validate(self):
-        self._validate()
-        for field_name in self._field_names():
-            field_val = self.get(field_name, None)
-            if field_val:
-                field_val.validate()
-        return self
+    def _children(self):
+        # NOTE: every field is set (to None, if absent) in _init_fields, so
+        #       dict order is field order:
+        return [v for v in self.values() if v is not None]
 
     def value(self, show_unset=False):
         """
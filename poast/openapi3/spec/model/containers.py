@@ -26,9 +26,6 @@ class OpenApiContainer(OpenApiEntity):
     def _init_items(self, data):
         pass
 
-    def _validate(self):
-        pass
-
     @classmethod
     def of(cls, item_type):
         return lambda data, doc_path: cls(data, doc_path, item_type)
@@ -45,18 +42,8 @@ class OpenApiList(OpenApiContainer, list):
             self.append(item_val)
         return
 
-    def accept(self, visitor):
-        for e in self:
-            e.accept(visitor)
-        visitor(self)
-        return
-
-    def validate(self):
-        for i in self:
-            if i is not None:
-                i.validate()
-        self._validate()
-        return
+    def _children(self):
+        return self
 
     def value(self, show_unset=False):
         return [x.value() for x in self]
@@ -78,17 +65,8 @@ class OpenApiMap(OpenApiContainer, dict):
             item_val = openapi_obj_or_ref(v, item_path, self._item_type)
             self[k] = item_val
 
-    def accept(self, visitor):
-        for e in self.values():
-            e.accept(visitor)
-        visitor(self)
-        return
-
-    def validate(self):
-        for v in self.values():
-            if v is not None:
-                v.validate()
-        self._validate()
+    def _children(self):
+        return list(self.values())
 
     def value(self, show_unset=False):
         return {k: v.value() for (k, v) in self.items()}
@@ -0,0 +1,85 @@
+"""
+Content hashes for OpenApi 3.0 document trees.
+
+A node's content hash covers its type and all of its descendants, so two
+subtrees with equal hashes are interchangeable for validation purposes. The
+hash of a resolved reference also covers its target, since validation of
+the referencing object may depend on it (e.g. duplicate parameter checks).
+
+Hashes are computed bottom-up, without recursion, and memoized on each node:
+documents are treated as immutable once loaded.
+"""
+
+from hashlib import blake2b
+
+_DIGEST_SIZE = 16
+
+
+def _update_entity(h, node):
+    """
+    Feed the hashes of the children of ``node`` into ``h``.
+    """
+    if node._is_leaf:
+        h.update(repr(node.value()).encode())
+    elif node._is_ref:
+        h.update(str(node.ref).encode())
+        target = node.target()
+        if getattr(target, '_digest', None) is not None:
+            h.update(target._digest)
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            h.update(str(k).encode())
+            h.update(b'\0' if v is None else v._digest)
+        extensions = getattr(node, 'extensions', None)
+        if extensions:
+            h.update(repr(sorted(extensions.items())).encode())
+    else:
+        for v in node:
+            h.update(v._digest)
+    return
+
+
+def content_hash(root):
+    """
+    Return the content hash of ``root`` (computing and memoizing the hashes
+    of any descendants, as needed).
+
+    Args:
+        root (OpenApiEntity): the entity to hash
+
+    Returns:
+        bytes: the content hash
+    """
+    if root._digest is not None:
+        return root._digest
+
+    in_progress = set()
+    stack = [(root, False)]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        node, expanded = pop()
+        if expanded:
+            h = blake2b(node.openapi_type.encode(), digest_size=_DIGEST_SIZE)
+            _update_entity(h, node)
+            node._digest = h.digest()
+            in_progress.discard(id(node))
+            continue
+
+        if node._digest is not None:
+            continue
+
+        in_progress.add(id(node))
+        push((node, True))
+        if node._is_ref:
+            target = node.target()
+            # NOTE: a reference cycle is broken by hashing the ref string only:
+            if hasattr(target, '_children') and id(target) not in in_progress:
+                push((target, False))
+            continue
+
+        for child in node._children():
+            if child._digest is None:
+                push((child, False))
+    return root._digest
@@ -6,6 +6,13 @@ Base type for all OpenApi 3.0 data entities.
 
 from abc import ABC, abstractmethod
 from .exceptions import DocumentParsingException
+from .digest import content_hash
+from .plan import compile_plan
+from .profile import profile_tree
+from .traversal import iter_nodes, iter_nodes_post
+from .violation import validate_tree, collect_violations
+
+_validation_plans = {}
 
 
 class OpenApiEntity(ABC):
@@ -13,6 +20,16 @@ class OpenApiEntity(ABC):
     Base class for OpenAPI specification entities (objects *or* fields).
     """
 
+    # Traversal hints; see :mod:`poast.openapi3.spec.model.traversal`:
+    _is_leaf = False
+    _is_ref = False
+
+    # Memoized content hash; see :mod:`poast.openapi3.spec.model.digest`:
+    _digest = None
+
+    # Declarative validation rules; see :mod:`poast.openapi3.spec.validation`:
+    _validation_rules = ()
+
     def __init__(self, data, doc_path=None):
         """
         Invoke child class initialization.
@@ -28,12 +45,77 @@ class OpenApiEntity(ABC):
                     self.doc_path, e))
         return
 
-    def validate(self):
+    def validate(self, collect=False, max_errors=None, cache=None,
+                 follow_refs=False, attribute_refs=False, profile=False):
+        """
+        Validate the data in this object (and its descendants) against the
+        spec, in a single pass.
+
+        By default, validation stops at the first error. If ``collect`` is
+        ``True``, every violation is collected and returned, instead.
+
+        Args:
+            collect (bool): if ``True``, collect and return all violations.
+            max_errors (int): optional limit on the number of violations
+                collected (only used when ``collect`` is ``True``).
+            cache (ValidationCache): optional cache of per-subtree results,
+                keyed by content hash; unchanged subtrees are not revisited.
+                (Requires ``collect=True``).
+            follow_refs (bool): if ``True``, objects reachable through
+                resolved references are validated too. Each distinct object
+                is validated exactly once, however many references reach it.
+            attribute_refs (bool): if ``True``, each collected violation
+                lists the paths of the references through which the
+                offending object is reachable (``referenced_from``).
+            profile (bool): if ``True``, time each rule and return a
+                :class:`~poast.openapi3.spec.model.profile.ValidationProfile`
+                (which also holds all violations found).
+
+        Returns:
+            self, or (if ``collect`` is ``True``) a list of
+            :class:`~poast.openapi3.spec.model.violation.Violation` objects,
+            or (if ``profile`` is ``True``) the validation profile.
+
+        Raises:
+            MalformedDocumentException: on the first error, unless
+                ``collect`` is ``True``.
+        """
+        if profile:
+            return profile_tree(self, follow_refs)
+        elif collect:
+            return collect_violations(
+                self, max_errors, cache, follow_refs, attribute_refs)
+        elif cache is not None:
+            raise ValueError('validation cache requires collect=True')
+
+        validate_tree(self, follow_refs)
+        return self
+
+    def _validate(self):
         """
-        Validate the data in this object against the spec.
+        Subclasses may override to validate this entity's own fields, beyond
+        what is expressed by ``_validation_rules``. (Child entities are
+        validated separately).
         """
         pass
 
+    @classmethod
+    def validation_plan(cls):
+        """
+        Return the compiled validation plan for this class, which lists the
+        rules checked for objects of this type.
+
+        .. seealso:: :mod:`poast.openapi3.spec.model.plan`
+
+        Returns:
+            ValidationPlan: the (cached) validation plan for this class
+        """
+        plan = _validation_plans.get(cls)
+        if plan is None:
+            plan = _validation_plans[cls] = compile_plan(
+                cls, OpenApiEntity._validate)
+        return plan
+
     @property
     def openapi_type(self):
         """
@@ -61,12 +143,60 @@ class OpenApiEntity(ABC):
 
     def accept(self, visitor):
         """
-        Traverse the object using a visitor.
+        Depth first (post-order) traversal, via visitor.
 
         Args:
             visitor (func): a function that takes a single OpenApiEntity as an argument.
         """
-        return visitor(self)
+        if not callable(visitor):
+            raise ValueError("OpenApiObject visitor must be callable")
+
+        for node in iter_nodes_post(self):
+            visitor(node)
+        return
+
+    def content_hash(self):
+        """
+        Return a hash of the content of this entity and its descendants.
+
+        .. seealso:: :mod:`poast.openapi3.spec.model.digest`
+
+        Returns:
+            bytes: the content hash
+        """
+        return content_hash(self)
+
+    def iter_nodes(self, types=None, prune=None, follow_refs=True):
+        """
+        Iterate over this entity and its descendants (pre-order, depth first).
+
+        Traversal is lazy and non-recursive: stop consuming the generator to
+        exit early, or use ``prune`` to skip entire subtrees.
+
+        Example::
+
+            >>> for op in doc.iter_nodes(types=(OperationObject,)):
+            ...     print(op.doc_path)
+
+        Args:
+            types (tuple): optional tuple of classes; only instances are
+                yielded.
+            prune (func): optional predicate; if it returns ``True`` for a
+                node, the descendants of that node are not traversed.
+            follow_refs (bool): if ``True``, resolved references are traversed
+                as their targets.
+
+        Returns:
+            generator: yields OpenApiEntity objects.
+        """
+        return iter_nodes(self, types, prune, follow_refs)
+
+    def _children(self):
+        """
+        Return the (non-``None``) child entities of this entity, in document
+        order. Subclasses with children MUST override.
+        """
+        return ()
 
     def target(self):
         """
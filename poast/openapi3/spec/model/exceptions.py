@@ -14,17 +14,28 @@ class DocumentParsingException(Exception):
 class MalformedDocumentException(DocumentParsingException):
     """
     Exception type thrown on malformed OpenAPI 3.0 data.
+
+    Attributes:
+        doc_obj (OpenApiEntity): the offending document object
+        field_name (str): the name of the offending field
+        msg (str): description of the problem
+        rule (str): the name of the validation rule which was violated
     """
 
-    def __init__(self, doc_obj, field_name, msg):
+    rule = 'malformed'
+
+    def __init__(self, doc_obj, field_name, msg, rule=None):
         self.doc_obj = doc_obj
         self.field_name = field_name
+        self.msg = msg
+        if rule is not None:
+            self.rule = rule
         super().__init__('Error at {}: Field "{}" in {}: {}'.format(
             doc_obj.doc_path, field_name, doc_obj.openapi_type, msg))
 
 
 class InvalidFieldValueException(MalformedDocumentException):
-    pass
+    rule = 'invalid_value'
 
 
 class MissingRequiredFieldException(MalformedDocumentException):
@@ -33,5 +44,27 @@ class MissingRequiredFieldException(MalformedDocumentException):
     document object
     """
 
+    rule = 'required'
+
     def __init__(self, doc_obj, field_name):
         super().__init__(doc_obj, field_name, 'is required')
+
+
+class PayloadValidationException(ValueError):
+    """
+    Exception type thrown when a payload (e.g. a JSON request body) does not
+    conform to its SchemaObject.
+
+    Attributes:
+        path (str): the location of the offending value in the payload
+        schema_path (str): the document path of the violated schema
+        rule (str): the name of the violated schema keyword
+        msg (str): description of the problem
+    """
+
+    def __init__(self, path, schema_path, rule, msg):
+        self.path = path
+        self.schema_path = schema_path
+        self.rule = rule
+        self.msg = msg
+        super().__init__(f'{path}: {msg} (schema: {schema_path}, {rule})')
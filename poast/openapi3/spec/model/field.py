@@ -89,6 +89,7 @@ class OpenApiFieldUnion(OpenApiDataSpec):
                 union_name = field_name
             else:
                 msg = r'fields "{union_name}" and "{field_name}" are mutually exclusive.'
-                raise MalformedDocumentException(parent, union_name, msg)
+                raise MalformedDocumentException(
+                    parent, union_name, msg, rule='mutually_exclusive')
 
         return union_name, union_val
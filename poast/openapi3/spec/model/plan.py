@@ -0,0 +1,114 @@
+"""
+Compiled validation plans for OpenApi 3.0 document object classes.
+
+The validation rules declared by a class (``_validation_rules``, plus any
+rules applied as decorators to ``_validate``) are compiled, once per class,
+into a single flat python function. Each field is read once, no matter how
+many rules apply to it (object-level rules, with no field, read none), and
+the class's own ``_validate`` method (if any) is called last.
+"""
+
+
+class ValidationPlan:
+    """
+    The compiled validation plan for a document object class.
+
+    Attributes:
+        obj_cls (type): the class the plan validates
+        rules (tuple): the declarative rules checked, in order
+        body (func): the class's ``_validate`` method, or ``None``
+        source (str): the python source of the compiled check function
+        check (func): ``check(obj, report)`` calls ``report(e)`` with a
+            :class:`MalformedDocumentException` for each violated rule, then
+            calls ``body(obj)`` (which may raise).
+    """
+
+    __slots__ = (
+        'obj_cls',
+        'rules',
+        'body',
+        'source',
+        'check',
+    )
+
+    def __init__(self, obj_cls, rules, body, source, check):
+        self.obj_cls = obj_cls
+        self.rules = rules
+        self.body = body
+        self.source = source
+        self.check = check
+
+    def describe(self):
+        """
+        Return a list of human-readable descriptions of the plan's checks.
+        """
+        checks = [repr(r) for r in self.rules]
+        if self.body is not None:
+            checks.append(f'{self.body.__qualname__}()')
+        return checks
+
+    def __repr__(self):
+        return f'ValidationPlan({self.obj_cls.__name__}, {self.describe()!r})'
+
+
+def _unwrap(func):
+    """
+    Split a (possibly decorated) ``_validate`` method into the rules applied
+    as decorators, and the undecorated method.
+    """
+    rules = []
+    while hasattr(func, '_poast_rule'):
+        rules.append(func._poast_rule)
+        func = func._poast_wrapped
+    return rules, func
+
+
+def compile_plan(obj_cls, default_body=None):
+    """
+    Compile the validation plan for a document object class.
+
+    Args:
+        obj_cls (type): the document object class
+        default_body (func): the inherited no-op ``_validate`` method, which
+            is omitted from compiled plans
+
+    Returns:
+        ValidationPlan: the compiled plan
+    """
+    decorated, body = _unwrap(obj_cls._validate)
+    rules = tuple(getattr(obj_cls, '_validation_rules', ())) + tuple(decorated)
+    if body is default_body:
+        body = None
+
+    ns = {}
+    names = {}
+
+    def _const(value):
+        name = names.get(id(value))
+        if name is None:
+            name = names[id(value)] = f'_c{len(ns)}'
+            ns[name] = value
+        return name
+
+    # Group the rules by field, so that each field is read once:
+    by_field = {}
+    for rule in rules:
+        by_field.setdefault(rule.field_name, []).append(rule)
+
+    fn_name = f'check_{obj_cls.__name__}'
+    lines = [f'def {fn_name}(obj, report):']
+    for i, (field_name, field_rules) in enumerate(by_field.items()):
+        var = f'v{i}'
+        if field_name is not None:
+            lines.append(f'    {var} = obj[{field_name!r}]')
+        for rule in field_rules:
+            lines.extend(f'    {line}' for line in rule.compile(var, _const))
+    if body is not None:
+        lines.append(f'    {_const(body)}(obj)')
+    if len(lines) == 1:
+        lines.append('    pass')
+
+    source = '\n'.join(lines) + '\n'
+    exec(compile(source, f'<validation plan: {obj_cls.__qualname__}>',
+                 'exec'), ns)
+    return ValidationPlan(obj_cls, rules, body, source, ns[fn_name])
@@ -40,6 +40,8 @@ class OpenApiPrimitive(OpenApiEntity):
     +----------+-----------+-----------------------------------+
     """
 
+    _is_leaf = True
+
     def __init__(self, data, doc_path=None, data_format=None):
         self._value = data
         self._format = data_format
@@ -0,0 +1,199 @@
+"""
+Profiling of OpenApi 3.0 document validation.
+
+Profiled validation runs each rule of each object's validation plan
+separately (rather than the compiled plan), so that time and call counts can
+be attributed per rule, per ``openapi_type`` and per node. Time not spent in
+any rule is reported as traversal.
+"""
+
+import heapq
+from time import perf_counter
+
+from .exceptions import MalformedDocumentException
+from .traversal import iter_nodes
+from .violation import Violation
+
+
+class ProfileStat:
+    """
+    Accumulated time and call count for a single rule or type.
+
+    Attributes:
+        name (str): the rule name or ``openapi_type``
+        calls (int): number of checks run
+        seconds (float): total time spent in checks
+        failures (int): number of violations found
+    """
+
+    __slots__ = ('name', 'calls', 'seconds', 'failures')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.failures = 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'failures': self.failures,
+        }
+
+    def __repr__(self):
+        return (f'ProfileStat({self.name!r}, calls={self.calls}, '
+                f'seconds={self.seconds:.6f}, failures={self.failures})')
+
+
+class ValidationProfile:
+    """
+    The result of a profiled validation run.
+
+    Attributes:
+        rules (dict): rule name to :class:`ProfileStat`
+        types (dict): ``openapi_type`` to :class:`ProfileStat`
+        slowest (list): ``(seconds, doc_path, openapi_type)`` tuples for the
+            slowest nodes, slowest first
+        nodes (int): number of nodes validated
+        total_seconds (float): wall time of the whole run
+        traversal_seconds (float): time not spent in any rule
+        violations (list): :class:`Violation` objects found (all of them)
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self.types = {}
+        self.slowest = []
+        self.nodes = 0
+        self.total_seconds = 0.0
+        self.traversal_seconds = 0.0
+        self.violations = []
+
+    def _stat(self, stats, name):
+        stat = stats.get(name)
+        if stat is None:
+            stat = stats[name] = ProfileStat(name)
+        return stat
+
+    def to_dict(self):
+        """
+        Return the profile as a (JSON serializable) python dictionary.
+        """
+        def _by_time(stats):
+            return [s.to_dict() for s in sorted(
+                stats.values(), key=lambda s: s.seconds, reverse=True)]
+
+        return {
+            'nodes': self.nodes,
+            'total_seconds': self.total_seconds,
+            'traversal_seconds': self.traversal_seconds,
+            'rules': _by_time(self.rules),
+            'types': _by_time(self.types),
+            'slowest': [
+                {'path': path, 'type': openapi_type, 'seconds': seconds}
+                for seconds, path, openapi_type in self.slowest
+            ],
+            'violations': len(self.violations),
+        }
+
+    def report(self):
+        """
+        Return a human-readable report of the profile.
+        """
+        lines = [
+            f'# validated {self.nodes} nodes in '
+            f'{self.total_seconds * 1000:.3f}ms '
+            f'(traversal: {self.traversal_seconds * 1000:.3f}ms; '
+            f'violations: {len(self.violations)})',
+        ]
+        for title, stats in (('rule', self.rules), ('type', self.types)):
+            lines.append(f'#\n# {"by " + title:<32} {"calls":>8} '
+                         f'{"ms":>10} {"failures":>8}')
+            for stat in sorted(stats.values(), key=lambda s: s.seconds,
+                               reverse=True):
+                lines.append(
+                    f'# {stat.name:<32} {stat.calls:>8} '
+                    f'{stat.seconds * 1000:>10.3f} {stat.failures:>8}')
+        lines.append('#\n# slowest nodes:')
+        for seconds, path, openapi_type in self.slowest:
+            lines.append(
+                f'# {seconds * 1000:>10.3f}ms {path} ({openapi_type})')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return (f'ValidationProfile(nodes={self.nodes}, '
+                f'total_seconds={self.total_seconds:.6f}, '
+                f'violations={len(self.violations)})')
+
+
+def _run_check(profile, stat, type_stat, check, node):
+    start = perf_counter()
+    try:
+        check(node)
+    except MalformedDocumentException as e:
+        stat.failures += 1
+        type_stat.failures += 1
+        profile.violations.append(Violation.from_exception(e))
+    elapsed = perf_counter() - start
+    stat.calls += 1
+    stat.seconds += elapsed
+    return elapsed
+
+
+def profile_tree(root, follow_refs=False, top=10):
+    """
+    Validate ``root`` and all of its descendants, collecting every violation
+    and timing each rule.
+
+    Args:
+        root (OpenApiEntity): the entity to validate
+        follow_refs (bool): if ``True``, objects reachable through resolved
+            references are validated too (each distinct object, once).
+        top (int): number of slowest nodes to report
+
+    Returns:
+        ValidationProfile: the profile
+    """
+    profile = ValidationProfile()
+    slowest = []
+    rules = profile.rules
+    types = profile.types
+    plans = {}
+    rule_seconds = 0.0
+
+    start = perf_counter()
+    for node in iter_nodes(root, follow_refs=follow_refs, leaves=False,
+                           unique=follow_refs):
+        node_cls = node.__class__
+        plan = plans.get(node_cls)
+        if plan is None:
+            plan = plans[node_cls] = node_cls.validation_plan()
+
+        type_stat = profile._stat(types, node.openapi_type)
+        node_seconds = 0.0
+        for rule in plan.rules:
+            node_seconds += _run_check(
+                profile, profile._stat(rules, rule.name), type_stat,
+                rule.check, node)
+        if plan.body is not None:
+            node_seconds += _run_check(
+                profile, profile._stat(rules, plan.body.__qualname__),
+                type_stat, plan.body, node)
+
+        type_stat.calls += 1
+        type_stat.seconds += node_seconds
+        rule_seconds += node_seconds
+        profile.nodes += 1
+
+        entry = (node_seconds, node.doc_path, node.openapi_type)
+        if len(slowest) < top:
+            heapq.heappush(slowest, entry)
+        elif top:
+            heapq.heappushpop(slowest, entry)
+
+    profile.total_seconds = perf_counter() - start
+    profile.traversal_seconds = max(profile.total_seconds - rule_seconds, 0.0)
+    profile.slowest = sorted(slowest, reverse=True)
+    return profile
@@ -11,6 +11,8 @@ from .exceptions import MalformedDocumentException
 
 # TODO: This should subclass OpenApiBaseObject...
 class ReferenceObject(OpenApiEntity):
+    _is_ref = True
+
     def _init_data(self, data):
         self.__data = data
         self.__ref = data.get("$ref")
@@ -30,13 +32,6 @@ class ReferenceObject(OpenApiEntity):
     def _resolve_ref(self, api_entity):
         self.__obj = api_entity
 
-    def accept(self, visitor):
-        if self.__obj is not None:
-            self.__obj.accept(visitor)
-        else:
-            visitor(self)
-        return
-
     def target(self):
         """
         If this ReferenceObject has been resolved, return the targetted object.
@@ -0,0 +1,139 @@
+"""
+Iterative (non-recursive) traversal of OpenApi 3.0 document trees.
+
+Both traversal orders use an explicit stack, so arbitrarily deep documents can
+be walked without growing the Python call stack. Resolved references are
+followed, unless disabled; reference cycles are detected per branch and are
+never re-entered.
+"""
+
+
+def _leaf_filter(types):
+    """
+    Return a function used to decide whether a leaf entity (i.e. a primitive)
+    needs to be pushed onto the traversal stack at all. Results are memoized
+    per leaf class, so leaves that can never match ``types`` are skipped
+    without being visited.
+    """
+    if types is None:
+        return None
+
+    wanted = {}
+
+    def _want_leaf(leaf):
+        leaf_cls = leaf.__class__
+        want = wanted.get(leaf_cls)
+        if want is None:
+            want = wanted[leaf_cls] = isinstance(leaf, types)
+        return want
+    return _want_leaf
+
+
+def _no_leaves(leaf):
+    return False
+
+
+def _follow(node, refs):
+    """
+    If ``node`` is a resolved reference, return its target (and the updated
+    set of reference targets on the current branch). Returns ``(None, refs)``
+    if following the reference would introduce a cycle.
+    """
+    target = node.target()
+    if not hasattr(target, '_children'):
+        # Unresolved: the reference itself is the node.
+        return node, refs
+
+    target_id = id(target)
+    if target_id in refs:
+        return None, refs
+    return target, refs | {target_id}
+
+
+def iter_nodes(root, types=None, prune=None, follow_refs=True, leaves=True,
+               unique=False):
+    """
+    Pre-order, depth-first iteration over ``root`` and its descendants.
+
+    Args:
+        root (OpenApiEntity): the entity at which to begin traversal.
+        types (tuple): optional tuple of classes; only instances are yielded.
+        prune (func): optional predicate; if it returns ``True`` for a node,
+            that node's descendants are not traversed.
+        follow_refs (bool): if ``True`` (default), resolved references are
+            replaced by their targets.
+        leaves (bool): if ``False``, leaf entities (i.e. primitives) are
+            never visited.
+        unique (bool): if ``True``, each distinct node is visited at most
+            once, even if it is the target of several references.
+
+    Yields:
+        OpenApiEntity: matching document entities.
+    """
+    want_leaf = _leaf_filter(types) if leaves else _no_leaves
+    seen = set() if unique else None
+    stack = [(root, frozenset())]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        node, refs = pop()
+
+        if follow_refs and node._is_ref:
+            node, refs = _follow(node, refs)
+            if node is None:
+                continue
+
+        if seen is not None:
+            node_id = id(node)
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+
+        if types is None or isinstance(node, types):
+            yield node
+
+        if prune is not None and prune(node):
+            continue
+
+        children = node._children()
+        for child in reversed(children):
+            if want_leaf is not None and child._is_leaf \
+                    and not want_leaf(child):
+                continue
+            push((child, refs))
+    return
+
+
+def iter_nodes_post(root, follow_refs=True):
+    """
+    Post-order, depth-first iteration over ``root`` and its descendants (i.e.
+    children are yielded before their parents).
+
+    Args:
+        root (OpenApiEntity): the entity at which to begin traversal.
+        follow_refs (bool): if ``True`` (default), resolved references are
+            replaced by their targets.
+
+    Yields:
+        OpenApiEntity: document entities.
+    """
+    stack = [(root, False, frozenset())]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        node, expanded, refs = pop()
+        if expanded:
+            yield node
+            continue
+
+        if follow_refs and node._is_ref:
+            node, refs = _follow(node, refs)
+            if node is None:
+                continue
+
+        push((node, True, refs))
+        for child in reversed(node._children()):
+            push((child, False, refs))
+    return
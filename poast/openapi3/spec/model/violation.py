@@ -0,0 +1,314 @@
+"""
+Validation of OpenApi 3.0 document trees, in a single (non-recursive) pass.
+"""
+
+from collections import OrderedDict
+
+from .digest import content_hash
+from .exceptions import MalformedDocumentException
+from .traversal import iter_nodes
+
+
+class Violation:
+    """
+    A single validation failure in an OpenApi 3.0 document.
+
+    Attributes:
+        path (str): the document path of the offending object
+        openapi_type (str): the type of the offending object
+        field (str): the name of the offending field
+        rule (str): the name of the validation rule which was violated
+        message (str): description of the problem
+        exception (MalformedDocumentException): the underlying exception
+        referenced_from (tuple): document paths of the references through
+            which the offending object is reachable (if requested)
+    """
+
+    __slots__ = (
+        'path',
+        'openapi_type',
+        'field',
+        'rule',
+        'message',
+        'exception',
+        'referenced_from',
+    )
+
+    def __init__(self, path, openapi_type, field, rule, message,
+                 exception=None, referenced_from=()):
+        self.path = path
+        self.openapi_type = openapi_type
+        self.field = field
+        self.rule = rule
+        self.message = message
+        self.exception = exception
+        self.referenced_from = referenced_from
+
+    @classmethod
+    def from_exception(cls, e):
+        """
+        Create a violation from a :class:`MalformedDocumentException`.
+        """
+        return cls(
+            e.doc_obj.doc_path, e.doc_obj.openapi_type, e.field_name,
+            e.rule, e.msg, e)
+
+    def to_dict(self):
+        """
+        Return the violation as a (JSON serializable) python dictionary.
+        """
+        py_data = {
+            'path': self.path,
+            'type': self.openapi_type,
+            'field': self.field,
+            'rule': self.rule,
+            'message': self.message,
+        }
+        if self.referenced_from:
+            py_data['referenced_from'] = list(self.referenced_from)
+        return py_data
+
+    def __repr__(self):
+        return (f'Violation({self.path!r}, {self.openapi_type!r}, '
+                f'{self.field!r}, {self.rule!r}, {self.message!r})')
+
+    def __str__(self):
+        return str(self.exception) if self.exception is not None else \
+            f'Error at {self.path}: Field "{self.field}" in ' \
+            f'{self.openapi_type}: {self.message}'
+
+
+class ValidationCache:
+    """
+    Cache of validation results per document subtree, keyed by content hash.
+
+    Pass the same cache to successive ``validate(collect=True, cache=...)``
+    calls (e.g. after each edit or reload of a document): any subtree whose
+    content is unchanged reuses its cached results rather than being
+    revisited. Containers whose checks depend on their children (e.g.
+    path conflicts, duplicate parameters) are re-checked whenever any of
+    their descendants change, since that changes their content hash.
+
+    Attributes:
+        maxsize (int): optional maximum number of cached subtrees; least
+            recently used results are evicted first.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__results = OrderedDict()
+
+    def __len__(self):
+        return len(self.__results)
+
+    def clear(self):
+        self.__results.clear()
+        self.hits = self.misses = 0
+
+    def get(self, node):
+        """
+        Return the cached violations for the subtree at ``node``, rebased to
+        its document path (or ``None``, if not cached).
+        """
+        digest = content_hash(node)
+        entry = self.__results.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__results.move_to_end(digest)
+        base_path, results = entry
+        doc_path = node.doc_path
+        return [
+            Violation(
+                _rebase(path, base_path, doc_path),
+                openapi_type, field, rule, message)
+            for path, openapi_type, field, rule, message in results
+        ]
+
+    def put(self, node, violations):
+        """
+        Cache the violations for the subtree at ``node``.
+        """
+        digest = content_hash(node)
+        self.__results[digest] = (node.doc_path, tuple(
+            (v.path, v.openapi_type, v.field, v.rule, v.message)
+            for v in violations))
+        self.__results.move_to_end(digest)
+        if self.maxsize is not None and len(self.__results) > self.maxsize:
+            self.__results.popitem(last=False)
+        return
+
+
+def _rebase(path, base_path, doc_path):
+    """
+    Move ``path`` from the subtree at ``base_path`` to the one at
+    ``doc_path`` (paths outside the subtree, e.g. of referenced objects,
+    are returned unchanged).
+    """
+    if path.startswith(base_path) and (
+            len(path) == len(base_path) or path[len(base_path)] in '/['):
+        return doc_path + path[len(base_path):]
+    return path
+
+
+class _MaxErrors(Exception):
+    pass
+
+
+def _raise(e):
+    raise e
+
+
+def validate_tree(root, follow_refs=False):
+    """
+    Validate ``root`` and all of its descendants, raising on the first
+    violation.
+
+    Args:
+        root (OpenApiEntity): the entity to validate
+        follow_refs (bool): if ``True``, objects reachable through resolved
+            references are validated too (each distinct object, once).
+
+    Raises:
+        MalformedDocumentException: if the document is invalid
+    """
+    plans = {}
+    for node in iter_nodes(root, follow_refs=follow_refs, leaves=False,
+                           unique=follow_refs):
+        node_cls = node.__class__
+        plan = plans.get(node_cls)
+        if plan is None:
+            plan = plans[node_cls] = node_cls.validation_plan()
+        plan.check(node, _raise)
+    return
+
+
+def _check_node(node, report):
+    try:
+        node.validation_plan().check(node, report)
+    except MalformedDocumentException as e:
+        report(e)
+    return
+
+
+def collect_violations(root, max_errors=None, cache=None, follow_refs=False,
+                       attribute_refs=False):
+    """
+    Validate ``root`` and all of its descendants, collecting every violation
+    rather than stopping at the first.
+
+    Args:
+        root (OpenApiEntity): the entity to validate
+        max_errors (int): optional limit on the number of violations to
+            collect; validation stops once the limit is reached.
+        cache (ValidationCache): optional cache of per-subtree results.
+            (Not supported with ``follow_refs``).
+        follow_refs (bool): if ``True``, objects reachable through resolved
+            references are validated too (each distinct object, once).
+        attribute_refs (bool): if ``True``, populate each violation's
+            ``referenced_from`` with the paths of the references through
+            which the offending object is reachable.
+
+    Returns:
+        list: :class:`Violation` objects, in document order
+    """
+    if cache is not None and follow_refs:
+        raise ValueError('validation cache does not support follow_refs')
+
+    violations = []
+
+    def _report(e):
+        violations.append(Violation.from_exception(e))
+        if max_errors is not None and len(violations) >= max_errors:
+            raise _MaxErrors()
+
+    try:
+        if cache is None:
+            for node in iter_nodes(root, follow_refs=follow_refs,
+                                   leaves=False, unique=follow_refs):
+                _check_node(node, _report)
+        else:
+            _collect_cached(root, violations, _report, cache, max_errors)
+    except _MaxErrors:
+        del violations[max_errors:]
+
+    if attribute_refs and violations:
+        _attribute_refs(root, violations)
+    return violations
+
+
+def _path_prefixes(doc_path):
+    """
+    Yield ``doc_path`` and the paths of all of its ancestors.
+    """
+    yield doc_path
+    for i in range(len(doc_path) - 1, 0, -1):
+        if doc_path[i] in '/[':
+            yield doc_path[:i]
+
+
+def _attribute_refs(root, violations):
+    """
+    Populate ``referenced_from`` for each violation, following chains of
+    references (i.e. references to objects which are themselves reachable
+    through references).
+    """
+    if hasattr(root, 'find'):
+        refs = root.find('ReferenceObject')
+    else:
+        refs = [n for n in iter_nodes(root, follow_refs=False, leaves=False)
+                if n._is_ref]
+
+    refs_by_target = {}
+    for ref in refs:
+        refs_by_target.setdefault(str(ref.ref), []).append(ref.doc_path)
+
+    for v in violations:
+        found = []
+        pending = [v.path]
+        seen = set(pending)
+        while pending:
+            for prefix in _path_prefixes(pending.pop()):
+                for ref_path in refs_by_target.get(prefix, ()):
+                    if ref_path not in seen:
+                        seen.add(ref_path)
+                        found.append(ref_path)
+                        pending.append(ref_path)
+        v.referenced_from = tuple(found)
+    return
+
+
+def _collect_cached(root, violations, report, cache, max_errors):
+    """
+    Collect violations for the tree at ``root``, reusing (and populating)
+    cached results for unchanged subtrees.
+    """
+    # Stack entries are (node, start); if start is not None, the subtree at
+    # node is complete and violations[start:] are its results:
+    stack = [(root, None)]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        node, start = pop()
+        if start is not None:
+            cache.put(node, violations[start:])
+            continue
+
+        cached = cache.get(node)
+        if cached is not None:
+            violations.extend(cached)
+            if max_errors is not None and len(violations) >= max_errors:
+                raise _MaxErrors()
+            continue
+
+        push((node, len(violations)))
+        _check_node(node, report)
+        for child in reversed(node._children()):
+            if not child._is_leaf and not child._is_ref:
+                push((child, None))
+    return
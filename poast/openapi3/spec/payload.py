@@ -0,0 +1,495 @@
+"""
+Compiled validators for JSON payloads, generated from SchemaObjects.
+
+A schema is compiled, once, into a tree of closures: each keyword present in
+the schema contributes a small check function, with all of its constants
+(bounds, compiled patterns, enum sets, sub-validators) bound at compile
+time. Validating a payload then only runs the checks which apply.
+
+Resolved references are followed at compile time. Recursive schemas are
+supported: a schema which (directly or indirectly) refers to itself is
+compiled once, and the recursive use calls through a forward reference.
+
+``oneOf`` / ``anyOf`` schemas with a discriminator jump straight to the
+member selected by the discriminator value (see
+:meth:`~poast.openapi3.spec.document.DiscriminatorObject.dispatch_table`),
+rather than trying each member in turn.
+
+Example::
+
+    >>> validate_pet = doc.schemas['Pet'].compile_validator()
+    >>> validate_pet({'id': 1, 'name': 'rex'})
+    >>> validate_pet({'id': 'one'})
+    Traceback (most recent call last):
+    ...
+    PayloadValidationException: $.id: value must be of type integer ...
+"""
+
+import math
+import re
+
+from .model.exceptions import PayloadValidationException
+from .util import compile_pattern
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _field_value(schema, field_name):
+    """
+    Return the python value of a schema field (or ``None``, if unset).
+    """
+    field_val = schema[field_name]
+    if field_val is None:
+        return None
+    return field_val.value()
+
+
+def _deref(schema):
+    """
+    Return the target of a (resolved) reference, or ``schema`` itself.
+    """
+    while getattr(schema, '_is_ref', False):
+        target = schema.target()
+        if not hasattr(target, '_children'):
+            raise ValueError(
+                f'Unresolved reference: "{schema.ref}" at "{schema.doc_path}"')
+        schema = target
+    return schema
+
+
+def _child_path(path, key):
+    if _IDENTIFIER.match(key):
+        return f'{path}.{key}'
+    return f'{path}[{key!r}]'
+
+
+def _fail(schema, path, rule, msg):
+    raise PayloadValidationException(path, schema.doc_path, rule, msg)
+
+
+_TYPE_CHECKS = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float))
+    and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'array': lambda v: isinstance(v, list),
+    'object': lambda v: isinstance(v, dict),
+}
+
+
+def _is_num(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+#: Relative tolerance of ``multipleOf`` checks of floats:
+_MULTIPLE_OF_TOLERANCE = 1e-9
+
+
+def _is_multiple(value, multiple_of):
+    """
+    Return whether ``value`` is a multiple of ``multiple_of``; unless both
+    are integers, within :data:`_MULTIPLE_OF_TOLERANCE` (since e.g.
+    ``0.3 % 0.1`` is not 0).
+    """
+    if isinstance(value, int) and isinstance(multiple_of, int):
+        return value % multiple_of == 0
+    quotient = value / multiple_of
+    if not math.isfinite(quotient):
+        return False
+    return abs(quotient - round(quotient)) <= \
+        _MULTIPLE_OF_TOLERANCE * max(1.0, abs(quotient))
+
+
+class _Compiler:
+    """
+    Compile SchemaObjects into validator functions, sharing the validators
+    of schemas reached more than once (and breaking recursion).
+    """
+
+    def __init__(self):
+        self.compiled = {}
+        self.schemas = []
+
+    def compile(self, schema):
+        schema = _deref(schema)
+        cached = getattr(schema, '_payload_validator', None)
+        if cached is not None:
+            return cached
+
+        key = id(schema)
+        validator = self.compiled.get(key)
+        if validator is not None:
+            return validator
+
+        # Recursive uses of this schema (while it is being compiled) call
+        # through a forward reference:
+        resolved = []
+
+        def _forward(value, path='$'):
+            return resolved[0](value, path)
+
+        self.compiled[key] = _forward
+        self.schemas.append(schema)
+        validator = self._compile(schema)
+        resolved.append(validator)
+        self.compiled[key] = validator
+        return validator
+
+    def _compile(self, schema):
+        checks = []
+        for compile_keyword in (
+                self._type, self._enum, self._numeric, self._string,
+                self._array, self._object, self._combinators):
+            checks.extend(compile_keyword(schema))
+
+        schema_type = _field_value(schema, 'type')
+        nullable = bool(_field_value(schema, 'nullable'))
+        checks = tuple(checks)
+
+        def _validate(value, path='$'):
+            if value is None:
+                if nullable:
+                    return
+                if schema_type is not None:
+                    _fail(schema, path, 'nullable', 'value may not be null')
+            for check in checks:
+                check(value, path)
+            return
+
+        return _validate
+
+    def _dispatch(self, schema, field_name):
+        """
+        Return ``(property name, {value: validator})`` for the members of
+        ``schema[field_name]`` selected by its discriminator (or ``None``).
+        Payloads whose discriminator value is not in the table are checked
+        against every member.
+        """
+        discriminator = schema['discriminator']
+        if discriminator is None:
+            return None
+
+        members = set(id(_deref(s)) for s in schema[field_name])
+        validators = {
+            value: self.compile(target)
+            for value, target in discriminator.dispatch_table().items()
+            if id(target) in members
+        }
+        return discriminator.property_name, validators
+
+    def _type(self, schema):
+        schema_type = _field_value(schema, 'type')
+        if schema_type is None:
+            return
+
+        is_type = _TYPE_CHECKS.get(schema_type)
+        if is_type is None:
+            raise ValueError(
+                f'Unsupported schema type "{schema_type}" at '
+                f'"{schema.doc_path}"')
+        msg = f'value must be of type {schema_type}'
+
+        def _check_type(value, path):
+            if value is not None and not is_type(value):
+                _fail(schema, path, 'type', msg)
+        yield _check_type
+
+    def _enum(self, schema):
+        enum = _field_value(schema, 'enum')
+        if enum is None:
+            return
+
+        try:
+            valid = frozenset(enum)
+        except TypeError:
+            valid = enum
+        msg = f'value must be one of {enum}'
+
+        def _check_enum(value, path):
+            try:
+                ok = value in valid
+            except TypeError:
+                ok = value in enum
+            if not ok:
+                _fail(schema, path, 'enum', msg)
+        yield _check_enum
+
+    def _numeric(self, schema):
+        maximum = _field_value(schema, 'maximum')
+        if maximum is not None:
+            if _field_value(schema, 'exclusiveMaximum'):
+                msg = f'value must be < {maximum}'
+
+                def _check_max(value, path):
+                    if _is_num(value) and value >= maximum:
+                        _fail(schema, path, 'exclusiveMaximum', msg)
+            else:
+                msg = f'value must be <= {maximum}'
+
+                def _check_max(value, path):
+                    if _is_num(value) and value > maximum:
+                        _fail(schema, path, 'maximum', msg)
+            yield _check_max
+
+        minimum = _field_value(schema, 'minimum')
+        if minimum is not None:
+            if _field_value(schema, 'exclusiveMinimum'):
+                msg = f'value must be > {minimum}'
+
+                def _check_min(value, path):
+                    if _is_num(value) and value <= minimum:
+                        _fail(schema, path, 'exclusiveMinimum', msg)
+            else:
+                msg = f'value must be >= {minimum}'
+
+                def _check_min(value, path):
+                    if _is_num(value) and value < minimum:
+                        _fail(schema, path, 'minimum', msg)
+            yield _check_min
+
+        multiple_of = _field_value(schema, 'multipleOf')
+        if multiple_of:
+            msg = f'value must be a multiple of {multiple_of}'
+
+            def _check_multiple_of(value, path):
+                if _is_num(value) and not _is_multiple(value, multiple_of):
+                    _fail(schema, path, 'multipleOf', msg)
+            yield _check_multiple_of
+
+    def _string(self, schema):
+        max_length = _field_value(schema, 'maxLength')
+        if max_length is not None:
+            msg = f'length must be <= {max_length}'
+
+            def _check_max_length(value, path):
+                if isinstance(value, str) and len(value) > max_length:
+                    _fail(schema, path, 'maxLength', msg)
+            yield _check_max_length
+
+        min_length = _field_value(schema, 'minLength')
+        if min_length is not None:
+            msg = f'length must be >= {min_length}'
+
+            def _check_min_length(value, path):
+                if isinstance(value, str) and len(value) < min_length:
+                    _fail(schema, path, 'minLength', msg)
+            yield _check_min_length
+
+        pattern = _field_value(schema, 'pattern')
+        if pattern is not None:
+            search = compile_pattern(pattern).search
+            msg = f'value must match pattern {pattern!r}'
+
+            def _check_pattern(value, path):
+                if isinstance(value, str) and search(value) is None:
+                    _fail(schema, path, 'pattern', msg)
+            yield _check_pattern
+
+    def _array(self, schema):
+        max_items = _field_value(schema, 'maxItems')
+        if max_items is not None:
+            msg = f'must have at most {max_items} items'
+
+            def _check_max_items(value, path):
+                if isinstance(value, list) and len(value) > max_items:
+                    _fail(schema, path, 'maxItems', msg)
+            yield _check_max_items
+
+        min_items = _field_value(schema, 'minItems')
+        if min_items is not None:
+            msg = f'must have at least {min_items} items'
+
+            def _check_min_items(value, path):
+                if isinstance(value, list) and len(value) < min_items:
+                    _fail(schema, path, 'minItems', msg)
+            yield _check_min_items
+
+        if _field_value(schema, 'uniqueItems'):
+            def _check_unique_items(value, path):
+                if not isinstance(value, list):
+                    return
+                seen = []
+                for item in value:
+                    if item in seen:
+                        _fail(schema, path, 'uniqueItems',
+                              'items must be unique')
+                    seen.append(item)
+            yield _check_unique_items
+
+        if schema['items'] is not None:
+            validate_item = self.compile(schema['items'])
+
+            def _check_items(value, path):
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        validate_item(item, f'{path}[{i}]')
+            yield _check_items
+
+    def _object(self, schema):
+        max_props = _field_value(schema, 'maxProperties')
+        if max_props is not None:
+            msg = f'must have at most {max_props} properties'
+
+            def _check_max_props(value, path):
+                if isinstance(value, dict) and len(value) > max_props:
+                    _fail(schema, path, 'maxProperties', msg)
+            yield _check_max_props
+
+        min_props = _field_value(schema, 'minProperties')
+        if min_props is not None:
+            msg = f'must have at least {min_props} properties'
+
+            def _check_min_props(value, path):
+                if isinstance(value, dict) and len(value) < min_props:
+                    _fail(schema, path, 'minProperties', msg)
+            yield _check_min_props
+
+        required = _field_value(schema, 'required')
+        if required:
+            required = tuple(required)
+
+            def _check_required(value, path):
+                if isinstance(value, dict):
+                    for name in required:
+                        if name not in value:
+                            _fail(schema, _child_path(path, name),
+                                  'required', 'is required')
+            yield _check_required
+
+        properties = {}
+        if schema['properties'] is not None:
+            for name, prop in schema['properties'].items():
+                properties[name] = self.compile(prop)
+
+        additional = schema['additionalProperties']
+        validate_additional = None
+        if additional is not None:
+            value = additional.value()
+            if isinstance(value, dict):
+                validate_additional = self._additional(schema, additional)
+                value = None
+            additional = value
+
+        if not properties and additional in (None, True) and \
+                validate_additional is None:
+            return
+
+        get_prop = properties.get
+        allow_additional = additional is not False
+
+        def _check_properties(value, path):
+            if not isinstance(value, dict):
+                return
+            for name, prop_val in value.items():
+                validate_prop = get_prop(name)
+                if validate_prop is not None:
+                    validate_prop(prop_val, _child_path(path, name))
+                elif validate_additional is not None:
+                    validate_additional(prop_val, _child_path(path, name))
+                elif not allow_additional:
+                    _fail(schema, _child_path(path, name),
+                          'additionalProperties',
+                          'additional properties are not allowed')
+        yield _check_properties
+
+    def _additional(self, schema, additional):
+        """
+        Compile an ``additionalProperties`` schema, or return ``None`` if it
+        cannot be compiled (e.g. it contains unresolved references), in
+        which case any additional properties are allowed.
+        """
+        if getattr(additional, '_is_ref', False):
+            target = additional.target()
+            if not isinstance(target, type(schema)):
+                return None
+            return self.compile(target)
+
+        # NOTE: the document model stores inline additionalProperties schemas
+        #       as plain data, so references within them are not resolved:
+        sub_schema = type(schema)(
+            additional.value(), f'{schema.doc_path}/additionalProperties')
+        try:
+            return self.compile(sub_schema)
+        except ValueError:
+            return None
+
+    def _combinators(self, schema):
+        if schema['allOf'] is not None:
+            all_of = tuple(self.compile(s) for s in schema['allOf'])
+
+            def _check_all_of(value, path):
+                for validate_sub in all_of:
+                    validate_sub(value, path)
+            yield _check_all_of
+
+        if schema['anyOf'] is not None:
+            any_of = tuple(self.compile(s) for s in schema['anyOf'])
+            dispatch = self._dispatch(schema, 'anyOf')
+
+            def _check_any_of(value, path):
+                if dispatch is not None and isinstance(value, dict):
+                    validate_sub = dispatch[1].get(value.get(dispatch[0]))
+                    if validate_sub is not None:
+                        return validate_sub(value, path)
+                if _count_valid(any_of, value, path, 1) < 1:
+                    _fail(schema, path, 'anyOf',
+                          'value must match at least one schema')
+            yield _check_any_of
+
+        if schema['oneOf'] is not None:
+            one_of = tuple(self.compile(s) for s in schema['oneOf'])
+            dispatch = self._dispatch(schema, 'oneOf')
+
+            def _check_one_of(value, path):
+                if dispatch is not None and isinstance(value, dict):
+                    validate_sub = dispatch[1].get(value.get(dispatch[0]))
+                    if validate_sub is not None:
+                        return validate_sub(value, path)
+                if _count_valid(one_of, value, path, 2) != 1:
+                    _fail(schema, path, 'oneOf',
+                          'value must match exactly one schema')
+            yield _check_one_of
+
+        if schema['not'] is not None:
+            not_any = tuple(self.compile(s) for s in schema['not'])
+
+            def _check_not(value, path):
+                if _count_valid(not_any, value, path, 1):
+                    _fail(schema, path, 'not',
+                          'value must not match the schema')
+            yield _check_not
+
+
+def _count_valid(validators, value, path, limit):
+    """
+    Count the validators which accept ``value``, stopping at ``limit``.
+    """
+    count = 0
+    for validate_sub in validators:
+        try:
+            validate_sub(value, path)
+        except PayloadValidationException:
+            continue
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+def compile_validator(schema):
+    """
+    Compile a SchemaObject (or a resolved reference to one) into a payload
+    validator, ``validate(value, path='$')``, which raises
+    :class:`PayloadValidationException` on the first failure.
+
+    Validators are cached on the schema nodes they are compiled from.
+    """
+    compiler = _Compiler()
+    validator = compiler.compile(schema)
+
+    # Only cache validators once compilation has succeeded:
+    for compiled_schema in compiler.schemas:
+        compiled_schema._payload_validator = \
+            compiler.compiled[id(compiled_schema)]
+    return validator
@@ -0,0 +1,601 @@
+"""
+A small, JSONPath-style query language for OpenApi 3.0 documents.
+
+Queries are compiled once (and cached) into a plan of steps, which is then
+executed lazily against a document; e.g.::
+
+    >>> q = compile_query("$.paths[*][get,post].parameters[?(@.in=='header')]")
+    >>> for param in q(doc):
+    ...     print(param.doc_path)
+
+Supported syntax:
+
++-----------------------+---------------------------------------------------+
+| Syntax                | Meaning                                           |
++=======================+===================================================+
+| ``$``                 | the document (or entity) being queried            |
++-----------------------+---------------------------------------------------+
+| ``.name``/``['name']``| child field, map key, or list index               |
++-----------------------+---------------------------------------------------+
+| ``[a,b]``/``[0,-1]``  | union of children by name (quoted or bare)/index  |
++-----------------------+---------------------------------------------------+
+| ``.*``/``[*]``        | all children                                      |
++-----------------------+---------------------------------------------------+
+| ``..name``/``..*``    | recursive descent (references are not entered)    |
++-----------------------+---------------------------------------------------+
+| ``[?(expr)]``         | children for which ``expr`` holds                 |
++-----------------------+---------------------------------------------------+
+
+Filter expressions compare ``@``-relative operands (e.g. ``@.schema.type``)
+with string, number, ``true``/``false``/``null`` literals, using ``==``,
+``!=``, ``<``, ``<=``, ``>``, ``>=``; a bare operand tests for presence.
+Conditions may be joined with ``&&`` and ``||`` (``&&`` binds tighter).
+The pseudo-fields ``openapi_type`` and ``doc_path`` give access to the
+entity's type name and document path.
+
+Resolved references are followed by child, wildcard and filter steps (except
+when they select from the results of a recursive descent). Plans
+use the document indexes where possible: a leading run of child names is a
+single lookup in the path index, and ``$..[?(@.openapi_type=='X')]`` reads
+the per-type index, rather than scanning the document.
+"""
+
+import functools
+import json
+import re
+
+from .model.baseobj import OpenApiBaseObject
+from .model.containers import OpenApiContainer
+from .model.traversal import iter_nodes
+
+_PSEUDO_FIELDS = ('openapi_type', 'doc_path')
+_BRANCH_TYPES = (OpenApiBaseObject, OpenApiContainer)
+
+_NAME_RE = re.compile(r'[A-Za-z_$][\w\-$]*')
+_INT_RE = re.compile(r'-?\d+$')
+
+_FILTER_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<op>==|!=|<=|>=|<|>|&&|\|\|)
+      | (?P<at>@)
+      | (?P<dot>\.)
+      | \[\s*(?P<key>'[^']*'|"[^"]*")\s*\]
+      | (?P<str>'[^']*'|"[^"]*")
+      | (?P<num>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_$][\w\-$]*)
+    )''', re.VERBOSE)
+
+_COMPARATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+_MISSING = object()
+
+
+# --------------------------------------------------------------------------
+# Node access helpers:
+# --------------------------------------------------------------------------
+
+def _deref(node):
+    """
+    Return the target of a resolved reference; otherwise, the node itself.
+    """
+    if node._is_ref:
+        target = node.target()
+        if hasattr(target, '_children'):
+            return target
+    return node
+
+
+def _child(node, key, follow_refs=True):
+    """
+    Return the child of ``node`` at ``key`` (a name or index), or ``None``.
+    """
+    if isinstance(node, dict):
+        if not isinstance(key, str):
+            return None
+        child = dict.get(node, key)
+    elif isinstance(node, list):
+        if isinstance(key, str):
+            if not _INT_RE.match(key):
+                return None
+            key = int(key)
+        try:
+            child = node[key]
+        except IndexError:
+            return None
+    else:
+        return None
+
+    if child is None or not follow_refs:
+        return child
+    return _deref(child)
+
+
+def _children(node, follow_refs=True):
+    if not follow_refs:
+        return node._children()
+    return (_deref(child) for child in node._children())
+
+
+def _operand_value(node, path):
+    """
+    Resolve an ``@``-relative operand to a python value (or ``_MISSING``).
+    """
+    cur = node
+    for name in path:
+        nxt = _child(cur, name)
+        if nxt is None:
+            if name in _PSEUDO_FIELDS and hasattr(cur, '_children'):
+                return getattr(cur, name)
+            return _MISSING
+        cur = nxt
+
+    if cur._is_leaf:
+        return cur.value()
+    return cur
+
+
+# --------------------------------------------------------------------------
+# Plan steps:
+# --------------------------------------------------------------------------
+
+class QueryStep:
+    """
+    Base class for compiled query steps. Each step maps an iterable of input
+    nodes to a generator of output nodes.
+    """
+    __slots__ = ()
+
+    def apply(self, root, nodes):
+        raise NotImplementedError()
+
+    def __repr__(self):
+        args = ', '.join(repr(getattr(self, s)) for s in self.__slots__)
+        return f'{self.__class__.__name__}({args})'
+
+
+class RootStep(QueryStep):
+    """``$``: the queried entity itself."""
+    __slots__ = ()
+
+    def apply(self, root, nodes):
+        yield root
+
+
+class IndexedPathStep(QueryStep):
+    """``$.a.b.c``: a single lookup in the document path index."""
+    __slots__ = ('keys',)
+
+    def __init__(self, keys):
+        self.keys = tuple(keys)
+
+    def apply(self, root, nodes):
+        by_path = getattr(root, '_obj_by_path', None)
+        if by_path is not None:
+            node = by_path.get(self._doc_path(root.doc_path))
+            if node is not None:
+                yield _deref(node)
+                return
+
+        # Not indexed (e.g. the path traverses a reference); walk it:
+        node = root
+        for key in self.keys:
+            node = _child(node, key)
+            if node is None:
+                return
+        yield node
+
+    def _doc_path(self, doc_path):
+        for key in self.keys:
+            if key.find('/') != -1:
+                doc_path = f'{doc_path}["{key}"]'
+            else:
+                doc_path = '/'.join((doc_path, key))
+        return doc_path
+
+
+class ChildStep(QueryStep):
+    """``.name``, ``[a,b]``, ``[0]``: children by name/index."""
+    __slots__ = ('keys', 'follow_refs')
+
+    def __init__(self, keys, follow_refs=True):
+        self.keys = tuple(keys)
+        self.follow_refs = follow_refs
+
+    def apply(self, root, nodes):
+        keys = self.keys
+        follow_refs = self.follow_refs
+        for node in nodes:
+            for key in keys:
+                child = _child(node, key, follow_refs)
+                if child is not None:
+                    yield child
+
+
+class WildcardStep(QueryStep):
+    """``.*``, ``[*]``: all children."""
+    __slots__ = ('follow_refs',)
+
+    def __init__(self, follow_refs=True):
+        self.follow_refs = follow_refs
+
+    def apply(self, root, nodes):
+        follow_refs = self.follow_refs
+        for node in nodes:
+            yield from _children(node, follow_refs)
+
+
+class DescendStep(QueryStep):
+    """
+    ``..``: the input nodes, and all of their descendants which have
+    children. References are not followed.
+    """
+    __slots__ = ()
+
+    def apply(self, root, nodes):
+        for node in nodes:
+            yield from iter_nodes(
+                node, types=_BRANCH_TYPES, follow_refs=False)
+
+
+class TypeIndexStep(QueryStep):
+    """``$..[?(@.openapi_type=='X')]``: lookup in the per-type index."""
+    __slots__ = ('openapi_type',)
+
+    def __init__(self, openapi_type):
+        self.openapi_type = openapi_type
+
+    def apply(self, root, nodes):
+        if hasattr(root, 'find'):
+            yield from root.find(self.openapi_type)
+            return
+
+        descendants = iter_nodes(root, follow_refs=False)
+        next(descendants)
+        for node in descendants:
+            if node.openapi_type == self.openapi_type:
+                yield node
+
+
+class FilterStep(QueryStep):
+    """``[?(expr)]``: children matching a predicate."""
+    __slots__ = ('predicate', 'follow_refs')
+
+    def __init__(self, predicate, follow_refs=True):
+        self.predicate = predicate
+        self.follow_refs = follow_refs
+
+    def apply(self, root, nodes):
+        match = self.predicate
+        follow_refs = self.follow_refs
+        for node in nodes:
+            for child in _children(node, follow_refs):
+                if match(child):
+                    yield child
+
+
+class SelectStep(QueryStep):
+    """Keep the input nodes which match a predicate."""
+    __slots__ = ('predicate',)
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def apply(self, root, nodes):
+        match = self.predicate
+        for node in nodes:
+            if match(node):
+                yield node
+
+
+class Predicate:
+    """
+    Compiled filter expression: a disjunction of conjunctions of conditions.
+    Each condition is a tuple of ``(operand_path, operator, literal)``, where
+    ``operator`` is ``None`` for presence tests.
+    """
+    __slots__ = ('clauses',)
+
+    def __init__(self, clauses):
+        self.clauses = tuple(tuple(c) for c in clauses)
+
+    def __call__(self, node):
+        for clause in self.clauses:
+            for path, op, literal in clause:
+                if not self._test(node, path, op, literal):
+                    break
+            else:
+                return True
+        return False
+
+    @staticmethod
+    def _test(node, path, op, literal):
+        val = _operand_value(node, path)
+        if val is _MISSING:
+            return False
+        if op is None:
+            return True
+        try:
+            return _COMPARATORS[op](val, literal)
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        return ' || '.join(
+            ' && '.join(
+                '@.' + '.'.join(path) + (
+                    '' if op is None else f' {op} {json.dumps(lit)}')
+                for path, op, lit in clause)
+            for clause in self.clauses)
+
+
+class CompiledQuery:
+    """
+    A compiled query plan. Calling the plan with a document (or any
+    OpenApiEntity) returns a generator of matching entities.
+
+    Attributes:
+        expr (str): the source query expression
+        steps (tuple): the compiled :class:`QueryStep` objects
+    """
+    __slots__ = ('expr', 'steps')
+
+    def __init__(self, expr, steps):
+        self.expr = expr
+        self.steps = tuple(steps)
+
+    def __call__(self, root):
+        nodes = ()
+        for step in self.steps:
+            nodes = step.apply(root, nodes)
+        return nodes
+
+    def __repr__(self):
+        return f'CompiledQuery({self.expr!r}, {list(self.steps)!r})'
+
+
+# --------------------------------------------------------------------------
+# Parsing:
+# --------------------------------------------------------------------------
+
+def _query_error(expr, pos, msg):
+    return ValueError(f'Invalid query "{expr}" at {pos}: {msg}')
+
+
+def _parse_key(item, expr, pos):
+    item = item.strip()
+    if len(item) >= 2 and item[0] == item[-1] and item[0] in '\'"':
+        return item[1:-1]
+    if _INT_RE.match(item):
+        return int(item)
+    if _NAME_RE.fullmatch(item):
+        return item
+    raise _query_error(expr, pos, f'bad selector: {item!r}')
+
+
+def _split_union(body):
+    items = []
+    quote = None
+    start = 0
+    for i, c in enumerate(body):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '\'"':
+            quote = c
+        elif c == ',':
+            items.append(body[start:i])
+            start = i + 1
+    items.append(body[start:])
+    return items
+
+
+def _find_bracket_end(expr, pos):
+    """
+    Return the index of the ``]`` closing the bracket opened at ``pos``.
+    """
+    quote = None
+    depth = 0
+    for i in range(pos + 1, len(expr)):
+        c = expr[i]
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '\'"':
+            quote = c
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == ']' and depth == 0:
+            return i
+    raise _query_error(expr, pos, 'unterminated "["')
+
+
+def _parse_literal(kind, text):
+    if kind == 'str':
+        return text[1:-1]
+    if kind == 'num':
+        return float(text) if any(c in text for c in '.eE') else int(text)
+    return {'true': True, 'false': False, 'null': None}[text]
+
+
+def _parse_filter(expr, body, pos):
+    """
+    Parse the body of a ``?(...)`` filter into a :class:`Predicate`.
+    """
+    tokens = []
+    i = 0
+    body = body.rstrip()
+    while i < len(body):
+        m = _FILTER_TOKEN_RE.match(body, i)
+        if m is None or m.end() == i:
+            raise _query_error(expr, pos + i, 'bad filter expression')
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        i = m.end()
+
+    clauses = [[]]
+    tokens.append((None, None))
+    i = 0
+    while True:
+        kind, text = tokens[i]
+        if kind != 'at':
+            raise _query_error(expr, pos, 'expected "@" operand in filter')
+        i += 1
+
+        path = []
+        while True:
+            kind, text = tokens[i]
+            if kind == 'dot' and tokens[i + 1][0] == 'name':
+                path.append(tokens[i + 1][1])
+                i += 2
+            elif kind == 'key':
+                path.append(text.strip()[1:-1])
+                i += 1
+            else:
+                break
+
+        op = literal = None
+        kind, text = tokens[i]
+        if kind == 'op' and text in _COMPARATORS:
+            op = text
+            kind, text = tokens[i + 1]
+            if kind == 'str' or kind == 'num' or (
+                    kind == 'name' and text in ('true', 'false', 'null')):
+                literal = _parse_literal(kind, text)
+            else:
+                raise _query_error(expr, pos, 'expected literal in filter')
+            i += 2
+
+        clauses[-1].append((tuple(path), op, literal))
+
+        kind, text = tokens[i]
+        if kind is None:
+            break
+        if text == '||':
+            clauses.append([])
+        elif text != '&&':
+            raise _query_error(expr, pos, f'unexpected {text!r} in filter')
+        i += 1
+
+    return Predicate(clauses)
+
+
+def _parse_steps(expr):
+    """
+    Parse a query expression into a list of (unoptimized) steps.
+    """
+    expr = expr.strip()
+    if not expr.startswith('$'):
+        raise _query_error(expr, 0, 'queries must begin with "$"')
+
+    steps = [RootStep()]
+    pos = 1
+    while pos < len(expr):
+        # Selectors applied to the results of a descent don't follow refs:
+        follow_refs = not isinstance(steps[-1], DescendStep)
+
+        if expr.startswith('..', pos):
+            pos += 2
+            steps.append(DescendStep())
+            if expr.startswith('[', pos):
+                continue
+            if expr.startswith('*', pos):
+                steps.append(WildcardStep(False))
+                pos += 1
+                continue
+            m = _NAME_RE.match(expr, pos)
+            if m is None:
+                raise _query_error(expr, pos, 'expected name after ".."')
+            steps.append(ChildStep([m.group()], False))
+            pos = m.end()
+        elif expr.startswith('.', pos):
+            pos += 1
+            if expr.startswith('*', pos):
+                steps.append(WildcardStep())
+                pos += 1
+                continue
+            m = _NAME_RE.match(expr, pos)
+            if m is None:
+                raise _query_error(expr, pos, 'expected name after "."')
+            steps.append(ChildStep([m.group()]))
+            pos = m.end()
+        elif expr.startswith('[', pos):
+            end = _find_bracket_end(expr, pos)
+            body = expr[pos + 1:end].strip()
+            if body == '*':
+                steps.append(WildcardStep(follow_refs))
+            elif body.startswith('?'):
+                filt = body[1:].strip()
+                if not (filt.startswith('(') and filt.endswith(')')):
+                    raise _query_error(expr, pos, 'expected "?(...)"')
+                steps.append(FilterStep(
+                    _parse_filter(expr, filt[1:-1], pos), follow_refs))
+            else:
+                steps.append(ChildStep(
+                    [_parse_key(i, expr, pos) for i in _split_union(body)],
+                    follow_refs))
+            pos = end + 1
+        else:
+            raise _query_error(expr, pos, f'unexpected {expr[pos]!r}')
+    return steps
+
+
+def _optimize(steps):
+    """
+    Rewrite a list of steps to make use of the document indexes.
+    """
+    # $.a.b.c -> single path index lookup:
+    keys = []
+    for step in steps[1:]:
+        if not (isinstance(step, ChildStep) and len(step.keys) == 1
+                and isinstance(step.keys[0], str)):
+            break
+        keys.append(step.keys[0])
+    if len(keys) > 1:
+        steps = [IndexedPathStep(keys)] + steps[1 + len(keys):]
+
+    # $..[?(@.openapi_type == 'X' && ...)] -> per-type index lookup:
+    if (len(steps) > 2 and isinstance(steps[0], RootStep)
+            and isinstance(steps[1], DescendStep)
+            and isinstance(steps[2], FilterStep)
+            and len(steps[2].predicate.clauses) == 1):
+        clause = steps[2].predicate.clauses[0]
+        for i, (path, op, literal) in enumerate(clause):
+            if path == ('openapi_type',) and op == '==' \
+                    and isinstance(literal, str):
+                rest = clause[:i] + clause[i + 1:]
+                new_steps = [TypeIndexStep(literal)]
+                if rest:
+                    new_steps.append(SelectStep(Predicate([rest])))
+                steps = new_steps + steps[3:]
+                break
+    return steps
+
+
+@functools.lru_cache(maxsize=256)
+def compile_query(expr):
+    """
+    Compile a query expression into an executable (and reusable) plan.
+
+    Compiled plans are cached by expression.
+
+    Args:
+        expr (str): the query expression
+
+    Returns:
+        CompiledQuery: a callable plan; ``plan(doc)`` yields matching entities.
+
+    Raises:
+        ValueError: if the query expression is invalid.
+    """
+    return CompiledQuery(expr, _optimize(_parse_steps(expr)))
+
+
+# EOF
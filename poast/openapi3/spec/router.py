@@ -0,0 +1,240 @@
+"""
+Match requests (HTTP method and URL) to the operations of an OpenApi 3.0
+document.
+
+The paths of the document are compiled once into a trie of path segments,
+so matching takes time proportional to the number of segments in the
+request path, not the number of paths in the document; e.g.::
+
+    >>> match = doc.router().match('GET', 'https://api.example.com/v1/pets/7')
+    >>> match.operation['operationId'], match.path_params
+    ('showPetById', {'petId': '7'})
+
+Path templates are normalized as by ``PathsObject._get_validation_path_key``
+(i.e. parameter names are ignored), and static segments take precedence
+over templated ones: ``/pets/mine`` is matched before ``/pets/{petId}``.
+Segments which mix text and parameters (e.g. ``/report.{format}``) take
+precedence over whole-segment parameters.
+
+The base paths of the document's ``servers`` (with server variables
+matching any segment) are stripped from request paths before matching.
+"""
+
+import re
+import string
+from urllib.parse import unquote, urlsplit
+
+_VERBS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+
+class RouteMatch:
+    """
+    The result of matching a request to an operation.
+
+    Attributes:
+        operation (OperationObject): the matched operation
+        path_item (PathItemObject): the path item the operation belongs to
+        path (str): the path template, as it appears in the document
+        method (str): the (lower case) HTTP method
+        path_params (dict): the (percent-decoded) path parameter values, by
+            parameter name
+    """
+
+    __slots__ = ('operation', 'path_item', 'path', 'method', 'path_params')
+
+    def __init__(self, operation, path_item, path, method, path_params):
+        self.operation = operation
+        self.path_item = path_item
+        self.path = path
+        self.method = method
+        self.path_params = path_params
+
+    def __repr__(self):
+        return (f'RouteMatch({self.method.upper()} {self.path!r}, '
+                f'{self.path_params!r})')
+
+
+class _Node:
+    """
+    Node of the path segment trie.
+
+    Attributes:
+        static (dict): child nodes, by (static) segment text
+        patterns (dict): ``(regex, child node)``, by normalized segment, for
+            segments which mix text and parameters
+        param (_Node): child node for a whole-segment parameter
+        route (tuple): ``(path, path_item, param_names)``, for nodes at the
+            end of a path
+    """
+
+    __slots__ = ('static', 'patterns', 'param', 'route')
+
+    def __init__(self):
+        self.static = {}
+        self.patterns = {}
+        self.param = None
+        self.route = None
+
+
+def _split(path):
+    """
+    Return the segments of a path (ignoring leading and trailing slashes).
+    """
+    path = path.strip('/')
+    return path.split('/') if path else []
+
+
+def _parse_segment(segment):
+    """
+    Return ``(kind, key, names)`` for a path template segment, where kind is
+    one of ``static``, ``param`` or ``pattern``.
+    """
+    parts = list(string.Formatter().parse(segment))
+    names = [name for _, name, _, _ in parts if name]
+    if not names:
+        return 'static', segment, names
+    if len(parts) == 1 and not parts[0][0]:
+        return 'param', None, names
+
+    regex = ''.join(
+        re.escape(text) + ('(.+?)' if name else '')
+        for text, name, _, _ in parts)
+    return 'pattern', regex, names
+
+
+def _match(node, segments, i, values):
+    """
+    Return ``(route, values)`` for the first route matching ``segments[i:]``
+    under ``node`` (or ``None``), trying static segments first.
+    """
+    if i == len(segments):
+        if node.route is None:
+            return None
+        return node.route, values
+
+    segment = segments[i]
+    child = node.static.get(segment)
+    if child is not None:
+        found = _match(child, segments, i + 1, values)
+        if found is not None:
+            return found
+
+    for regex, child in node.patterns.values():
+        m = regex.fullmatch(segment)
+        if m is not None:
+            found = _match(child, segments, i + 1, values + m.groups())
+            if found is not None:
+                return found
+
+    if node.param is not None and segment:
+        return _match(node.param, segments, i + 1, values + (segment,))
+    return None
+
+
+class Router:
+    """
+    Compiled matcher of requests to operations.
+
+    .. seealso:: :meth:`OpenApiObject.router`
+
+    Args:
+        paths (PathsObject): the document's paths
+        servers (OpenApiList): optional ``ServerObject`` list, whose base
+            paths are stripped from request paths
+    """
+
+    __slots__ = ('_root', '_bases')
+
+    def __init__(self, paths, servers=None):
+        self._root = _Node()
+        for uri_path in paths or ():
+            self._add(str(uri_path), paths[uri_path].target())
+
+        # Server base paths (longest first), as segment lists (where None
+        # matches any segment):
+        bases = set()
+        for server in servers or ():
+            url = server['url']
+            if url is None:
+                continue
+            bases.add(tuple(
+                None if _parse_segment(s)[0] != 'static' else unquote(s)
+                for s in _split(urlsplit(str(url)).path)))
+        self._bases = sorted(bases, key=len, reverse=True)
+        if () not in bases:
+            # NOTE: request paths without a server base path still match:
+            self._bases.append(())
+
+    def _add(self, uri_path, path_item):
+        """
+        Add a path (template) to the trie.
+        """
+        node = self._root
+        names = []
+        for segment in _split(uri_path):
+            kind, key, seg_names = _parse_segment(segment)
+            names.extend(seg_names)
+            if kind == 'static':
+                child = node.static.get(key)
+                if child is None:
+                    child = node.static[key] = _Node()
+            elif kind == 'param':
+                child = node.param
+                if child is None:
+                    child = node.param = _Node()
+            else:
+                entry = node.patterns.get(key)
+                if entry is None:
+                    entry = node.patterns[key] = (re.compile(key), _Node())
+                child = entry[1]
+            node = child
+
+        # NOTE: if two paths have the same normalized form (which is invalid)
+        #       the first one wins:
+        if node.route is None:
+            node.route = (uri_path, path_item, tuple(names))
+        return
+
+    def match_path(self, path):
+        """
+        Match a request path (or URL) to a path of the document.
+
+        Returns:
+            tuple: ``(path, path_item, path_params)``, or ``None``
+        """
+        segments = [unquote(s) for s in _split(urlsplit(path).path)]
+        for base in self._bases:
+            if len(base) > len(segments) or any(
+                    b is not None and b != s
+                    for b, s in zip(base, segments)):
+                continue
+
+            found = _match(self._root, segments, len(base), ())
+            if found is not None:
+                (uri_path, path_item, names), values = found
+                return uri_path, path_item, dict(zip(names, values))
+        return None
+
+    def match(self, method, url):
+        """
+        Match a request to an operation.
+
+        Args:
+            method (str): the HTTP method
+            url (str): the request URL, or path (any query string is
+                ignored)
+
+        Returns:
+            RouteMatch: the match, or ``None`` if no path matches, or the
+            matched path has no operation for ``method``.
+        """
+        found = self.match_path(url)
+        if found is None:
+            return None
+
+        uri_path, path_item, path_params = found
+        method = method.lower()
+        operation = path_item[method] if method in _VERBS else None
+        if operation is None:
+            return None
+        return RouteMatch(operation, path_item, uri_path, method, path_params)
@@ -2,7 +2,9 @@
 poast misc utilities.
 """
 
+import functools
 import os
+import re
 import yaml
 from urllib.parse import urlparse
 from urllib.request import urlopen
@@ -34,3 +36,92 @@ def load_yaml(y_src):
 
     # Otherwise, assume a stream:
     return yaml.safe_load(f)
+
+
+#: Python equivalents of ECMA 262 unicode property escapes (``\p{...}``), as
+#: ``(inside a character class, outside of one)``. NOTE: these are
+#: approximations (e.g. ``\d`` for all numbers):
+_UNICODE_PROPERTIES = {
+    'L': (None, r'[^\W\d_]'),
+    'Letter': (None, r'[^\W\d_]'),
+    'N': (r'\d', r'\d'),
+    'Nd': (r'\d', r'\d'),
+    'Number': (r'\d', r'\d'),
+    'Decimal_Number': (r'\d', r'\d'),
+}
+
+_NEGATED_UNICODE_PROPERTIES = {
+    'L': (None, r'[\W\d_]'),
+    'Letter': (None, r'[\W\d_]'),
+    'N': (r'\D', r'\D'),
+    'Nd': (r'\D', r'\D'),
+    'Number': (r'\D', r'\D'),
+    'Decimal_Number': (r'\D', r'\D'),
+}
+
+_ECMA_TOKEN = re.compile(
+    r'\\([pP])\{([^}]*)\}'        # unicode property escape
+    r'|\\k<(\w+)>'                # named back reference
+    r'|\\u\{([0-9A-Fa-f]+)\}'     # code point escape
+    r'|\\c([A-Za-z])'             # control character escape
+    r'|(\(\?<)(?![=!])'           # named group
+    r'|(\[\^?\])'                 # empty (or negated empty) class
+    r'|\\.|.', re.DOTALL)
+
+
+def ecma_to_python(pattern):
+    """
+    Translate an ECMA 262 regular expression (as used by OpenAPI schema
+    ``pattern`` fields) into python :mod:`re` syntax.
+
+    Raises:
+        ValueError: if the pattern uses ECMA 262 syntax which has no python
+            equivalent (e.g. most unicode property escapes)
+    """
+    parts = []
+    in_class = False
+    for m in _ECMA_TOKEN.finditer(pattern):
+        prop_kind, prop, ref, code_point, control, group, empty = m.groups()
+        token = m.group()
+        if prop is not None:
+            table = _UNICODE_PROPERTIES if prop_kind == 'p' \
+                else _NEGATED_UNICODE_PROPERTIES
+            token = table.get(prop, (None, None))[0 if in_class else 1]
+            if token is None:
+                raise ValueError(
+                    f'unsupported unicode property escape "{m.group()}"')
+        elif ref is not None:
+            token = f'(?P={ref})'
+        elif code_point is not None:
+            token = f'\\U{int(code_point, 16):08x}'
+        elif control is not None:
+            token = f'\\x{ord(control) % 32:02x}'
+        elif group is not None and not in_class:
+            token = '(?P<'
+        elif empty is not None and not in_class:
+            token = r'(?!)' if empty == '[]' else r'[\s\S]'
+        elif token == '[' and not in_class:
+            in_class = True
+            # NOTE: a leading "]" (or "^]") is literal in python, but closes
+            #       the class in ECMA 262:
+            rest = pattern[m.end():m.end() + 2]
+            if rest.startswith(']') or rest.startswith('^]'):
+                raise ValueError(f'unsupported character class in {pattern!r}')
+        elif token == ']' and in_class:
+            in_class = False
+        parts.append(token)
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_pattern(pattern):
+    """
+    Compile an ECMA 262 regular expression (see :func:`ecma_to_python`).
+
+    Raises:
+        ValueError: if the pattern is invalid, or can't be translated
+    """
+    try:
+        return re.compile(ecma_to_python(pattern))
+    except re.error as e:
+        raise ValueError(f'invalid pattern {pattern!r}: {e}') from None
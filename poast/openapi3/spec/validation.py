@@ -1,11 +1,26 @@
 """
 This module defines validation funcdtions used by the document spec.
+
+Validation rules are declared as data, per document object class, e.g.::
+
+    class LicenseObject(OpenApiBaseObject):
+        _validation_rules = (
+            required('name'),
+            is_url('url'),
+        )
+
+For backwards compatibility, rules may also be used as decorators on
+``_validate`` (or any other method).
 """
 
-import validators
+import functools
 import json
+import re
+import validators
 
+from .util import ecma_to_python
 from .model.exceptions import (
+    MalformedDocumentException,
     InvalidFieldValueException,
     MissingRequiredFieldException,
 )
@@ -20,67 +35,388 @@ def require(doc_obj, field_name):
 def require_value(doc_obj, field_name, required_val):
     field_val = doc_obj[field_name]
     if field_val and field_val != required_val:
+        if hasattr(field_val, 'value'):
+            field_val = field_val.value()
         raise InvalidFieldValueException(
             doc_obj, field_name,
-            f'expected: {json.dumps(required_val)}; got: {json.dumps(doc_obj[field_name])}')
+            f'expected: {json.dumps(required_val)}; '
+            f'got: {json.dumps(field_val)}',
+            rule='require_value')
     return
 
 
-def required(field_name):
+class ValidationRule:
     """
-    Decorator used to require that a given field is present.
+    Base class for declarative, per-field validation rules.
+
+    Document object classes list their rules in ``_validation_rules``; the
+    rules for each class are compiled into a single check function (see
+    :mod:`poast.openapi3.spec.model.plan`). Rules may also be used as method
+    decorators, in which case the check runs before the decorated method.
+
+    Attributes:
+        name (str): the rule name (reported in violations)
+        field_name (str): the name of the field the rule applies to
     """
-    def _wrap_func(func):
-        def _wrap_self(self):
-            require(self, field_name)
-            return func(self)
+    name = None
+
+    def __init__(self, field_name):
+        self.field_name = field_name
+
+    def check(self, doc_obj):
+        """
+        Check ``doc_obj`` against this rule.
+
+        Raises:
+            MalformedDocumentException: if the rule is violated
+        """
+        raise NotImplementedError()
+
+    def compile(self, var, const):
+        """
+        Return python source lines which check the field value held in the
+        local variable ``var`` (the object is ``obj``, and violations are
+        passed to ``report``).
+
+        Args:
+            var (str): name of the local variable holding the field value
+            const (func): ``const(value)`` returns the name of a global
+                bound to ``value`` in the compiled function.
+
+        Returns:
+            list: lines of python source
+        """
+        raise NotImplementedError()
+
+    def __call__(self, func):
+        """
+        Use this rule as a decorator.
+        """
+        check = self.check
+
+        def _wrap_self(doc_obj):
+            check(doc_obj)
+            return func(doc_obj)
+        _wrap_self._poast_rule = self
+        _wrap_self._poast_wrapped = func
         return _wrap_self
-    return _wrap_func
+
+    def __repr__(self):
+        return f'{self.name}({self.field_name!r})'
+
+
+class Required(ValidationRule):
+    """
+    Require that a given field is present.
+    """
+    name = 'required'
+
+    def check(self, doc_obj):
+        require(doc_obj, self.field_name)
+
+    def compile(self, var, const):
+        return [
+            f'if {var} is None:',
+            f'    report({const(MissingRequiredFieldException)}'
+            f'(obj, {self.field_name!r}))',
+        ]
+
+
+class InRange(ValidationRule):
+    """
+    Require that a field, if present, has a value from a set range.
+    """
+    name = 'in_range'
+
+    def __init__(self, field_name, valid):
+        super().__init__(field_name)
+        self.valid = valid
+        self.message = f'{field_name} must be one of {valid}'
+
+    def check(self, doc_obj):
+        field_val = doc_obj[self.field_name]
+        if field_val is not None and field_val not in self.valid:
+            raise InvalidFieldValueException(
+                doc_obj, self.field_name, self.message, rule=self.name)
+
+    def compile(self, var, const):
+        return [
+            f'if {var} is not None and {var} not in '
+            f'{const(frozenset(self.valid))}:',
+            f'    report({const(InvalidFieldValueException)}'
+            f'(obj, {self.field_name!r}, {const(self.message)}, '
+            f'rule={self.name!r}))',
+        ]
+
+    def __repr__(self):
+        return f'{self.name}({self.field_name!r}, {self.valid!r})'
+
+
+class FormatCheckers:
+    """
+    Registry of string format checks (e.g. ``url``, ``email``), each fronted
+    by a bounded memoization layer. Documents tend to repeat the same URLs
+    and email addresses many times; each distinct value is checked once.
+
+    Checks can be swapped at runtime (e.g. for faster implementations), via
+    :meth:`register`; compiled validation plans pick up the change.
+
+    Attributes:
+        maxsize (int): maximum number of memoized results, per format
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._checks = {}
+        self._raw = {}
+
+    def register(self, format_name, check, memoize=True):
+        """
+        Register (or replace) the check for a given format.
+
+        Args:
+            format_name (str): the format name, e.g. ``url``
+            check (func): ``check(str) -> bool``
+            memoize (bool): if ``True``, memoize the results of ``check``
+        """
+        self._raw[format_name] = check
+        if memoize:
+            check = functools.lru_cache(maxsize=self.maxsize)(check)
+        self._checks[format_name] = check
+        return
+
+    def check(self, format_name, value):
+        """
+        Return ``True`` if the string ``value`` is a valid ``format_name``.
+
+        Raises:
+            KeyError: if no check is registered for ``format_name``
+        """
+        return self._checks[format_name](value)
+
+    def __contains__(self, format_name):
+        return format_name in self._checks
+
+    def __iter__(self):
+        return iter(self._checks)
+
+    def cache_info(self, format_name):
+        """
+        Return memoization statistics for a format (or ``None``).
+        """
+        check = self._checks[format_name]
+        if hasattr(check, 'cache_info'):
+            return check.cache_info()
+        return None
+
+    def cache_clear(self):
+        for check in self._checks.values():
+            if hasattr(check, 'cache_clear'):
+                check.cache_clear()
+
+
+def _check_url(test_url):
+    # HACK HACK HACK for valid URL's:
+    if test_url.startswith('/'):
+        test_url = f'http://fake-host.net{test_url}'
+    return bool(validators.url(test_url))
+
+
+def _check_email(test_email):
+    return bool(validators.email(test_email))
+
+
+_URI_REFERENCE = re.compile(
+    r"^(?:[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=]|%[0-9A-Fa-f]{2})*$")
+
+
+def _check_uri_reference(test_uri):
+    return _URI_REFERENCE.match(test_uri) is not None
+
+
+def _check_regex(test_regex):
+    # Patterns are ECMA 262 regular expressions: those using syntax which
+    # python can't express (e.g. most \p{...} escapes) can't be checked, so
+    # they are accepted:
+    try:
+        test_regex = ecma_to_python(test_regex)
+    except ValueError:
+        return True
+    try:
+        re.compile(test_regex)
+    except re.error:
+        return False
+    return True
+
+
+#: The default format check registry:
+format_checkers = FormatCheckers()
+format_checkers.register('url', _check_url)
+format_checkers.register('email', _check_email)
+format_checkers.register('uri-reference', _check_uri_reference)
+format_checkers.register('regex', _check_regex)
+
+
+def register_format(format_name, check, memoize=True):
+    """
+    Register (or replace) a format check in the default registry.
+
+    Example::
+
+        >>> register_format('url', my_fast_url_check)
+
+    .. seealso:: :class:`FormatCheckers`
+    """
+    format_checkers.register(format_name, check, memoize)
+
+
+def check_format(format_name, value):
+    """
+    Return ``True`` if the string ``value`` is a valid ``format_name``,
+    according to the default registry.
+    """
+    return format_checkers.check(format_name, value)
+
+
+class IsFormat(ValidationRule):
+    """
+    Require that a field, if present, is a string of a given format.
+
+    Format checks are looked up in :data:`format_checkers` at check time.
+    """
+
+    def __init__(self, field_name, format_name, message=None):
+        super().__init__(field_name)
+        self.format_name = format_name
+        if self.name is None:
+            self.name = 'is_' + format_name.replace('-', '_')
+        if message is None:
+            message = f'string value must be a valid {format_name}'
+        self.message = message
+
+    def check(self, doc_obj):
+        field_val = doc_obj[self.field_name]
+        if field_val is not None and \
+                not format_checkers.check(self.format_name, str(field_val)):
+            raise InvalidFieldValueException(
+                doc_obj, self.field_name, self.message, rule=self.name)
+
+    def compile(self, var, const):
+        # NOTE: look the check up on each call, so it can be swapped:
+        checks = const(format_checkers._checks)
+        return [
+            f'if {var} is not None and not '
+            f'{checks}[{self.format_name!r}](str({var})):',
+            f'    report({const(InvalidFieldValueException)}'
+            f'(obj, {self.field_name!r}, {const(self.message)}, '
+            f'rule={self.name!r}))',
+        ]
+
+    def __repr__(self):
+        return f'is_format({self.field_name!r}, {self.format_name!r})'
+
+
+class IsUrl(IsFormat):
+    """
+    Require that a given field is a url, if present.
+    """
+    name = 'is_url'
+
+    def __init__(self, field_name):
+        super().__init__(
+            field_name, 'url', 'string value must be a valid url')
+
+    def __repr__(self):
+        return ValidationRule.__repr__(self)
+
+
+class IsEmail(IsFormat):
+    """
+    Require that a given field is a email, if present.
+    """
+    name = 'is_email'
+
+    def __init__(self, field_name):
+        super().__init__(
+            field_name, 'email', 'string value must be a valid email')
+
+    def __repr__(self):
+        return ValidationRule.__repr__(self)
+
+
+class Check(ValidationRule):
+    """
+    A named check which spans several fields (or child objects), implemented
+    by a method of the document object class, e.g.::
+
+        class PathsObject(OpenApiMap):
+            _validation_rules = (
+                check('path_conflict', '_check_path_conflicts'),
+            )
+
+    The method raises :class:`MalformedDocumentException` on failure.
+    """
+
+    def __init__(self, name, method_name):
+        super().__init__(None)
+        self.name = name
+        self.method_name = method_name
+
+    def check(self, doc_obj):
+        getattr(doc_obj, self.method_name)()
+
+    def compile(self, var, const):
+        return [
+            'try:',
+            f'    obj.{self.method_name}()',
+            f'except {const(MalformedDocumentException)} as e:',
+            '    report(e)',
+        ]
+
+    def __repr__(self):
+        return f'check({self.name!r}, {self.method_name!r})'
+
+
+def required(field_name):
+    """
+    Rule (or decorator) used to require that a given field is present.
+    """
+    return Required(field_name)
 
 
 def in_range(field_name, valid):
     """
-    Decorator used to ensure that a field has a value from a set range.
+    Rule (or decorator) used to ensure that a field has a value from a set
+    range.
     """
-    def _wrap_func(func):
-        def _wrap_self(self):
-            if self[field_name] is not None and self[field_name] not in valid:
-                raise InvalidFieldValueException(
-                    self, field_name, f'{field_name} must be one of {valid}')
-            return func(self)
-        return _wrap_self
-    return _wrap_func
+    return InRange(field_name, valid)
 
 
 def is_url(field_name):
     """
     Require that a given field is a url, if present.
     """
-    def _wrap_func(func):
-        def _wrap_self(self):
-            if self[field_name] is not None:
-                test_url = str(self[field_name])
-                # HACK HACK HACK for valid URL's:
-                if test_url.startswith('/'):
-                    test_url = f'http://fake-host.net{test_url}'
-                if not validators.url(test_url):
-                    raise InvalidFieldValueException(
-                        self, field_name, 'string value must be a valid url')
-            return func(self)
-        return _wrap_self
-    return _wrap_func
+    return IsUrl(field_name)
 
 
 def is_email(field_name):
     """
     Require that a given field is a email, if present.
     """
-    def _wrap_func(func):
-        def _wrap_self(self):
-            if self[field_name] is not None and not validators.email(
-                    str(self[field_name])):
-                raise InvalidFieldValueException(
-                    self, field_name, 'string value must be a valid email')
-            return func(self)
-        return _wrap_self
-    return _wrap_func
+    return IsEmail(field_name)
+
+
+def is_format(field_name, format_name, message=None):
+    """
+    Require that a given field is a string of the given format, if present.
+
+    .. seealso:: :data:`format_checkers`
+    """
+    return IsFormat(field_name, format_name, message)
+
+
+def check(name, method_name):
+    """
+    Run the named, object-level check implemented by ``method_name``.
+    """
+    return Check(name, method_name)
@@ -35,9 +35,13 @@ setup(
     entry_points={
         'console_scripts': [
             'poast-validate=poast.openapi3.cli:main',
+            'poast-gen=poast.openapi3.cli:gen_main',
         ],
     },
     install_requires=requirements,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     license="Apache Software License 2.0",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
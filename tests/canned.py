@@ -0,0 +1,30 @@
+"""Canned HTTP responses for client tests."""
+import json
+import requests
+
+
+class CannedAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter returning a fixed response."""
+
+    def __init__(self, status_code, body, content_type='application/json'):
+        super().__init__()
+        self.status_code = status_code
+        self.body = body
+        self.content_type = content_type
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers['Content-Type'] = self.content_type
+        response._content = json.dumps(self.body).encode()
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def canned_client(client_cls, config, *args):
+    session = requests.Session()
+    session.mount('http://', CannedAdapter(*args))
+    return client_cls('http://localhost', config, session)
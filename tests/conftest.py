@@ -0,0 +1,11 @@
+import pytest
+from poast.openapi3.client import gen_client_cls
+from poast.openapi3.spec import OpenApiObject
+
+from .specs import petstore
+
+
+@pytest.fixture
+def petstore_cls():
+    return gen_client_cls('PetStore', OpenApiObject(petstore(),
+                                                    resolve_refs=True))
@@ -0,0 +1,134 @@
+"""Sample OpenAPI documents shared by the unit tests."""
+
+import copy
+
+
+_PETSTORE = {
+    'openapi': '3.0.3',
+    'info': {
+        'title': 'Petstore',
+        'version': '1.0.0',
+        'license': {
+            'name': 'MIT',
+            'url': 'https://opensource.org/licenses/MIT',
+        },
+    },
+    'servers': [{'url': 'https://petstore.example.com/api/v1'}],
+    'paths': {
+        '/pets': {
+            'get': {
+                'operationId': 'listPets',
+                'tags': ['pets'],
+                'parameters': [
+                    {'name': 'limit', 'in': 'query',
+                     'schema': {'type': 'integer', 'format': 'int32'}},
+                    {'name': 'X-Request-Id', 'in': 'header',
+                     'schema': {'type': 'string'}},
+                ],
+                'responses': {
+                    '200': {
+                        'description': 'A list of pets',
+                        'content': {
+                            'application/json': {
+                                'schema': {
+                                    'type': 'array',
+                                    'items': {
+                                        '$ref': '#/components/schemas/Pet',
+                                    },
+                                },
+                            },
+                        },
+                    },
+                    'default': {
+                        'description': 'Unexpected error',
+                        'content': {
+                            'application/json': {
+                                'schema': {
+                                    '$ref': '#/components/schemas/Error',
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+            'post': {
+                'operationId': 'createPet',
+                'tags': ['pets'],
+                'requestBody': {
+                    'required': True,
+                    'content': {
+                        'application/json': {
+                            'schema': {'$ref': '#/components/schemas/Pet'},
+                        },
+                    },
+                },
+                'responses': {
+                    '201': {'description': 'Created'},
+                },
+            },
+        },
+        '/pets/{petId}': {
+            'get': {
+                'operationId': 'showPetById',
+                'tags': ['pets'],
+                'parameters': [
+                    {'$ref': '#/components/parameters/PetId'},
+                ],
+                'responses': {
+                    '200': {
+                        'description': 'A pet',
+                        'content': {
+                            'application/json': {
+                                'schema': {'$ref': '#/components/schemas/Pet'},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        '/store/inventory': {
+            'get': {
+                'operationId': 'getInventory',
+                'tags': ['store'],
+                'responses': {
+                    '200': {'description': 'Inventory counts'},
+                },
+            },
+        },
+    },
+    'components': {
+        'parameters': {
+            'PetId': {
+                'name': 'petId', 'in': 'path', 'required': True,
+                'schema': {'type': 'string'},
+            },
+        },
+        'schemas': {
+            'Pet': {
+                'type': 'object',
+                'required': ['id', 'name'],
+                'properties': {
+                    'id': {'type': 'integer', 'format': 'int64'},
+                    'name': {'type': 'string', 'minLength': 1},
+                    'tag': {'type': 'string', 'nullable': True},
+                    'weight': {'type': 'number', 'minimum': 0},
+                },
+            },
+            'Error': {
+                'type': 'object',
+                'required': ['code', 'message'],
+                'properties': {
+                    'code': {'type': 'integer', 'format': 'int32'},
+                    'message': {'type': 'string'},
+                },
+            },
+        },
+    },
+}
+
+
+def petstore():
+    """
+    Return a fresh copy of the sample petstore document.
+    """
+    return copy.deepcopy(_PETSTORE)
@@ -0,0 +1,102 @@
+import enum
+
+import pytest
+from poast.openapi3.spec import OpenApiObject
+
+from .specs import petstore
+
+np = pytest.importorskip('numpy')
+
+
+def _schema(**props):
+    spec = petstore()
+    pet = spec['components']['schemas']['Pet']
+    pet['properties'].update(props)
+    pet['additionalProperties'] = False
+    doc = OpenApiObject(spec, resolve_refs=True)
+    return doc.schemas['Pet']
+
+
+def test_validate_batch():
+    schema = _schema(
+        count={'type': 'integer', 'format': 'int32', 'multipleOf': 2},
+        kind={'type': 'string', 'enum': ['cat', 'dog'], 'maxLength': 3},
+        tags={'type': 'array', 'items': {'type': 'string'}},
+    )
+    records = [
+        {'id': 1, 'name': 'rex', 'weight': 1.5, 'kind': 'dog'},
+        {'id': 2, 'weight': -1},
+        {'id': 'x', 'name': 'tom', 'tag': None, 'count': 2 ** 40},
+        {'id': 4, 'name': None, 'kind': 'bird', 'tags': ['a', 1]},
+        {'id': 5, 'name': 'a', 'count': 3, 'extra': True},
+        'not an object',
+    ]
+
+    report = schema.validate_batch(records)
+    assert not report.ok
+    assert report.invalid_rows.tolist() == [1, 2, 3, 4, 5]
+    failures = {(f.path, f.rule): f.rows.tolist() for f in report.failures}
+    assert failures == {
+        ('$[*]', 'type'): [5],
+        ('$[*].id', 'type'): [2],
+        ('$[*].name', 'required'): [1],
+        ('$[*].name', 'nullable'): [3],
+        ('$[*].weight', 'minimum'): [1],
+        ('$[*].count', 'multipleOf'): [4],
+        ('$[*].count', 'format'): [2],
+        ('$[*].kind', 'enum'): [3],
+        ('$[*].kind', 'maxLength'): [3],
+        ('$[*].tags[1]', 'type'): [3],
+        ('$[*]', 'additionalProperties'): [4],
+    }
+
+    errors = sorted(e.path for e in report.errors())
+    assert '$[3].tags[1]' in errors and '$[1].name' in errors
+
+
+def test_validate_batch_matches_records():
+    schema = _schema(score={'type': 'number', 'maximum': 10,
+                            'exclusiveMaximum': True})
+    records = [{'id': i, 'name': str(i), 'score': i % 12}
+               for i in range(1000)]
+
+    report = schema.validate_batch(records)
+    validate = schema.compile_validator()
+    invalid = []
+    for i, record in enumerate(records):
+        try:
+            validate(record)
+        except ValueError:
+            invalid.append(i)
+    assert report.invalid_rows.tolist() == invalid
+    assert schema.validate_batch(records[:10]).ok
+
+
+class _Size(enum.IntEnum):
+    SMALL = 1
+    LARGE = 2
+
+
+def test_validate_batch_matches_validator():
+    schema = _schema(
+        size={'type': 'integer', 'enum': [1, 2]},
+        score={'type': 'number', 'multipleOf': 0.1},
+        label={'type': 'string', 'maxLength': 3},
+    )
+    records = [
+        {'id': _Size.SMALL, 'name': 'x', 'size': _Size.LARGE},
+        {'id': 1, 'name': 'x', 'score': 0.3},
+        {'id': 2, 'name': 'x', 'score': 0.7, 'label': enum.Enum},
+        {'id': True, 'name': 'x', 'score': 0.35},
+        {'id': 3, 'name': 'x', 'size': 3, 'score': _Size.LARGE},
+    ]
+
+    report = schema.validate_batch(records)
+    validate = schema.compile_validator()
+    invalid = []
+    for i, record in enumerate(records):
+        try:
+            validate(record)
+        except ValueError:
+            invalid.append(i)
+    assert report.invalid_rows.tolist() == invalid == [2, 3, 4]
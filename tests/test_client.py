@@ -0,0 +1,326 @@
+import pytest
+import requests
+from poast.openapi3.client import ClientCache, ClientConfig, gen_client_cls
+from poast.openapi3.client.genop import _get_op_docs
+from poast.openapi3.client import respval
+from poast.openapi3.client.respval import (
+    select_json_schema,
+    select_media_type,
+    select_response,
+)
+from poast.openapi3.spec import OpenApiObject, PayloadValidationException
+from poast.openapi3.spec.payload import compile_validator
+
+from .canned import canned_client
+from .specs import petstore
+
+
+def test_client_prepare_request(petstore_cls):
+    client = petstore_cls('http://localhost/v1/')
+    pr = client.op.showPetById(petId=7)
+    assert (pr.method, pr.url) == ('GET', 'http://localhost/v1/pets/7')
+    assert pr.execute.request is pr
+
+
+def test_client_validate_requests(petstore_cls):
+    client = petstore_cls('http://localhost')
+    client.op.createPet(json={'name': 'rex'})
+
+    client = petstore_cls(
+        'http://localhost', ClientConfig(validate_requests=True))
+    pr = client.op.createPet(json={'id': 1, 'name': 'rex'})
+    assert pr.body == b'{"id": 1, "name": "rex"}'
+
+    with pytest.raises(PayloadValidationException) as e:
+        client.op.createPet(json={'name': 'rex'})
+    assert e.value.path == '$.id'
+
+
+def test_client_validate_requests_uncompilable(caplog):
+    spec = petstore()
+    spec['components']['schemas']['Pet']['properties']['name'][
+        'pattern'] = r'^\p{Lu}'
+    doc = OpenApiObject(spec, resolve_refs=True)
+    assert not doc.validate(collect=True)
+    cls = gen_client_cls('PetStore', doc)
+    client = cls('http://localhost', ClientConfig(validate_requests=True))
+    for _ in range(2):
+        pr = client.op.createPet(json={'name': 'rex'})
+        assert pr.body == b'{"name": "rex"}'
+    assert caplog.text.count('createPet: cannot validate requests') == 1
+
+
+def test_select_response():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    responses = doc['paths']['/pets']['get']['responses']
+    assert select_response(responses, 200) is responses['200']
+    assert select_response(responses, 500) is responses['default']
+    assert select_response(doc['paths']['/pets']['post']['responses'],
+                           500) is None
+
+    content = responses['200']['content']
+    assert select_media_type(content, 'application/json; charset=utf-8') == \
+        ('application/json', content['application/json'])
+    assert select_media_type(content, 'text/plain') == (None, None)
+
+
+def test_select_response_ranges():
+    spec = petstore()
+    get = spec['paths']['/pets']['get']
+    get['responses'].update({
+        '404': {'description': 'Not found'},
+        '4XX': {'description': 'Client error'},
+        '5xx': {'description': 'Server error'},
+    })
+    doc = OpenApiObject(spec, resolve_refs=True)
+    responses = doc['paths']['/pets']['get']['responses']
+    assert select_response(responses, 404) is responses['404']
+    assert select_response(responses, 400) is responses['4XX']
+    assert select_response(responses, 503) is responses['5xx']
+    assert select_response(responses, 302) is responses['default']
+
+
+def test_select_json_schema():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    op_obj = doc.operations['showPetById']
+
+    def _response(status_code, content_type):
+        response = requests.Response()
+        response.status_code = status_code
+        if content_type is not None:
+            response.headers['Content-Type'] = content_type
+        return response
+
+    schema = select_json_schema(op_obj, _response(200, 'application/json'))
+    assert schema.target() is doc.schemas['Pet']
+
+    # Contract violations:
+    with pytest.raises(PayloadValidationException) as e:
+        select_json_schema(doc.operations['createPet'],
+                           _response(500, 'application/json'))
+    assert e.value.rule == 'status'
+    with pytest.raises(PayloadValidationException) as e:
+        select_json_schema(op_obj, _response(200, 'text/plain'))
+    assert e.value.rule == 'media_type'
+
+    # Nothing to validate:
+    op_obj = doc.operations['createPet']
+    with pytest.raises(ValueError) as e:
+        select_json_schema(op_obj, _response(201, None))
+    assert not isinstance(e.value, PayloadValidationException)
+
+
+def test_client_validate_responses(petstore_cls):
+    config = ClientConfig(validate_responses=1.0, raise_response_errors=True)
+    client = canned_client(petstore_cls, config, 200, {'id': 1})
+    with pytest.raises(PayloadValidationException) as e:
+        client.op.showPetById(petId=1).execute()
+    assert e.value.path == '$.name'
+
+    client = canned_client(
+        petstore_cls, config, 200, {'id': 1, 'name': 'rex'})
+    assert client.op.showPetById(petId=1).execute().json()['name'] == 'rex'
+
+    stats = client.op.showPetById.response_validator.stats()
+    assert stats == {'requests': 2, 'sampled': 2, 'validated': 1,
+                     'failures': 1, 'skipped': 0}
+
+
+def test_client_validate_responses_sampled(petstore_cls, caplog):
+    config = ClientConfig(validate_responses=0.5)
+    client = canned_client(petstore_cls, config, 200, [{'id': 'x'}])
+    validator = client.op.listPets.response_validator
+    validator._random = iter([0.1, 0.9, 0.3, 0.7]).__next__
+
+    for _ in range(4):
+        client.op.listPets().execute()
+
+    assert validator.stats() == {'requests': 4, 'sampled': 2, 'validated': 0,
+                                 'failures': 2, 'skipped': 0}
+    assert 'listPets: response does not match' in caplog.text
+
+
+def test_client_validate_responses_uncompilable(caplog, monkeypatch):
+    spec = petstore()
+    spec['components']['schemas']['Pet']['type'] = 'pet'
+    cls = gen_client_cls('PetStore', OpenApiObject(spec, resolve_refs=True))
+    config = ClientConfig(validate_responses=1.0, raise_response_errors=True)
+    client = canned_client(cls, config, 200, {'id': 1})
+    calls = []
+    monkeypatch.setattr(respval, 'compile_validator',
+                        lambda s: calls.append(s) or compile_validator(s))
+
+    for _ in range(2):
+        assert client.op.showPetById(petId=1).execute().json() == {'id': 1}
+    assert len(calls) == 1
+    assert client.op.showPetById.response_validator.stats()['skipped'] == 2
+    assert 'showPetById: cannot validate responses' in caplog.text
+
+
+def test_client_lazy_operations(petstore_cls):
+    client = petstore_cls('http://localhost')
+    op_cls = type(client.op)
+    assert 'showPetById' not in vars(op_cls)
+    assert 'showPetById' in dir(client.op)
+    assert 'getInventory' in dir(op_cls)
+
+    pr = client.op.showPetById(petId=7)
+    assert pr.url == 'http://localhost/pets/7'
+    assert 'showPetById' in vars(op_cls)
+    assert 'listPets' not in vars(op_cls)
+    assert client.op.showPetById.__qualname__ == \
+        'PetStoreOperations.showPetById'
+
+    with pytest.raises(AttributeError):
+        client.op.deletePet
+
+
+def test_client_lazy_docs(petstore_cls):
+    op = type(petstore_cls('http://localhost').op).showPetById
+    assert op._doc._fn is not None
+    assert op.__doc__ == _get_op_docs(
+        'GET', '/pets/{petId}', op.operation)
+    assert op._doc._fn is None
+
+    assert petstore_cls.__doc__ == 'API client for "Petstore" version: 1.0.0'
+
+
+def test_client_tag_groups():
+    spec = petstore()
+    spec['paths']['/store/inventory']['get']['tags'] = ['store', 'op', 'pets']
+    cls = gen_client_cls('PetStore', OpenApiObject(spec, resolve_refs=True),
+                         group_by_tags=True)
+    assert {'pets', 'store', 'op_'} <= set(vars(cls))
+    assert cls.pets.__doc__ == 'API Operations for PetStore tagged "pets"'
+    assert cls.__dict__['store']._cls is None
+
+    client = cls('http://localhost')
+    assert client.pets is client.pets
+    assert client.pets.showPetById(petId=7).url == 'http://localhost/pets/7'
+    assert sorted(type(client.pets)._operations) == [
+        'createPet', 'getInventory', 'listPets', 'showPetById']
+    assert dir(client.op_) == dir(client.store)
+    assert cls.__dict__['store']._cls is not None
+    with pytest.raises(AttributeError):
+        client.store.listPets
+
+    # Flat operations are still available, and grouping is optional:
+    assert client.op.getInventory().url == 'http://localhost/store/inventory'
+    assert not hasattr(gen_client_cls('PetStore', OpenApiObject(spec)),
+                       'pets')
+
+
+def test_client_cache():
+    cache = ClientCache(maxsize=2)
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    cls = gen_client_cls('PetStore', doc, cache=cache)
+    assert gen_client_cls('PetStore', OpenApiObject(
+        petstore(), resolve_refs=True), cache=cache) is cls
+    assert gen_client_cls('PetStore', doc) is not cls
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    gen_client_cls('Other', doc, cache=cache)
+    gen_client_cls('Third', doc, cache=cache)
+    assert len(cache) == 2
+    assert gen_client_cls('PetStore', doc, cache=cache) is not cls
+
+
+def test_client_path_encoding(petstore_cls):
+    client = petstore_cls('http://localhost')
+    assert client.op.showPetById(petId='a/b c').url == \
+        'http://localhost/pets/a%2Fb%20c'
+    with pytest.raises(TypeError):
+        client.op.showPetById()
+
+
+def test_client_named_params(petstore_cls):
+    client = petstore_cls('http://localhost')
+    pr = client.op.listPets(limit=5, X_Request_Id='r1', params={'page': 2})
+    assert pr.url == 'http://localhost/pets?limit=5&page=2'
+    assert pr.headers['X-Request-Id'] == 'r1'
+    assert 'X_Request_Id (X-Request-Id):' in client.op.listPets.__doc__
+
+
+class _SlowSession(requests.Session):
+    def prepare_request(self, request):
+        return super().prepare_request(request)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'petId': 'a b'},
+    {'petId': 1, 'params': {'x': [1, 2]}, 'headers': {'Accept': None}},
+    {'petId': 1, 'headers': {'X-Extra': 'e'}, 'cookies': {'c': '3'}},
+])
+def test_client_fast_path(petstore_cls, kwargs):
+    config = ClientConfig(headers={'X-Api-Key': 'k', 'Accept': 'text/json'},
+                          cookies={'a': '1', 'b': '2'})
+    prepared = []
+    for session in (requests.Session(), _SlowSession()):
+        session.headers['User-Agent'] = 'poast-test'
+        session.cookies.set('b', 'session')
+        session.cookies.set('s', 'session')
+        client = petstore_cls('http://localhost', config, session)
+        assert (client._fast_path is None) == isinstance(
+            session, _SlowSession)
+
+        pr = client.op.showPetById(**kwargs)
+        prepared.append((pr.method, pr.url, dict(pr.headers), pr.body))
+
+    fast, slow = prepared
+    assert fast == slow
+    assert fast[2]['X-Api-Key'] == 'k'
+    assert 'b=2' in fast[2]['Cookie']
+
+
+def test_client_fast_path_session_changes(petstore_cls):
+    session = requests.Session()
+    client = petstore_cls('http://Localhost/v1/', session=session)
+    assert client._fast_path is not None
+
+    # Session state changed after the client is created is applied:
+    session.headers['Authorization'] = 'Bearer refreshed'
+    session.auth = ('user', 'pass')
+    session.params = {'trace': '1'}
+    session.hooks['response'].append(print)
+    pr = client.op.showPetById(petId=1)
+    slow = session.prepare_request(requests.Request(
+        'GET', 'http://localhost/v1/pets/1'))
+    assert pr.url == slow.url == 'http://localhost/v1/pets/1?trace=1'
+    assert dict(pr.headers) == dict(slow.headers)
+    assert pr.headers['Authorization'].startswith('Basic ')
+    assert pr.hooks['response'] == [print]
+
+
+class _RedirectAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response._content = b'{}'
+        if request.url.endswith('/pets/1'):
+            response.status_code = 302
+            response.headers['Location'] = '/pets/2'
+        else:
+            response.status_code = 200
+        return response
+
+    def close(self):
+        pass
+
+
+def test_client_fast_path_redirect(petstore_cls):
+    session = requests.Session()
+    session.mount('http://', _RedirectAdapter())
+    client = petstore_cls('http://localhost', session=session)
+    assert client._fast_path is not None
+
+    response = client.op.showPetById(petId=1).execute()
+    assert response.status_code == 200
+    assert response.url == 'http://localhost/pets/2'
+    assert [r.status_code for r in response.history] == [302]
+
+
+def test_client_config_session_cls(petstore_cls):
+    client = petstore_cls(
+        'http://localhost', ClientConfig(session_cls=_SlowSession))
+    assert isinstance(client._session, _SlowSession)
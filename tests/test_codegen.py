@@ -0,0 +1,87 @@
+import importlib.util
+import sys
+
+from poast.openapi3.client.codegen import gen_client_module
+from poast.openapi3.client.opindex import build_op_index
+from poast.openapi3.spec import OpenApiObject
+
+from .canned import canned_client
+from .specs import petstore
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_build_op_index():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    ops = {op['operation_id']: op for op in build_op_index(doc)}
+    assert list(ops) == [
+        'listPets', 'createPet', 'showPetById', 'getInventory']
+    assert ops['showPetById']['params'] == [{
+        'name': 'petId', 'in': 'path', 'attr': 'petId', 'required': True,
+        'style': 'simple', 'explode': False, 'allow_reserved': False,
+    }]
+    limit, request_id = ops['listPets']['params']
+    assert (limit['style'], limit['explode']) == ('form', True)
+    assert (request_id['style'], request_id['explode']) == ('simple', False)
+
+
+def test_gen_client_module(tmp_path):
+    spec = petstore()
+    spec['paths']['/pets/{pet-id}/{from}'] = {
+        'get': {
+            'operationId': 'import',
+            'responses': {'200': {'description': 'ok'}},
+        },
+    }
+    source = gen_client_module('PetStore', OpenApiObject(
+        spec, resolve_refs=True))
+    path = tmp_path / 'petstore_client.py'
+    path.write_text(source)
+
+    module = load_module(path, 'petstore_client')
+    assert 'poast.openapi3.spec' not in source
+    client = module.PetStore('http://localhost/v1/')
+
+    pr = client.op.showPetById(petId=7)
+    assert (pr.method, pr.url) == ('GET', 'http://localhost/v1/pets/7')
+    assert isinstance(pr.execute, module.ShowPetByIdRequest)
+    pr = client.op.import_(pet_id=1, from_=2, params={'q': 'x'})
+    assert pr.url == 'http://localhost/v1/pets/1/2?q=x'
+    pr = client.op.listPets(limit=3, X_Request_Id='r1')
+    assert pr.url == 'http://localhost/v1/pets?limit=3'
+    assert pr.headers['X-Request-Id'] == 'r1'
+
+    assert 'http: GET /pets/{petId}' in client.op.showPetById.__doc__
+    assert module.PetStore.__doc__.strip() == \
+        'API client for "Petstore" version: 1.0.0'
+
+
+def test_gen_client_module_execute(tmp_path):
+    path = tmp_path / 'petstore_client.py'
+    path.write_text(gen_client_module('PetStore', OpenApiObject(
+        petstore(), resolve_refs=True)))
+    module = load_module(path, 'petstore_client_execute')
+    assert 'petstore_client_execute' not in sys.modules
+
+    client = canned_client(module.PetStore, None, 200, {'id': 1, 'name': 'x'})
+    assert client.op.showPetById(petId=1).execute().json()['id'] == 1
+
+
+def test_gen_client_module_tag_groups(tmp_path):
+    path = tmp_path / 'petstore_client.py'
+    path.write_text(gen_client_module('PetStore', OpenApiObject(
+        petstore(), resolve_refs=True), group_by_tags=True))
+    module = load_module(path, 'petstore_client_tags')
+
+    client = module.PetStore('http://localhost')
+    assert client.store is client.store
+    assert client.pets.showPetById(petId=1).url == 'http://localhost/pets/1'
+    assert 'getInventory' in dir(client.store)
+    assert 'listPets' not in dir(client.store)
+    assert module.PetStore_pets_Operations.__doc__.strip() == \
+        'API Operations for PetStore tagged "pets"'
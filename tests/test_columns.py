@@ -0,0 +1,55 @@
+import pytest
+from poast.openapi3.spec import OpenApiObject
+
+from .specs import petstore
+from .canned import canned_client
+
+np = pytest.importorskip('numpy')
+columns = pytest.importorskip('poast.openapi3.client.columns')
+
+
+def test_columns_dtype():
+    spec = petstore()
+    spec['components']['schemas']['Pet']['properties'].update({
+        'born': {'type': 'string', 'format': 'date-time'},
+        'count': {'type': 'integer', 'format': 'int32'},
+        'good': {'type': 'boolean'},
+    })
+    doc = OpenApiObject(spec, resolve_refs=True)
+    schema = doc['paths']['/pets']['get']['responses']['200']['content'][
+        'application/json']['schema']
+    assert columns.columns_dtype(schema) == [
+        ('id', np.dtype('int64')),
+        ('name', np.dtype(object)),
+        ('tag', np.dtype(object)),
+        ('weight', np.dtype('float64')),
+        ('born', np.dtype('datetime64[us]')),
+        ('count', np.dtype('int32')),
+        ('good', np.dtype(bool)),
+    ]
+
+
+def test_response_to_columns(petstore_cls):
+    client = canned_client(petstore_cls, None, 200, [
+        {'id': 1, 'name': 'rex', 'weight': 2.5},
+        {'id': 2, 'name': 'tom', 'tag': 'cat'},
+    ])
+    response = client.op.listPets().execute()
+
+    cols = columns.response_to_columns(client.op.listPets, response)
+    assert cols['id'].tolist() == [1, 2]
+    assert cols['id'].dtype == np.int64
+    assert cols['tag'].tolist() == [None, 'cat']
+    assert np.isnan(cols['weight'][1])
+
+    array = columns.response_to_columns(
+        client.op.listPets, response, structured=True)
+    assert array.dtype.names == ('id', 'name', 'tag', 'weight')
+    assert array['name'].tolist() == ['rex', 'tom']
+
+
+def test_response_to_columns_no_schema(petstore_cls):
+    client = canned_client(petstore_cls, None, 201, None)
+    response = client.op.createPet(json={}).execute()
+    with pytest.raises(ValueError):
+        columns.response_to_columns(client.op.createPet, response)
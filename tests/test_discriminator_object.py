@@ -1,6 +1,12 @@
 import pytest
+from poast.openapi3.spec import OpenApiObject
 from poast.openapi3.spec.document import DiscriminatorObject
-from poast.openapi3.spec.model.exceptions import MalformedDocumentException
+from poast.openapi3.spec.model.exceptions import (
+    MalformedDocumentException,
+    PayloadValidationException,
+)
+
+from .specs import petstore
 
 
 def test_discriminator():
@@ -15,3 +21,64 @@ def test_discriminator_malformed():
     with pytest.raises(MalformedDocumentException):
         DiscriminatorObject({
         }).validate()
+
+
+def _pets(mapping=None):
+    spec = petstore()
+    schemas = spec['components']['schemas']
+    for name, prop in (('Cat', 'lives'), ('Dog', 'good'), ('Eel', 'volts')):
+        schemas[name] = {
+            'type': 'object',
+            'required': ['kind', prop],
+            'properties': {
+                'kind': {'type': 'string'},
+                prop: {'type': 'integer'},
+            },
+        }
+    schemas['AnyPet'] = {
+        'oneOf': [
+            {'$ref': '#/components/schemas/Cat'},
+            {'$ref': '#/components/schemas/Dog'},
+        ],
+        'discriminator': {'propertyName': 'kind'},
+    }
+    if mapping is not None:
+        schemas['AnyPet']['discriminator']['mapping'] = mapping
+    return OpenApiObject(spec, resolve_refs=True)
+
+
+def test_discriminator_resolve():
+    doc = _pets()
+    schemas = doc.schemas
+    discriminator = schemas['AnyPet']['discriminator']
+    assert discriminator.dispatch_table() == {
+        'Cat': schemas['Cat'], 'Dog': schemas['Dog']}
+    assert discriminator.resolve({'kind': 'Dog'}) is schemas['Dog']
+    assert discriminator.resolve({'kind': 'Eel'}) is None
+    assert discriminator.resolve({}) is None
+    assert discriminator.resolve([]) is None
+
+
+def test_discriminator_resolve_mapping():
+    doc = _pets({'cat': '#/components/schemas/Cat', 'eel': 'Eel'})
+    schemas = doc.schemas
+    discriminator = schemas['AnyPet']['discriminator']
+    assert discriminator.resolve({'kind': 'cat'}) is schemas['Cat']
+    assert discriminator.resolve({'kind': 'eel'}) is schemas['Eel']
+    assert discriminator.resolve({'kind': 'Dog'}) is schemas['Dog']
+
+
+def test_discriminator_validator_dispatch():
+    doc = _pets()
+    validate = doc.schemas['AnyPet'].compile_validator()
+    validate({'kind': 'Cat', 'lives': 9})
+
+    # The selected member's own error is reported (not a oneOf mismatch):
+    with pytest.raises(PayloadValidationException) as e:
+        validate({'kind': 'Dog', 'good': 'yes'})
+    assert (e.value.path, e.value.rule) == ('$.good', 'type')
+
+    # Unknown values fall back to trying each member:
+    with pytest.raises(PayloadValidationException) as e:
+        validate({'kind': 'Eel', 'volts': 600})
+    assert e.value.rule == 'oneOf'
@@ -0,0 +1,120 @@
+import sys
+import pytest
+from poast.openapi3.client import gen_client_cls
+from poast.openapi3.client.basemodel import OpenApiModel
+from poast.openapi3.client.genmodels import gen_models
+from poast.openapi3.spec import OpenApiObject
+
+from .canned import canned_client
+from .specs import petstore
+
+
+def _zoo():
+    spec = petstore()
+    schemas = spec['components']['schemas']
+    schemas['Pet']['properties']['owner'] = {
+        '$ref': '#/components/schemas/Owner'}
+    schemas['Owner'] = {
+        'type': 'object',
+        'properties': {
+            'name': {'type': 'string'},
+            'class': {'type': 'string'},
+            'pets': {
+                'type': 'array',
+                'items': {'$ref': '#/components/schemas/Pet'},
+            },
+        },
+    }
+    schemas['Animal'] = {
+        'type': 'object',
+        'required': ['kind'],
+        'properties': {'kind': {'type': 'string'}},
+        'discriminator': {
+            'propertyName': 'kind',
+            'mapping': {'kitty': '#/components/schemas/Cat'},
+        },
+    }
+    schemas['Cat'] = {'allOf': [
+        {'$ref': '#/components/schemas/Animal'},
+        {'properties': {'lives': {'type': 'integer'}}},
+    ]}
+    schemas['Dog'] = {'allOf': [
+        {'$ref': '#/components/schemas/Animal'},
+        {'properties': {'good': {'type': 'boolean'}}},
+    ]}
+    return OpenApiObject(spec, resolve_refs=True)
+
+
+def test_gen_models():
+    models = gen_models(_zoo())
+    assert sorted(m.__name__ for m in models) == [
+        'Animal', 'Cat', 'Dog', 'Error', 'Owner', 'Pet']
+    assert models.Pet is models['Pet']
+    assert issubclass(models.Pet, OpenApiModel)
+    assert models.Pet.__slots__ == ('id', 'name', 'tag', 'weight', 'owner')
+    assert models.Owner._fields[1] == ('class', 'class_')
+
+    pet = models.Pet.from_json({'id': 1, 'name': 'rex', 'owner': {
+        'name': 'ann', 'class': 'vip', 'pets': [{'id': 2, 'name': 'tom'}]}})
+    assert not hasattr(pet, '__dict__')
+    assert isinstance(pet.owner, models.Owner)
+    assert pet.owner.class_ == 'vip'
+    assert pet.owner.pets[0].name == 'tom'
+    assert pet.to_json() == {'id': 1, 'name': 'rex', 'owner': {
+        'name': 'ann', 'class': 'vip', 'pets': [{'id': 2, 'name': 'tom'}]}}
+    assert models.Pet.from_json(pet.to_json()) == pet
+
+
+def test_gen_models_discriminator():
+    models = gen_models(_zoo())
+    assert issubclass(models.Cat, models.Animal)
+    assert models.Cat.__slots__ == ('lives',)
+
+    cat = models.Animal.from_json({'kind': 'kitty', 'lives': 9})
+    assert type(cat) is models.Cat and cat.lives == 9
+    dog = models.Animal.from_json({'kind': 'Dog', 'good': True})
+    assert type(dog) is models.Dog and dog.to_json() == {
+        'kind': 'Dog', 'good': True}
+    assert type(models.Animal.from_json({'kind': 'Eel'})) is models.Animal
+
+
+def test_gen_models_attr_names():
+    spec = petstore()
+    schemas = spec['components']['schemas']
+    schemas['Base'] = {'type': 'object', 'properties': {
+        'a_b': {'type': 'integer'}, '_source': {'type': 'string'}}}
+    schemas['Sub'] = {'allOf': [
+        {'$ref': '#/components/schemas/Base'},
+        {'properties': {'a-b': {'type': 'integer'},
+                        'a b': {'type': 'integer'}}},
+    ]}
+    models = gen_models(OpenApiObject(spec, resolve_refs=True))
+    assert models.Sub._fields == (
+        ('a_b', 'a_b'), ('_source', '_source_'), ('a-b', 'a_b_'),
+        ('a b', 'a_b__'))
+
+    data = {'a_b': 1, '_source': 'x', 'a-b': 2, 'a b': 3}
+    assert models.Sub.from_json(data).to_json() == data
+    with pytest.raises(TypeError):
+        hash(models.Sub.from_json(data))
+
+
+def test_gen_models_size():
+    models = gen_models(_zoo())
+    data = {'id': 1, 'name': 'rex', 'tag': 'dog', 'weight': 1.5}
+    pet = models.Pet.from_json(data)
+    assert sys.getsizeof(pet) < sys.getsizeof(data)
+
+
+def test_gen_models_decode_response():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    models = gen_models(doc)
+    client = canned_client(gen_client_cls('PetStore', doc), None, 200, [
+        {'id': 1, 'name': 'rex'}, {'id': 2, 'name': 'tom'}])
+    pets = models.decode_response(
+        client.op.listPets, client.op.listPets().execute())
+    assert [p.name for p in pets] == ['rex', 'tom']
+    assert all(isinstance(p, models.Pet) for p in pets)
+
+    with pytest.raises(AttributeError):
+        models.Nope
@@ -1,7 +1,13 @@
 import pytest
-from poast.openapi3.spec.document import OpenApiObject
+from poast.openapi3.spec.document import (
+    OpenApiObject,
+    ParameterObject,
+    SchemaObject,
+)
 from poast.openapi3.spec.model.exceptions import MalformedDocumentException
 
+from .specs import petstore
+
 
 def test_openapi():
     return
@@ -15,3 +21,32 @@ def test_openapi_malformed():
     with pytest.raises(MalformedDocumentException):
         OpenApiObject({
         }).validate()
+
+
+def test_openapi_operations_index():
+    doc = OpenApiObject(petstore())
+    assert list(doc.operations) == [
+        'listPets', 'createPet', 'showPetById', 'getInventory']
+    assert doc.operations['showPetById'] is \
+        doc['paths']['/pets/{petId}']['get']
+    with pytest.raises(TypeError):
+        doc.operations['showPetById'] = None
+
+
+def test_openapi_find():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    params = doc.find(ParameterObject)
+    assert [str(p['name']) for p in params] == [
+        'limit', 'X-Request-Id', 'petId']
+    assert doc.find('SchemaObject') == doc.find(SchemaObject)
+    assert doc.find('NoSuchObject') == ()
+    assert isinstance(params, tuple)
+
+
+def test_openapi_schemas():
+    doc = OpenApiObject(petstore())
+    assert sorted(doc.schemas) == ['Error', 'Pet']
+    assert doc.schemas['Pet'] is doc._obj_by_path['#/components/schemas/Pet']
+    assert doc.schemas is doc.schemas
+    with pytest.raises(TypeError):
+        doc.schemas['Pet'] = None
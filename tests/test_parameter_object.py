@@ -15,3 +15,25 @@ def test_parameter_malformed():
     with pytest.raises(MalformedDocumentException):
         ParameterObject({
         }).validate()
+
+
+@pytest.mark.parametrize('data, style, explode', [
+    ({'in': 'query'}, 'form', True),
+    ({'in': 'cookie'}, 'form', True),
+    ({'in': 'path', 'required': True}, 'simple', False),
+    ({'in': 'header'}, 'simple', False),
+    ({'in': 'query', 'style': 'pipeDelimited'}, 'pipeDelimited', False),
+    ({'in': 'header', 'style': 'form'}, 'form', True),
+])
+def test_parameter_explode_default(data, style, explode):
+    param = ParameterObject({'name': 'p', **data})
+    # Unset fields stay unset; defaults follow the (effective) style:
+    assert param['explode'] is None
+    assert (param['style'] or param._defaults['style']).value() == style
+    assert param._defaults['explode'].value() is explode
+
+
+def test_parameter_explode_explicit():
+    param = ParameterObject({'name': 'p', 'in': 'query', 'explode': False})
+    assert param['explode'].value() is False
+    assert 'explode' not in param._defaults
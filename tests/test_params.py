@@ -0,0 +1,103 @@
+import pytest
+
+from poast.openapi3.client.params import (
+    compile_path,
+    compile_request,
+    cookie_encoder,
+    header_encoder,
+    path_encoder,
+    query_encoder,
+)
+
+
+@pytest.mark.parametrize('style, explode, expected', [
+    ('simple', False, ['5', '3,4', 'a,1,b,2']),
+    ('simple', True, ['5', '3,4', 'a=1,b=2']),
+    ('label', False, ['.5', '.3,4', '.a,1,b,2']),
+    ('label', True, ['.5', '.3.4', '.a=1.b=2']),
+    ('matrix', False, [';id=5', ';id=3,4', ';id=a,1,b,2']),
+    ('matrix', True, [';id=5', ';id=3;id=4', ';a=1;b=2']),
+])
+def test_path_encoder(style, explode, expected):
+    encode = path_encoder('id', style, explode)
+    assert [encode(5), encode([3, 4]), encode({'a': 1, 'b': 2})] == expected
+
+
+def test_path_encoder_escaping():
+    encode = path_encoder('id')
+    assert encode('a/b c') == 'a%2Fb%20c'
+    assert encode(['x,y', True]) == 'x%2Cy,true'
+    assert path_encoder('id', 'matrix')('') == ';id'
+
+    with pytest.raises(TypeError):
+        encode(None)
+    with pytest.raises(ValueError):
+        path_encoder('id', 'form')
+
+
+def test_compile_path():
+    build_path = compile_path('/pets/{petId}/{from}{.fmt}', [
+        {'name': 'petId', 'in': 'path', 'attr': 'petId',
+         'style': 'simple', 'explode': False},
+        {'name': '.fmt', 'in': 'path', 'attr': '_fmt',
+         'style': 'label', 'explode': False},
+    ])
+    assert build_path({'petId': 'a/b', 'from_': 1, '_fmt': 'json'}) == \
+        '/pets/a%2Fb/1.json'
+    with pytest.raises(TypeError):
+        build_path({'petId': 1})
+    assert compile_path('/pets', [])({}) == '/pets'
+
+
+@pytest.mark.parametrize('style, explode, expected', [
+    ('form', True, ['id=5', 'id=3&id=4', 'a=1&b=2']),
+    ('form', False, ['id=5', 'id=3,4', 'id=a,1,b,2']),
+    ('spaceDelimited', False, ['id=5', 'id=3%204', 'id=a%201%20b%202']),
+    ('pipeDelimited', False, ['id=5', 'id=3|4', 'id=a|1|b|2']),
+    ('deepObject', True, ['id=5', 'id=3&id=4', 'id[a]=1&id[b]=2']),
+])
+def test_query_encoder(style, explode, expected):
+    encode = query_encoder('id', style, explode)
+    assert [encode(5), encode([3, 4]), encode({'a': 1, 'b': 2})] == expected
+
+
+def test_query_encoder_reserved():
+    assert query_encoder('q')('a/b&c') == 'q=a%2Fb%26c'
+    assert query_encoder('q', allow_reserved=True)('a/b c') == 'q=a/b%20c'
+    assert query_encoder('q')([]) == ''
+
+
+def test_header_cookie_encoders():
+    assert header_encoder('X')([1, 2]) == '1,2'
+    assert header_encoder('X', explode=True)({'a': 1}) == 'a=1'
+    assert cookie_encoder('c')({'a': True}) == 'a,true'
+
+
+def test_compile_request():
+    build_request = compile_request('/pets/{id}', [
+        {'name': 'id', 'in': 'path', 'attr': 'id', 'required': True,
+         'style': 'simple', 'explode': False, 'allow_reserved': False},
+        {'name': 'tags', 'in': 'query', 'attr': 'tags', 'required': False,
+         'style': 'pipeDelimited', 'explode': False,
+         'allow_reserved': False},
+        {'name': 'X-Trace', 'in': 'header', 'attr': 'X_Trace',
+         'required': True, 'style': 'simple', 'explode': False,
+         'allow_reserved': False},
+        {'name': 'session', 'in': 'cookie', 'attr': 'session',
+         'required': False, 'style': 'form', 'explode': True,
+         'allow_reserved': False},
+    ])
+    headers = {'Accept': 'text/plain'}
+    assert build_request(
+        {'id': 1, 'tags': ['a', 'b'], 'X_Trace': 't', 'session': 's'},
+        headers, None) == (
+        '/pets/1?tags=a|b', {'Accept': 'text/plain', 'X-Trace': 't'},
+        {'session': 's'})
+    assert headers == {'Accept': 'text/plain'}
+    assert build_request({'id': 1, 'X_Trace': 't'}, None, None) == \
+        ('/pets/1', {'X-Trace': 't'}, None)
+
+    with pytest.raises(TypeError, match="header parameter 'X-Trace'"):
+        build_request({'id': 1}, None, None)
+    with pytest.raises(TypeError, match="unexpected .* 'limit'"):
+        build_request({'id': 1, 'X_Trace': 't', 'limit': 1}, None, None)
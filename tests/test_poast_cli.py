@@ -3,12 +3,75 @@
 """Tests for `poast` package."""
 
 # import pytest
+import json
+import subprocess
+import sys
 from click.testing import CliRunner
 from poast.openapi3 import cli
 
+from .specs import petstore
+
 
 def test_cli_help():
     """Test the CLI help menu."""
     runner = CliRunner()
     help_result = runner.invoke(cli.main, ['--help'])
     assert help_result.exit_code == 0
+
+
+def test_cli_imports():
+    """Test that the validation CLI does not load the client packages."""
+    result = subprocess.run([
+        sys.executable, '-c',
+        'import sys, poast.openapi3.cli; '
+        'print(any(m.startswith("poast.openapi3.client") '
+        'for m in sys.modules))'], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_cli_collect_errors(tmp_path):
+    """Test collecting validation errors as JSON."""
+    spec = petstore()
+    del spec['info']['title']
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(spec))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        '--openapi-spec', str(spec_path), '--collect-errors'])
+    assert result.exit_code == 1
+    assert json.loads(result.output) == [{
+        'path': '#/info',
+        'type': 'InfoObject',
+        'field': 'title',
+        'rule': 'required',
+        'message': 'is required',
+    }]
+
+
+def test_cli_profile(tmp_path):
+    """Test profiling validation."""
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(petstore()))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.main, [
+        '--openapi-spec', str(spec_path), '--profile'])
+    assert result.exit_code == 0
+    assert 'path_conflict' in result.output
+    assert 'slowest nodes' in result.output
+
+
+def test_cli_gen(tmp_path):
+    """Test generating a client module."""
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(petstore()))
+    output = tmp_path / 'client.py'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.gen_main, [
+        '--openapi-spec', str(spec_path), '--class-name', 'PetStore',
+        '--output', str(output)])
+    assert result.exit_code == 0
+    assert 'class PetStore(OpenApiClient):' in output.read_text()
+    compile(output.read_text(), str(output), 'exec')
@@ -0,0 +1,64 @@
+import pytest
+
+from poast.openapi3.spec import OpenApiObject
+from poast.openapi3.spec.query import (
+    compile_query,
+    IndexedPathStep,
+    TypeIndexStep,
+)
+
+from .specs import petstore
+
+
+@pytest.fixture
+def doc():
+    return OpenApiObject(petstore(), resolve_refs=True)
+
+
+def test_query_header_params(doc):
+    found = doc.query(
+        "$.paths[*][get,post].parameters[?(@.in=='header')]")
+    assert [str(p['name']) for p in found] == ['X-Request-Id']
+
+
+def test_query_follows_refs(doc):
+    found = list(doc.query("$.paths['/pets/{petId}'].get.parameters[0]"))
+    assert len(found) == 1
+    assert found[0].doc_path == '#/components/parameters/PetId'
+
+
+def test_query_filter_conditions(doc):
+    found = doc.query(
+        "$.components.schemas.Pet.properties"
+        "[?(@.type == 'string' && @.nullable == true || @.minimum >= 0)]")
+    assert [p.doc_path.rsplit('/', 1)[-1] for p in found] == ['tag', 'weight']
+
+
+def test_query_descent(doc):
+    op_ids = [str(v) for v in doc.query('$..operationId')]
+    assert op_ids == ['listPets', 'createPet', 'showPetById', 'getInventory']
+
+
+def test_query_type_index(doc):
+    plan = compile_query(
+        "$..[?(@.openapi_type == 'OperationObject' && @.tags)]")
+    assert isinstance(plan.steps[0], TypeIndexStep)
+    assert list(plan(doc)) == list(doc.operations.values())
+
+
+def test_query_indexed_path(doc):
+    plan = compile_query('$.components.schemas.Error')
+    assert isinstance(plan.steps[0], IndexedPathStep)
+    assert list(plan(doc)) == [doc.schemas['Error']]
+    assert list(compile_query('$.components.schemas.Nope')(doc)) == []
+
+
+def test_query_compiled_once():
+    assert compile_query('$.info.title') is compile_query('$.info.title')
+
+
+@pytest.mark.parametrize('expr', [
+    'paths', '$.', '$[?(@.x ==)]', '$[1', '$..', '$[?(x)]'])
+def test_query_invalid(expr):
+    with pytest.raises(ValueError):
+        compile_query(expr)
@@ -0,0 +1,93 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from poast.openapi3.client import ClientConfig, gen_client_cls
+from poast.openapi3.client import registry
+from poast.openapi3.client.opindex import build_client_index
+from poast.openapi3.spec import OpenApiObject
+
+from .specs import petstore
+
+
+def pet_url(client, pet_id):
+    return type(client).__module__, client.op.showPetById(petId=pet_id).url
+
+
+def test_pickle_client(petstore_cls):
+    client = petstore_cls('http://localhost/v1', ClientConfig(
+        headers={'X-Api-Key': 'secret'}, validate_requests=True))
+    clone = pickle.loads(pickle.dumps(client))
+    assert type(clone) is petstore_cls
+    assert type(clone._session) is requests.Session
+    assert clone._validate_requests
+    pr = clone.op.showPetById(petId=7)
+    assert (pr.url, pr.headers['X-Api-Key']) == (
+        'http://localhost/v1/pets/7', 'secret')
+
+
+def test_pickle_prepared_request(petstore_cls):
+    client = petstore_cls('http://localhost')
+    pr = pickle.loads(pickle.dumps(client.op.showPetById(petId=7)))
+    assert pr.url == 'http://localhost/pets/7'
+    assert type(pr.execute).__name__ == 'ShowPetByIdRequest'
+    assert pr.execute.request is pr
+
+
+def test_pickle_client_rebuilt(monkeypatch):
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    cls = gen_client_cls('PetStore', doc, group_by_tags=True)
+    data = pickle.dumps(cls('http://localhost'))
+
+    # Clients pickle with their class's packed index, without docstrings:
+    packed = cls._client_ref.packed()
+    index = registry.unpack_index(packed)
+    assert [op['doc'] for op in index['operations']] == [''] * 4
+    assert len(packed) < len(pickle.dumps(
+        build_client_index('PetStore', doc))) // 2
+
+    # A process which did not generate the class builds it from the index:
+    monkeypatch.setattr(registry, '_classes', {})
+    monkeypatch.setattr(registry, '_built', {})
+    clone = pickle.loads(data)
+    assert type(clone) is not cls
+    assert type(clone).__name__ == 'PetStore'
+    assert clone.pets.showPetById(petId=1).url == 'http://localhost/pets/1'
+    assert type(pickle.loads(data)) is type(clone)
+
+    # ... and pickles it again:
+    monkeypatch.setattr(registry, '_classes', {})
+    monkeypatch.setattr(registry, '_built', {})
+    again = pickle.loads(pickle.dumps(clone))
+    assert type(again).__name__ == 'PetStore'
+    assert again.store.getInventory().url == \
+        'http://localhost/store/inventory'
+
+
+def test_pickle_client_rebuilt_validation(monkeypatch, caplog):
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    cls = gen_client_cls('PetStore', doc)
+    data = pickle.dumps(
+        cls('http://localhost', ClientConfig(validate_requests=True)))
+    assert 'validation is not available' not in caplog.text
+
+    # Rebuilt classes cannot validate, and say so:
+    monkeypatch.setattr(registry, '_classes', {})
+    monkeypatch.setattr(registry, '_built', {})
+    clone = pickle.loads(data)
+    assert type(clone) is not cls
+    assert 'PetStore: request and response validation is not available' \
+        in caplog.text
+
+
+def test_pickle_client_process_pool(petstore_cls):
+    client = petstore_cls('http://localhost')
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        results = list(pool.map(pet_url, [client] * 2, [1, 2]))
+    assert results == [
+        ('poast.openapi3.client.registry.PetStore', 'http://localhost/pets/1'),
+        ('poast.openapi3.client.registry.PetStore', 'http://localhost/pets/2'),
+    ]
@@ -0,0 +1,69 @@
+import pytest
+
+from poast.openapi3.spec import OpenApiObject
+
+from .specs import petstore
+
+
+@pytest.fixture
+def doc():
+    spec = petstore()
+    paths = spec['paths']
+    paths['/pets/mine'] = {'get': {'operationId': 'listMyPets'}}
+    paths['/pets/{petId}/photo.{format}'] = {
+        'get': {'operationId': 'getPetPhoto'}}
+    paths['/pets/{id}/{field}'] = {'get': {'operationId': 'getPetField'}}
+    return OpenApiObject(spec, resolve_refs=True)
+
+
+def test_router_cached(doc):
+    assert doc.router() is doc.router()
+
+
+def test_router_match(doc):
+    router = doc.router()
+    match = router.match('GET', '/pets/7')
+    assert match.operation['operationId'] == 'showPetById'
+    assert (match.path, match.method) == ('/pets/{petId}', 'get')
+    assert match.path_params == {'petId': '7'}
+    assert match.path_item is doc['paths']['/pets/{petId}']
+
+    assert router.match('post', '/pets/').operation['operationId'] == \
+        'createPet'
+    assert router.match('DELETE', '/pets/7') is None
+    assert router.match('GET', '/dogs/7') is None
+    assert router.match('GET', '/pets/7/photo/large/x') is None
+
+
+def test_router_static_precedence(doc):
+    router = doc.router()
+    assert router.match('GET', '/pets/mine').operation['operationId'] == \
+        'listMyPets'
+
+    match = router.match('GET', '/pets/7/photo.png')
+    assert match.operation['operationId'] == 'getPetPhoto'
+    assert match.path_params == {'petId': '7', 'format': 'png'}
+
+    match = router.match('GET', '/pets/7/photo')
+    assert match.operation['operationId'] == 'getPetField'
+    assert match.path_params == {'id': '7', 'field': 'photo'}
+
+
+def test_router_server_base_path(doc):
+    router = doc.router()
+    url = 'https://petstore.example.com/api/v1/pets/mr%20bean?limit=2'
+    match = router.match('GET', url)
+    assert match.operation['operationId'] == 'showPetById'
+    assert match.path_params == {'petId': 'mr bean'}
+    assert router.match('GET', '/api/v2/pets/7') is None
+
+
+def test_router_server_variables():
+    spec = petstore()
+    spec['servers'] = [{
+        'url': '/{version}/api',
+        'variables': {'version': {'default': 'v1'}},
+    }]
+    router = OpenApiObject(spec).router()
+    match = router.match('GET', '/v2/api/pets/7')
+    assert match.path_params == {'petId': '7'}
@@ -1,6 +1,12 @@
 import pytest
+from poast.openapi3.spec import OpenApiObject
 from poast.openapi3.spec.document import SchemaObject
-from poast.openapi3.spec.model.exceptions import MalformedDocumentException
+from poast.openapi3.spec.model.exceptions import (
+    MalformedDocumentException,
+    PayloadValidationException,
+)
+
+from .specs import petstore
 
 
 def test_schema():
@@ -15,3 +21,91 @@ def test_schema_malformed():
     with pytest.raises(MalformedDocumentException):
         SchemaObject({
         }).validate()
+
+
+def _validator(schema_data, **components):
+    spec = petstore()
+    spec['components']['schemas'].update(components)
+    spec['components']['schemas']['Test'] = schema_data
+    doc = OpenApiObject(spec, resolve_refs=True)
+    return doc.schemas['Test'].compile_validator()
+
+
+def test_schema_compile_validator():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    pet = doc.schemas['Pet']
+    validate_pet = pet.compile_validator()
+    assert pet.compile_validator() is validate_pet
+
+    validate_pet({'id': 1, 'name': 'rex', 'tag': None, 'weight': 2.5})
+    with pytest.raises(PayloadValidationException) as e:
+        validate_pet({'id': 'one', 'name': 'rex'})
+    assert (e.value.path, e.value.rule) == ('$.id', 'type')
+    assert e.value.schema_path == '#/components/schemas/Pet/properties/id'
+
+    with pytest.raises(PayloadValidationException) as e:
+        validate_pet({'id': 1})
+    assert (e.value.path, e.value.rule) == ('$.name', 'required')
+
+    with pytest.raises(PayloadValidationException) as e:
+        validate_pet({'id': 1, 'name': 'rex', 'weight': -1})
+    assert e.value.rule == 'minimum'
+
+
+@pytest.mark.parametrize('schema_data,valid,invalid', [
+    ({'type': 'integer', 'minimum': 1, 'exclusiveMinimum': True,
+      'maximum': 5, 'multipleOf': 2}, [2, 4], [1, 6, 3, True, 2.0 + 0.5]),
+    ({'type': 'number', 'multipleOf': 0.1},
+     [0.3, 0.7, 1, 12345.6, -0.2], [0.35, 1.05, float('inf')]),
+    ({'type': 'integer', 'multipleOf': 3}, [2 ** 70 * 3, 0], [2 ** 70]),
+    ({'type': 'string', 'minLength': 2, 'maxLength': 3,
+      'pattern': '^[a-z]+$'}, ['ab', 'abc'], ['a', 'abcd', 'AB', 1, None]),
+    ({'type': 'string', 'pattern': r'^(?<w>\p{L}+)-\k<w>$'},
+     ['é-é', 'ab-ab'], ['ab-ba', '1-1']),
+    ({'type': 'string', 'nullable': True, 'enum': ['a', 'b']},
+     ['a', None], ['c']),
+    ({'type': 'array', 'items': {'type': 'integer'}, 'minItems': 1,
+      'uniqueItems': True}, [[1], [1, 2]], [[], [1, 1], ['x'], {}]),
+    ({'type': 'object', 'properties': {'a': {'type': 'integer'}},
+      'additionalProperties': False, 'maxProperties': 1},
+     [{}, {'a': 1}], [{'b': 1}, {'a': 'x'}, []]),
+    ({'type': 'object', 'properties': {'a': {'type': 'string'}},
+      'additionalProperties': {'type': 'integer', 'minimum': 0}},
+     [{'a': 'x', 'b': 1}, {'c': 0}], [{'b': 'x'}, {'a': 1}, {'b': -1}]),
+    ({'type': 'object',
+      'additionalProperties': {'$ref': '#/components/schemas/Pet'}},
+     [{'b': {'id': 1, 'name': 'rex'}}, {}], [{'b': 'x'}, {'b': {'id': 1}}]),
+    # Unresolvable additionalProperties schemas are skipped:
+    ({'type': 'object', 'additionalProperties': {
+        'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}}},
+     [{'b': [{}]}, {'b': 'x'}], [[]]),
+    ({'oneOf': [{'type': 'integer'}, {'type': 'number'}]}, [1.5], [1, 'x']),
+    ({'anyOf': [{'type': 'integer'}, {'type': 'string'}]}, [1, 'x'], [1.5]),
+    ({'allOf': [{'minimum': 1}, {'maximum': 3}]}, [1, 3], [0, 4]),
+    ({'not': [{'type': 'string'}]}, [1, None], ['x']),
+])
+def test_schema_compile_validator_keywords(schema_data, valid, invalid):
+    validate = _validator(schema_data)
+    for value in valid:
+        validate(value)
+    for value in invalid:
+        with pytest.raises(PayloadValidationException):
+            validate(value)
+
+
+def test_schema_compile_validator_recursive():
+    validate = _validator({'$ref': '#/components/schemas/Node'}, Node={
+        'type': 'object',
+        'required': ['name'],
+        'properties': {
+            'name': {'type': 'string'},
+            'children': {
+                'type': 'array',
+                'items': {'$ref': '#/components/schemas/Node'},
+            },
+        },
+    })
+    validate({'name': 'a', 'children': [{'name': 'b', 'children': []}]})
+    with pytest.raises(PayloadValidationException) as e:
+        validate({'name': 'a', 'children': [{'children': []}]})
+    assert e.value.path == '$.children[0].name'
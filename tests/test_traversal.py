@@ -0,0 +1,62 @@
+from poast.openapi3.spec import OpenApiObject
+from poast.openapi3.spec.document import (
+    OperationObject,
+    SchemaObject,
+)
+from poast.openapi3.spec.model.primitives import OpenApiString
+from poast.openapi3.spec.model.reference import ReferenceObject
+
+from .specs import petstore
+
+
+def test_iter_nodes_types():
+    doc = OpenApiObject(petstore())
+    op_ids = [str(op['operationId'])
+              for op in doc.iter_nodes(types=(OperationObject,))]
+    assert op_ids == ['listPets', 'createPet', 'showPetById', 'getInventory']
+
+
+def test_iter_nodes_prune():
+    doc = OpenApiObject(petstore())
+    schemas = list(doc.iter_nodes(
+        types=(SchemaObject,),
+        prune=lambda n: isinstance(n, SchemaObject)))
+    # Only top-level schemas: none nested in other schemas:
+    for s in schemas:
+        assert '/properties/' not in s.doc_path
+        assert '/items' not in s.doc_path
+
+
+def test_iter_nodes_early_exit():
+    doc = OpenApiObject(petstore())
+    first = next(doc.iter_nodes(types=(OpenApiString,)))
+    assert first.doc_path == '#/openapi'
+
+
+def test_iter_nodes_follow_refs():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    refs = list(doc.iter_nodes(types=(ReferenceObject,)))
+    assert refs == []
+
+    refs = list(doc.iter_nodes(types=(ReferenceObject,), follow_refs=False))
+    assert len(refs) == 5
+
+
+def test_accept_post_order():
+    doc = OpenApiObject(petstore())
+    visited = []
+    doc['info'].accept(lambda n: visited.append(n.doc_path))
+    assert visited[-1] == '#/info'
+    assert visited.index('#/info/license/name') < \
+        visited.index('#/info/license')
+
+
+def test_accept_cyclic():
+    spec = petstore()
+    spec['components']['schemas']['Pet']['properties']['parent'] = {
+        '$ref': '#/components/schemas/Pet'}
+    doc = OpenApiObject(spec, resolve_refs=True)
+
+    visited = []
+    doc.accept(visited.append)
+    assert doc in visited
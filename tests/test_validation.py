@@ -1,4 +1,10 @@
 import pytest
+from poast.openapi3.spec import OpenApiObject
+from poast.openapi3.spec.document import (
+    InfoObject,
+    LicenseObject,
+    PathsObject,
+)
 from poast.openapi3.spec.model.exceptions import (
     DocumentParsingException,
     MissingRequiredFieldException,
@@ -11,8 +17,13 @@ from poast.openapi3.spec.validation import (
     in_range,
     is_url,
     is_email,
+    format_checkers,
+    register_format,
+    check_format,
 )
 
+from .specs import petstore
+
 
 class FakeObject(dict):
     """TODO: replace with mock, etc"""
@@ -127,3 +138,152 @@ def test_is_email_fail():
 def test_is_email_blank():
     obj = FakeObject({'email': None})
     obj.email_val_fn()
+
+
+def test_validate_collect():
+    spec = petstore()
+    spec['info']['license'] = {'url': 'not a url'}
+    spec['paths']['/pets/{id}'] = spec['paths']['/pets/{petId}']
+    spec['components']['parameters']['PetId']['in'] = 'body'
+    doc = OpenApiObject(spec, resolve_refs=True)
+
+    violations = doc.validate(collect=True)
+    assert [(v.path, v.field, v.rule) for v in violations] == [
+        ('#/info/license', 'name', 'required'),
+        ('#/info/license', 'url', 'is_url'),
+        ('#/paths', '/pets/{id}', 'path_conflict'),
+        ('#/paths["/pets/{id}"]', 'showPetById', 'unique_operation_id'),
+        ('#/components/parameters/PetId', 'in', 'in_range'),
+    ]
+    assert violations[0].to_dict()['type'] == 'LicenseObject'
+
+    assert len(doc.validate(collect=True, max_errors=2)) == 2
+
+    with pytest.raises(MissingRequiredFieldException):
+        doc.validate()
+
+
+def test_validate_collect_valid():
+    doc = OpenApiObject(petstore(), resolve_refs=True)
+    assert doc.validate(collect=True) == []
+    assert doc.validate() is doc
+
+
+def test_validation_plan():
+    plan = LicenseObject.validation_plan()
+    assert plan is LicenseObject.validation_plan()
+    assert [r.name for r in plan.rules] == ['required', 'is_url']
+    assert plan.describe() == ["required('name')", "is_url('url')"]
+    assert plan.body is None
+
+    plan = PathsObject.validation_plan()
+    assert [r.name for r in plan.rules] == [
+        'path_conflict', 'unique_operation_id']
+    assert plan.body is None
+
+
+def test_validation_plan_decorated():
+    class CustomInfo(InfoObject):
+        @is_email('email')
+        def _validate(self):
+            pass
+
+    plan = CustomInfo.validation_plan()
+    assert plan.describe() == [
+        "required('title')", "required('version')", "is_email('email')",
+        'test_validation_plan_decorated.<locals>.CustomInfo._validate()']
+
+
+def test_validate_follow_refs_once():
+    spec = petstore()
+    spec['components']['schemas']['Pet']['readOnly'] = True
+    spec['components']['schemas']['Pet']['writeOnly'] = True
+    doc = OpenApiObject(spec, resolve_refs=True)
+
+    # Without following references, paths don't reach the schema:
+    assert doc['paths'].validate(collect=True) == []
+
+    violations = doc['paths'].validate(
+        collect=True, follow_refs=True, attribute_refs=True)
+    assert [(v.path, v.rule) for v in violations] == [
+        ('#/components/schemas/Pet', 'require_value')]
+    assert sorted(violations[0].referenced_from) == [
+        '#/paths["/pets"]/get/responses/200/content["application/json"]'
+        '/schema/items',
+        '#/paths["/pets"]/post/requestBody/content["application/json"]/schema',
+        '#/paths["/pets/{petId}"]/get/responses/200'
+        '/content["application/json"]/schema',
+    ]
+
+    with pytest.raises(DocumentParsingException):
+        doc['paths'].validate(follow_refs=True)
+
+
+def test_format_checks():
+    assert check_format('uri-reference', '../pets?limit=10#frag')
+    assert not check_format('uri-reference', 'not a uri')
+    assert check_format('regex', '^[a-z]+$')
+    assert not check_format('regex', '[a-z')
+
+    # ECMA 262 syntax (translated, or unsupported by python):
+    assert check_format('regex', r'^\p{L}+$')
+    assert check_format('regex', r'^(?<word>[a-z]+)-\k<word>$')
+    assert check_format('regex', r'^\p{Script=Greek}+$')
+
+
+def test_format_checks_memoized():
+    format_checkers.cache_clear()
+    for _ in range(3):
+        assert check_format('url', 'https://gnu.org/')
+    info = format_checkers.cache_info('url')
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_register_format():
+    calls = []
+
+    def _fast_url(value):
+        calls.append(value)
+        return value.startswith('https://')
+
+    spec = petstore()
+    spec['info']['license'] = {'name': 'MIT', 'url': 'http://mit.edu'}
+    doc = OpenApiObject(spec)
+    check_url = format_checkers._raw['url']
+    try:
+        register_format('url', _fast_url, memoize=False)
+        violations = doc.validate(collect=True)
+        assert 'http://mit.edu' in calls
+        assert [(v.path, v.rule) for v in violations] == [
+            ('#/info/license', 'is_url')]
+    finally:
+        register_format('url', check_url)
+    assert doc.validate(collect=True) == []
+
+
+def test_validate_schema_pattern():
+    spec = petstore()
+    spec['components']['schemas']['Pet']['properties']['name']['pattern'] = \
+        '[a-z'
+    doc = OpenApiObject(spec, resolve_refs=True)
+    violations = doc.validate(collect=True)
+    assert [(v.path, v.field, v.rule) for v in violations] == [
+        ('#/components/schemas/Pet/properties/name', 'pattern', 'is_regex')]
+
+
+def test_validate_profile():
+    spec = petstore()
+    spec['info']['license'] = {'name': 'MIT', 'url': 'not a url'}
+    doc = OpenApiObject(spec, resolve_refs=True)
+
+    profile = doc.validate(profile=True)
+    assert [(v.path, v.rule) for v in profile.violations] == [
+        ('#/info/license', 'is_url')]
+    assert profile.rules['is_url'].calls == 2
+    assert profile.rules['is_url'].failures == 1
+    assert profile.rules['path_conflict'].calls == 1
+    assert profile.rules['unique_parameters'].calls == 4
+    assert profile.types['OperationObject'].calls == 4
+    assert profile.nodes == sum(t.calls for t in profile.types.values())
+    assert len(profile.slowest) == 10
+    assert profile.to_dict()['violations'] == 1
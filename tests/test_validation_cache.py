@@ -0,0 +1,118 @@
+import pytest
+
+from poast.openapi3.spec import (
+    OpenApiObject, ValidationCache, Violation)
+
+from .specs import petstore
+
+
+def _broken_petstore():
+    spec = petstore()
+    spec['info']['license'] = {'url': 'not a url'}
+    spec['components']['parameters']['PetId']['in'] = 'body'
+    return spec
+
+
+def test_content_hash():
+    a = OpenApiObject(petstore(), resolve_refs=True)
+    b = OpenApiObject(petstore(), resolve_refs=True)
+    assert a.content_hash() == b.content_hash()
+    assert a['info'].content_hash() == b['info'].content_hash()
+    assert a['info'].content_hash() != a['paths'].content_hash()
+
+    spec = petstore()
+    spec['components']['parameters']['PetId']['name'] = 'id'
+    c = OpenApiObject(spec, resolve_refs=True)
+    assert c['info'].content_hash() == a['info'].content_hash()
+    # The hash of an operation covers its referenced parameters:
+    assert c['paths']['/pets/{petId}'].content_hash() != \
+        a['paths']['/pets/{petId}'].content_hash()
+
+
+def test_content_hash_cycle():
+    spec = petstore()
+    spec['components']['schemas']['Pet']['properties']['parent'] = {
+        '$ref': '#/components/schemas/Pet'}
+    doc = OpenApiObject(spec, resolve_refs=True)
+    assert doc.content_hash()
+
+
+def test_validation_cache():
+    cache = ValidationCache()
+    doc = OpenApiObject(_broken_petstore(), resolve_refs=True)
+    expected = [(v.path, v.rule) for v in doc.validate(collect=True)]
+
+    first = doc.validate(collect=True, cache=cache)
+    assert [(v.path, v.rule) for v in first] == expected
+    hits = cache.hits
+
+    # Reload and re-validate; everything comes from the cache:
+    doc = OpenApiObject(_broken_petstore(), resolve_refs=True)
+    second = doc.validate(collect=True, cache=cache)
+    assert [(v.path, v.rule) for v in second] == expected
+    assert cache.hits == hits + 1
+
+    # Fix one subtree; only the changed path is revisited:
+    spec = _broken_petstore()
+    spec['info']['license'] = {'name': 'MIT'}
+    doc = OpenApiObject(spec, resolve_refs=True)
+    third = doc.validate(collect=True, cache=cache)
+    assert [(v.path, v.rule) for v in third] == expected[2:]
+    assert cache.hits > hits + 2
+
+
+def test_validation_cache_rebase():
+    spec = petstore()
+    schemas = spec['components']['schemas']
+    schemas['Pet2'] = schemas['Pet']
+    doc = OpenApiObject(spec)
+    pet, pet2 = doc.schemas['Pet'], doc.schemas['Pet2']
+    cache = ValidationCache()
+    cache.put(pet, [
+        Violation(pet.doc_path, 'SchemaObject', 'type', 'r', 'm'),
+        Violation(pet.doc_path + '/properties/id', 'SchemaObject', 'type',
+                  'r', 'm'),
+        # Paths which only share a prefix are not in the subtree:
+        Violation('#/components/schemas/Pets', 'SchemaObject', 'type',
+                  'r', 'm'),
+    ])
+    assert [v.path for v in cache.get(pet2)] == [
+        '#/components/schemas/Pet2',
+        '#/components/schemas/Pet2/properties/id',
+        '#/components/schemas/Pets',
+    ]
+
+
+def test_validation_cache_rebase_bracketed():
+    # Identical content maps, reached through bracketed keys:
+    spec = petstore()
+    content = {'application/json': {'schema': {'pattern': '(unclosed'}}}
+    get = spec['paths']['/pets']['get']
+    get['responses']['400'] = {'description': 'Bad', 'content': content}
+    post = spec['paths']['/pets']['post']
+    post['requestBody'] = {'content': dict(content)}
+    post['parameters'] = [{'name': 'a', 'in': 'bogus'},
+                          {'name': 'a', 'in': 'bogus'}]
+    doc = OpenApiObject(spec, resolve_refs=True)
+    expected = sorted(v.path for v in doc.validate(collect=True))
+    assert '#/paths["/pets"]/get/responses/400/content' \
+        '["application/json"]/schema' in expected
+    assert '#/paths["/pets"]/post/requestBody/content' \
+        '["application/json"]/schema' in expected
+    assert '#/paths["/pets"]/post/parameters[1]' in expected
+
+    cache = ValidationCache()
+    violations = doc.validate(collect=True, cache=cache)
+    assert sorted(v.path for v in violations) == expected
+    assert cache.hits
+
+
+def test_validation_cache_maxsize():
+    cache = ValidationCache(maxsize=10)
+    OpenApiObject(petstore()).validate(collect=True, cache=cache)
+    assert len(cache) == 10
+
+
+def test_validation_cache_requires_collect():
+    with pytest.raises(ValueError):
+        OpenApiObject(petstore()).validate(cache=ValidationCache())